@@ -0,0 +1,122 @@
+"""
+Benchmark katalog per penjual (CATALOG_SHARDED) vs satu products.json.
+
+Membuat --products produk acak milik --sellers penjual di direktori
+sementara, lalu untuk kedua layout mengukur:
+    checkpoint : change_stock satu produk + checkpoint (byte yang ditulis ulang)
+    add        : add_product untuk satu penjual
+    refresh    : biaya cek versi sumber katalog per akses (_refresh)
+    per seller : produk satu penjual (get_by_seller) vs get_all
+Konfigurasi default (CATALOG_SNAPSHOT_ENABLED=True): layout satu file ikut
+menulis products.snap di setiap penyimpanan, layout per penjual tidak
+memakai snapshot.
+
+Usage:
+    python benchmarks/bench_catalog_shards.py [--products 20000] [--sellers 50]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def make_catalog(path, n_products, n_sellers, rng):
+    phones = [f'08{rng.randrange(10**9, 10**10)}' for _ in range(n_sellers)]
+    data = {f'p_produk_{i}': {'id': f'p_produk_{i}', 'name': f'Produk {rng.getrandbits(24):06x}',
+                              'price': rng.randrange(1, 2000) * 500, 'stock': rng.randrange(1, 50),
+                              'image': f'/static/picture/{i}.jpg', 'phone': rng.choice(phones)}
+            for i in range(n_products)}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return phones
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run_layout(workdir, sharded, args, phones):
+    """Ukur satu layout; return dictionary hasil"""
+    import models.products as products_module
+    from models.catalog_shards import CatalogShards
+    manager = products_module.ProductsManager
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, f'ledger-{sharded}.jsonl')
+    products_module._SHARDS_DIR = os.path.join(workdir, 'catalog')
+    manager.SNAPSHOT_ENABLED = True
+    manager.SHARDS = None
+    if sharded:
+        manager.SHARDS = CatalogShards(products_module._SHARDS_DIR)
+        manager.SHARDS.migrate(products_module._PRODUCTS_FILE)
+    manager._invalidate_cache()
+    manager._load()
+
+    rng = random.Random(7)
+    product_ids = list(manager._load())
+    written = []
+    real_replace = os.replace
+
+    def counting_replace(src, dst):
+        written.append(os.path.getsize(src))
+        real_replace(src, dst)
+
+    def checkpoint():
+        manager.change_stock(rng.choice(product_ids), 1, 'bench')
+        return manager.checkpoint()
+
+    os.replace = counting_replace
+    try:
+        checkpoint_s, _ = timed(checkpoint, args.repeat)
+        checkpoint_bytes = sum(written) / args.repeat
+        written.clear()
+        counter = iter(range(args.repeat))
+        add_s, _ = timed(lambda: manager.add_product({
+            'id': f'p_bench_{sharded}_{next(counter)}', 'name': 'Baru', 'price': 1000, 'stock': 1,
+            'image': '', 'phone': phones[0]}), args.repeat)
+        add_bytes = sum(written) / args.repeat
+    finally:
+        os.replace = real_replace
+
+    refresh_s, _ = timed(manager._refresh, 2000)
+    seller_s, own = timed(lambda: manager.get_by_seller(phones[1]), 50)
+    all_s, everything = timed(manager.get_all, 10)
+    return {'checkpoint_ms': checkpoint_s * 1000, 'checkpoint_kb': checkpoint_bytes / 1024,
+            'add_ms': add_s * 1000, 'add_kb': add_bytes / 1024, 'refresh_us': refresh_s * 1e6,
+            'seller_ms': seller_s * 1000, 'seller_count': len(own), 'all_ms': all_s * 1000,
+            'all_count': len(everything)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--sellers', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    phones = make_catalog(os.path.join(workdir, 'products.json'), args.products, args.sellers, random.Random(42))
+    print(f"katalog: {args.products} produk, {args.sellers} penjual, "
+          f"products.json {os.path.getsize(os.path.join(workdir, 'products.json')) / 1e6:.1f} MB\n")
+
+    results = {'satu file': run_layout(workdir, False, args, phones),
+               'per penjual': run_layout(workdir, True, args, phones)}
+    print(f"{'layout':<12} {'checkpoint ms':>14} {'ditulis KB':>11} {'add ms':>8} {'ditulis KB':>11} "
+          f"{'refresh µs':>11} {'per seller ms':>14} {'get_all ms':>11}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['checkpoint_ms']:>14.1f} {r['checkpoint_kb']:>11.0f} {r['add_ms']:>8.1f} "
+              f"{r['add_kb']:>11.0f} {r['refresh_us']:>11.1f} {r['seller_ms']:>14.2f} {r['all_ms']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark kompresi response: byte yang dikirim vs waktu CPU per encoding.
+
+Halaman katalog (Home_pages.html, Dasboard.html), daftar lokasi pickup dan
+response JSON add_to_cart di-render sekali di salinan sementara folder data/
+(katalog diperbesar menjadi --products produk), lalu setiap body dikompresi
+dengan beberapa level gzip/brotli untuk mengukur ukuran dan CPU per request.
+
+Usage:
+    python benchmarks/bench_compression.py [--products 500] [--rounds 200]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def setup_app(product_count):
+    """Siapkan app di direktori kerja sementara berisi salinan data/"""
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+
+    import models.products as products_module
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'data', 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'data', 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, 'data', 'stock_ledger.jsonl')
+    products_module.ProductsManager._invalidate_cache()
+    manager = products_module.ProductsManager
+    for i in range(len(manager.get_all()), product_count):
+        manager.add_product({
+            'id': f'p_bench_{i}', 'name': f'Produk Benchmark {i}',
+            'price': 10000 + i * 250, 'stock': 5 + i % 20,
+            'image': f'/static/pcture/produk_{i % 12}.jpg', 'phone': '081234567890',
+        })
+
+    from main import create_app
+    from routes.auth import user_manager
+    from werkzeug.security import generate_password_hash
+    app = create_app('testing', start_background=False)
+    user_manager.users['bench@example.com'] = {
+        'username': 'bench@example.com', 'full_name': 'Bench',
+        'password_hash': generate_password_hash('bench-pass', method='pbkdf2:sha256:1000'),
+    }
+    return app, next(iter(manager.get_all()))
+
+
+def fetch(client, method, path, data, accept_encoding):
+    """Return (status, content-encoding, jumlah byte body)"""
+    headers = {'Accept-Encoding': accept_encoding}
+    if method == 'POST':
+        response = client.post(path, data=data, headers=headers)
+    else:
+        response = client.get(path, headers=headers)
+    return response.status_code, response.headers.get('Content-Encoding', '-'), len(response.get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    from utils.compression import Compressor, brotli
+
+    app, product_id = setup_app(args.products)
+    client = app.test_client()
+    client.post('/login', data={'email': 'bench@example.com', 'password': 'bench-pass'})
+    cases = [
+        ('Home_pages.html', 'GET', '/Home_pages.html', None),
+        ('Dasboard.html', 'GET', '/Dasboard.html', None),
+        ('pickup_locations', 'GET', '/api/pickup_locations', None),
+        ('add_to_cart', 'POST', '/add_to_cart', {'product_id': product_id, 'quantity': '1'}),
+    ]
+
+    print('Bytes on wire (via middleware):')
+    print(f"{'endpoint':<18} {'identity':>10} {'gzip':>10} {'br':>10}")
+    bodies = {}
+    for name, method, path, data in cases:
+        sizes = []
+        for accept in ('identity', 'gzip', 'br'):
+            status, _, size = fetch(client, method, path, data, accept)
+            sizes.append(f"{size:>10}" if status < 400 else f"{'HTTP ' + str(status):>10}")
+        print(f"{name:<18} {' '.join(sizes)}")
+        response = (client.post(path, data=data) if method == 'POST' else client.get(path))
+        bodies[name] = response.get_data()
+
+    settings = [('gzip', level) for level in (1, 6, 9)]
+    if brotli is not None:
+        settings += [('br', quality) for quality in (1, 4, 11)]
+    else:
+        print('\nbrotli tidak terinstall (pip install brotli), hanya gzip yang diukur')
+
+    print('\nUkuran dan CPU per response (kompresi langsung):')
+    print(f"{'endpoint':<18} {'encoding':<9} {'bytes':>8} {'ratio':>7} {'CPU us':>9}")
+    for name, body in bodies.items():
+        print(f"{name:<18} {'identity':<9} {len(body):>8} {1:>7.2f} {0:>9.1f}")
+        if len(body) < Compressor.MIN_SIZE:
+            print(f"{'':<18} (di bawah COMPRESS_MIN_SIZE={Compressor.MIN_SIZE}, tidak dikompresi)")
+        for encoding, level in settings:
+            Compressor.GZIP_LEVEL = Compressor.BROTLI_QUALITY = level
+            # Level tertinggi brotli ratusan kali lebih lambat, jadi putarannya dikurangi
+            rounds = args.rounds if level < 10 else max(1, args.rounds // 50)
+            start = time.process_time()
+            for _ in range(rounds):
+                compressed = Compressor.compress(body, encoding)
+            cpu_us = (time.process_time() - start) / rounds * 1e6
+            label = f"{encoding}-{level}"
+            print(f"{'':<18} {label:<9} {len(compressed):>8} {len(body) / len(compressed):>7.2f} {cpu_us:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark load shedding (utils/admission.py) saat disk lambat.
+
+fsync disimulasikan lambat (--fsync-ms), lalu selama --seconds detik
+sejumlah thread "browsing" (halaman utama, halaman produk, /api/products)
+dan thread "pembeli" (add/remove keranjang -> ledger stok + fsync) memanggil
+app lewat Flask test client. Seperti worker gthread, hanya --workers request
+yang diproses bersamaan; sisanya menunggu slot (waktu antri ikut dihitung
+dalam latency). Dijalankan di dua proses baru dengan salinan
+sementara folder data/: shedding mati vs hidup. Dicatat jumlah request,
+jumlah 503 dan latency p50/p99 per jenis traffic.
+
+Usage:
+    python benchmarks/bench_load_shedding.py [--browsers 24] [--shoppers 4] [--workers 8]
+                                             [--seconds 5] [--fsync-ms 40]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+BROWSE_PAGES = ['/Home_pages.html', '/product/p_produk_1', '/api/products']
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def child(args, shedding):
+    """Satu proses server: buat app, jalankan semua thread, print hasil JSON"""
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+
+    import models.products as products_module
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'data', 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'data', 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, 'data', 'stock_ledger.jsonl')
+
+    from config import TestingConfig
+    TestingConfig.ADMISSION_ENABLED = shedding
+    TestingConfig.ADMISSION_MAX_IN_FLIGHT = args.max_in_flight
+    TestingConfig.ADMISSION_MAX_LOCK_WAIT_MS = args.max_lock_wait_ms
+    TestingConfig.LOG_LEVEL = 'ERROR'
+
+    from main import create_app
+    from models.stock_ledger import StockLedger
+    from routes.auth import user_manager
+    from utils.admission import AdmissionController
+    from utils.rate_limit import AuthThrottle
+    from werkzeug.security import generate_password_hash
+    app = create_app('testing', start_background=False)
+    AuthThrottle.ENABLED = False  # Semua pembeli login dari IP yang sama
+    StockLedger.FSYNC = True
+
+    real_fsync = os.fsync
+    def slow_fsync(fd):
+        time.sleep(args.fsync_ms / 1000)  # Disk lambat (sleep melepas GIL seperti I/O sungguhan)
+        real_fsync(fd)
+    os.fsync = slow_fsync
+
+    password_hash = generate_password_hash('bench-pass', method='pbkdf2:sha256:1000')
+    shoppers = []
+    for i in range(args.shoppers):
+        email = f'shed{i}@example.com'
+        user_manager.users[email] = {'username': email, 'full_name': f'Shed {i}', 'password_hash': password_hash}
+        client = app.test_client()
+        client.post('/login', data={'email': email, 'password': 'bench-pass'})
+        shoppers.append(client)
+    browsers = [app.test_client() for _ in range(args.browsers)]
+
+    results = {'browse': {'ok': [], 'shed': 0, 'error': 0}, 'cart': {'ok': [], 'shed': 0, 'error': 0}}
+    results_lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    barrier = threading.Barrier(args.browsers + args.shoppers)
+    slots = threading.Semaphore(args.workers)  # Thread pool worker gthread
+
+    def call(method, *a, **kw):
+        with slots:
+            return method(*a, **kw)
+
+    def record(kind, status, elapsed):
+        with results_lock:
+            if status == 503:
+                results[kind]['shed'] += 1
+            elif status < 400:
+                results[kind]['ok'].append(elapsed)
+            else:
+                results[kind]['error'] += 1
+
+    def browse(t):
+        rng = random.Random(t)
+        client = browsers[t]
+        barrier.wait()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = call(client.get, rng.choice(BROWSE_PAGES))
+            record('browse', response.status_code, time.perf_counter() - start)
+            time.sleep(args.think_ms / 1000)  # Tanpa mematuhi Retry-After (kasus terburuk)
+
+    def shop(t):
+        rng = random.Random(1000 + t)
+        client = shoppers[t]
+        barrier.wait()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if rng.random() < 0.6:
+                response = call(client.post, '/add_to_cart', json={'product_id': 'p_produk_1', 'quantity': 1})
+            else:
+                response = call(client.post, '/remove_from_cart', data={'product_id': 'p_produk_1'})
+            record('cart', response.status_code, time.perf_counter() - start)
+            time.sleep(args.think_ms / 1000)
+
+    threads = [threading.Thread(target=browse, args=(t,)) for t in range(args.browsers)]
+    threads += [threading.Thread(target=shop, args=(t,)) for t in range(args.shoppers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    os.fsync = real_fsync
+    for client in shoppers:
+        client.post('/clear_cart')
+
+    summary = {'stats': AdmissionController.stats() if shedding else {}}
+    for kind, data in results.items():
+        summary[kind] = {'ok': len(data['ok']), 'shed': data['shed'], 'error': data['error'],
+                         'p50': percentile(data['ok'], 0.5) * 1000, 'p99': percentile(data['ok'], 0.99) * 1000}
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--browsers', type=int, default=24)
+    parser.add_argument('--shoppers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--fsync-ms', type=float, default=40, help='Tambahan latency setiap fsync')
+    parser.add_argument('--workers', type=int, default=8, help='Request diproses bersamaan (WSGI_THREADS)')
+    parser.add_argument('--think-ms', type=float, default=5, help='Jeda antar request per thread')
+    parser.add_argument('--max-in-flight', type=int, default=6, help='ADMISSION_MAX_IN_FLIGHT')
+    parser.add_argument('--max-lock-wait-ms', type=float, default=50, help='ADMISSION_MAX_LOCK_WAIT_MS')
+    parser.add_argument('--child', choices=('off', 'on'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args, args.child == 'on')
+
+    print(f"{args.browsers} browsing + {args.shoppers} pembeli, {args.workers} thread worker, "
+          f"{args.seconds:g} s, fsync +{args.fsync_ms:g} ms, "
+          f"threshold {args.max_in_flight} in-flight / {args.max_lock_wait_ms:g} ms tunggu lock\n")
+    print(f"{'shedding':<9} {'jenis':<7} {'ok':>6} {'503':>6} {'ok/s':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    passthrough = sys.argv[1:]
+    for mode in ('off', 'on'):
+        out = subprocess.run([sys.executable, __file__, '--child', mode] + passthrough,
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        for kind, label in (('browse', 'browse'), ('cart', 'cart')):
+            data = result[kind]
+            print(f"{mode:<9} {label:<7} {data['ok']:>6} {data['shed']:>6} {data['ok'] / args.seconds:>7.1f} "
+                  f"{data['p50']:>8.1f} {data['p99']:>8.1f}")
+        if result['stats']:
+            print(f"{'':<9} admission: {result['stats']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark scan pesanan streaming (OrderManager.iter_orders) vs memuat seluruh
+orders.json ke memori.
+
+Membuat --orders pesanan acak di direktori sementara, lalu untuk setiap
+operasi mengukur waktu dan puncak memori (tracemalloc, dijalankan terpisah
+dari pengukuran waktu):
+    statistik : get_order_statistics (cara lama: load semua lalu hitung)
+    cari awal : pesanan pertama yang cocok filter (berhenti lebih awal)
+    hapus     : delete_order (cara lama: load, filter list, tulis ulang)
+
+Usage:
+    python benchmarks/bench_order_scan.py [--orders 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+STATUSES = ('menunggu_pembayaran', 'siap_diambil', 'selesai', 'dibatalkan')
+
+
+def write_orders(path, count, rng):
+    """Tulis orders.json (format 'json' berindentasi) tanpa menahan semua pesanan di memori"""
+    from utils.json_stream import JsonArrayWriter
+    with open(path, 'wb') as f, JsonArrayWriter(f, 'json') as writer:
+        for i in range(count):
+            writer.write({
+                'order_id': f'ORD-{i:08X}', 'user_id': f'user{i % 5000}@example.com',
+                'fullname': f'Pembeli {i}', 'phone': f"08{rng.randrange(10**9, 10**10)}",
+                'items': [{'product_id': 'p_produk_1', 'name': 'Produk Keren 1', 'price': 150000,
+                           'quantity': rng.randrange(1, 4), 'phone': '081234567890'}],
+                'total': rng.randrange(1, 100) * 10000, 'pickup_location': 'loc_library',
+                'status': rng.choice(STATUSES), 'payment_status': 'pending',
+                'created_at': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00", 'notes': '',
+            })
+
+
+def old_statistics(OrderManager):
+    from utils import codec
+    orders = codec.load_file(OrderManager.ORDER_FILE)
+    status_count = {}
+    for order in orders:
+        status_count[order.get('status')] = status_count.get(order.get('status'), 0) + 1
+    return len(orders), sum(order.get('total', 0) for order in orders), status_count
+
+
+def old_delete(OrderManager, order_id):
+    from utils import codec
+    orders = codec.load_file(OrderManager.ORDER_FILE)
+    orders = [order for order in orders if order.get('order_id') != order_id]
+    return OrderManager._save_orders(orders)
+
+
+def run(fn):
+    """(detik, puncak memori MB) - waktu dan memori diukur di dua pemanggilan terpisah"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=200000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    from models.order import OrderManager
+    OrderManager.ORDER_FILE = os.path.join(workdir, 'orders.json')
+    write_orders(OrderManager.ORDER_FILE, args.orders, random.Random(42))
+    print(f"orders.json : {args.orders} pesanan, {os.path.getsize(OrderManager.ORDER_FILE) / 1e6:.1f} MB\n")
+
+    first = lambda orders: next(iter(orders), None)
+    target = f'ORD-{args.orders // 100:08X}'
+    victims = iter(f'ORD-{i:08X}' for i in range(args.orders))
+    cases = [
+        ('statistik', lambda: old_statistics(OrderManager), OrderManager.get_order_statistics),
+        ('cari awal',
+         lambda: first(o for o in OrderManager._load_orders() if o.get('order_id') == target),
+         lambda: first(OrderManager.iter_orders({'order_id': target}))),
+        ('hapus', lambda: old_delete(OrderManager, next(victims)),
+         lambda: OrderManager.delete_order(next(victims))),
+    ]
+
+    print(f"{'operasi':<10} {'load s':>8} {'load MB':>9} {'stream s':>9} {'stream MB':>10}")
+    for name, old, new in cases:
+        old_s, old_mb = run(old)
+        new_s, new_mb = run(new)
+        print(f"{name:<10} {old_s:>8.2f} {old_mb:>9.0f} {new_s:>9.2f} {new_mb:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark pencarian pesanan: index trigram/prefix (OrderSearchIndex) vs scan
+linear seluruh list pesanan.
+
+Membuat --orders pesanan acak di file sementara, membangun index secara
+streaming, lalu mengukur latency query nama, telepon, catatan dan prefix ID.
+
+Usage:
+    python benchmarks/bench_order_search.py [--orders 1000000] [--queries 200]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+FIRST = ['Budi', 'Siti', 'Agus', 'Dewi', 'Rina', 'Andi', 'Putri', 'Joko', 'Wahyu', 'Intan', 'Rizky', 'Nadia']
+LAST = ['Santoso', 'Wijaya', 'Pratama', 'Lestari', 'Saputra', 'Hidayat', 'Kusuma', 'Nugroho', 'Permata']
+NOTES = ['', '', '', 'ambil sore', 'titip satpam', 'bungkus kado', 'tolong cepat', 'bayar pas']
+
+
+def make_orders(count, rng):
+    """Generator pesanan acak (field yang diindeks + ringkasan)"""
+    for i in range(count):
+        yield {
+            'order_id': f"ORD-{rng.getrandbits(32):08X}",
+            'user_id': f'user{i % 5000}@example.com',
+            'fullname': f"{rng.choice(FIRST)} {rng.choice(LAST)} {i % 997}",
+            'phone': f"08{rng.randrange(10**9, 10**10)}",
+            'notes': rng.choice(NOTES),
+            'pickup_location': 'loc_library',
+            'items': [], 'total': rng.randrange(5, 500) * 1000,
+            'status': 'menunggu_pembayaran', 'payment_status': 'pending',
+            'created_at': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T10:00:00",
+        }
+
+
+def write_orders(path, count, rng):
+    """Tulis file orders.json tanpa menahan semua pesanan di memori"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i, order in enumerate(make_orders(count, rng)):
+            if i:
+                f.write(',')
+            f.write(json.dumps(order))
+        f.write(']')
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    hits = 0
+    for query in queries:
+        hits += fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000, hits / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--scan', type=int, default=20, help='Jumlah query untuk scan linear (lambat)')
+    args = parser.parse_args()
+
+    from models.order_search import OrderSearchIndex
+
+    rng = random.Random(42)
+    path = os.path.join(tempfile.mkdtemp(), 'orders.json')
+    write_orders(path, args.orders, rng)
+    print(f"orders.json   : {args.orders} pesanan, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    index = OrderSearchIndex.build(path)
+    build_s = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"build index   : {build_s:.1f}s, +{(rss_after - rss_before) / 1024:.0f} MB RSS, "
+          f"{len(index._postings)} trigram")
+
+    sample = [order for order in make_orders(args.orders, random.Random(42))
+              if rng.random() < args.queries / args.orders][:args.queries]
+    cases = {
+        'nama': [' '.join(o['fullname'].split()[1:]) for o in sample],
+        'telepon': [o['phone'][-7:] for o in sample],
+        'catatan': ['titip satpam'] * 10,
+        'prefix ID': [o['order_id'][:8] for o in sample],
+    }
+
+    print(f"\n{'query':<10} {'index ms':>9} {'hasil':>8}")
+    for name, queries in cases.items():
+        ms, hits = timed(lambda q: index.search(q, limit=20)[0], queries)
+        print(f"{name:<10} {ms:>9.3f} {hits:>8.1f}")
+
+    # Pembanding 1: cara lama - parse orders.json lalu scan (satu query)
+    start = time.perf_counter()
+    with open(path, encoding='utf-8') as f:
+        loaded = json.load(f)
+    needle = cases['telepon'][0]
+    found = [o for o in loaded if needle in str(o.get('phone'))]
+    print(f"\nparse + scan  : {(time.perf_counter() - start) * 1000:.0f} ms per query ({len(found)} hasil)")
+    del loaded, found
+
+    # Pembanding 2: scan linear list pesanan yang sudah di memori (tanpa biaya parse file)
+    orders = [(OrderSearchIndex.document_text(o), o) for o in make_orders(args.orders, random.Random(42))]
+    print(f"\n{'query':<10} {'scan ms':>9}")
+    for name, queries in cases.items():
+        queries = queries[:args.scan]
+        ms, _ = timed(lambda q: sum(1 for text, _ in orders if OrderSearchIndex.normalize(q) in text), queries)
+        print(f"{name:<10} {ms:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
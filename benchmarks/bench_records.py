@@ -0,0 +1,120 @@
+"""
+Benchmark memori record slots (models/records.py) vs dictionary biasa.
+
+Membuat --products produk dan --orders pesanan acak dalam bentuk JSON, lalu
+memuatnya sebagai dictionary (seperti codec.load_file) dan sebagai record
+(Product/Order.from_dict). Memori diukur dengan tracemalloc, termasuk string,
+list item dan item pesanan, lalu dibagi jumlah record. Juga mengukur biaya
+konversi from_dict/to_dict per record.
+
+Usage:
+    python benchmarks/bench_records.py [--products 100000] [--orders 1000000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+CHUNK = 10000  # Record per potongan JSON (agar teks JSON tidak ikut terukur)
+STATUSES = ('menunggu_pembayaran', 'siap_diambil', 'selesai', 'dibatalkan')
+PAYMENTS = ('pending', 'lunas', 'dibatalkan')
+LOCATIONS = ('loc_library', 'loc_setulo_pradita', 'loc_canteen')
+
+
+def make_products(count, rng):
+    for i in range(count):
+        yield f'p_produk_{i}', {
+            'id': f'p_produk_{i}', 'name': f'Produk {rng.getrandbits(24):06x}',
+            'price': rng.randrange(1, 2000) * 500, 'stock': rng.randrange(0, 50),
+            'image': f'/static/picture/{i}.jpg', 'phone': f'08{rng.randrange(10**9, 10**10)}',
+        }
+
+
+def make_orders(count, rng):
+    for i in range(count):
+        items = [{'product_id': f'p_produk_{rng.randrange(100000)}', 'name': f'Produk {j}',
+                  'price': rng.randrange(1, 2000) * 500, 'quantity': rng.randrange(1, 4),
+                  'phone': '081234567890'} for j in range(rng.randrange(1, 4))]
+        yield {
+            'order_id': f"ORD-{rng.getrandbits(32):08X}", 'user_id': f'user{i % 5000}@example.com',
+            'user_email': f'user{i % 5000}@example.com', 'fullname': f'Pembeli {i}',
+            'phone': f"08{rng.randrange(10**9, 10**10)}", 'items': items,
+            'total': sum(item['price'] * item['quantity'] for item in items),
+            'pickup_location': rng.choice(LOCATIONS), 'status': rng.choice(STATUSES),
+            'payment_status': rng.choice(PAYMENTS),
+            'created_at': f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T10:{i % 60:02d}:00", 'notes': '',
+        }
+
+
+def chunks(rows):
+    """Potongan JSON (bytes) berisi CHUNK record, dibuat di luar pengukuran"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            yield json.dumps(chunk).encode('utf-8')
+            chunk = []
+    if chunk:
+        yield json.dumps(chunk).encode('utf-8')
+
+
+def measure(raw_chunks, convert):
+    """Memori (byte) yang ditahan setelah semua potongan di-parse dan dikonversi"""
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for raw in raw_chunks:
+        kept.extend(convert(json.loads(raw)))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, kept
+
+
+def report(name, count, raw_chunks, from_dict):
+    """Bandingkan dict vs record untuk satu jenis data"""
+    dict_bytes, dicts = measure(raw_chunks, lambda rows: rows)
+    del dicts
+    record_bytes, records = measure(raw_chunks, lambda rows: [from_dict(row) for row in rows])
+
+    sample = records[:100000]
+    start = time.perf_counter()
+    plain = [record.to_dict() for record in sample]
+    to_us = (time.perf_counter() - start) / len(sample) * 1e6
+    start = time.perf_counter()
+    for row in plain:
+        from_dict(row)
+    from_us = (time.perf_counter() - start) / len(sample) * 1e6
+    del records, sample, plain
+
+    print(f"{name:<9} {count:>9} {dict_bytes / count:>11.0f} {record_bytes / count:>13.0f} "
+          f"{1 - record_bytes / dict_bytes:>8.0%} {dict_bytes / 2**20:>9.0f} {record_bytes / 2**20:>10.0f} "
+          f"{from_us:>9.2f} {to_us:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--orders', type=int, default=1000000)
+    args = parser.parse_args()
+
+    from models.records import Order, Product
+
+    print(f"{'data':<9} {'records':>9} {'dict B/rec':>11} {'record B/rec':>13} {'hemat':>8} "
+          f"{'dict MB':>9} {'record MB':>10} {'from µs':>9} {'to µs':>7}")
+    rng = random.Random(42)
+    raw = list(chunks(product for _, product in make_products(args.products, rng)))
+    report('produk', args.products, raw, Product.from_dict)
+    raw = list(chunks(make_orders(args.orders, rng)))
+    report('pesanan', args.orders, raw, Order.from_dict)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark kontensi lock untuk mutasi stok produk.
+
+Membandingkan desain lama (satu _SAVE_LOCK global, load-modify-save per
+operasi) dengan ProductsManager saat ini (lock striping per produk +
+append ke stock ledger). Semua operasi dijalankan di katalog sementara.
+
+Usage:
+    python benchmarks/bench_stock_contention.py [--threads 16] [--ops 200] [--products 64]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import models.products as products_module
+from models.products import ProductsManager
+
+
+class LegacyProductsManager:
+    """Salinan minimal desain lama: satu lock global hanya di sekitar penulisan file"""
+    _lock = threading.Lock()
+
+    @classmethod
+    def change_stock(cls, product_id, delta):
+        path = os.path.abspath(products_module._PRODUCTS_FILE)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        p = data.get(product_id)
+        if not p or p['stock'] + delta < 0:
+            return False
+        p['stock'] += delta
+        with cls._lock:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+        return True
+
+
+def make_catalog(path, n_products, stock):
+    data = {f'p_{i}': {'id': f'p_{i}', 'name': f'Produk {i}', 'price': 1000 + i,
+                       'stock': stock, 'image': '', 'phone': '0800'} for i in range(n_products)}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def run(manager, n_threads, ops, n_products, hot):
+    """Jalankan n_threads x ops operasi -1 stok; return (ops/detik, lost updates)"""
+    tmpdir = tempfile.mkdtemp()
+    products_module._PRODUCTS_FILE = os.path.join(tmpdir, 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(tmpdir, 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(tmpdir, 'stock_ledger.jsonl')
+    initial = n_threads * ops + 1
+    make_catalog(products_module._PRODUCTS_FILE, n_products, initial)
+    ProductsManager._invalidate_cache()
+
+    ok_counts = [0] * n_threads
+
+    def worker(t):
+        for i in range(ops):
+            pid = 'p_0' if hot else f'p_{(t * ops + i) % n_products}'
+            if manager.change_stock(pid, -1):
+                ok_counts[t] += 1
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if hasattr(manager, 'checkpoint'):
+        manager.checkpoint()  # Tulis stok dari ledger ke products.json sebelum dicek
+
+    with open(products_module._PRODUCTS_FILE, 'r', encoding='utf-8') as f:
+        final = json.load(f)
+    remaining = sum(initial - p['stock'] for p in final.values())
+    lost = sum(ok_counts) - remaining
+    return sum(ok_counts) / elapsed, lost
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--ops', type=int, default=200)
+    parser.add_argument('--products', type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'design':<10} {'workload':<16} {'ops/sec':>10} {'lost updates':>13}")
+    for hot in (False, True):
+        workload = 'single hot item' if hot else 'spread products'
+        for name, manager in (('legacy', LegacyProductsManager), ('striped', ProductsManager)):
+            rate, lost = run(manager, args.threads, args.ops, args.products, hot)
+            print(f"{name:<10} {workload:<16} {rate:>10.0f} {lost:>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark latency request pertama (cold) vs berikutnya (warm) per halaman,
+dengan dan tanpa cache bytecode / precompile template Jinja.
+
+Setiap mode dijalankan di proses Python baru (seperti worker yang baru
+start) dengan salinan sementara folder data/:
+    tanpa cache     : template di-parse + compile saat pertama dirender
+    bytecode dingin : cache bytecode aktif tapi folder cache masih kosong
+    bytecode hangat : folder cache sudah terisi proses sebelumnya
+    precompile      : semua template di-compile saat startup, tanpa bytecode
+                      cache (seperti master gunicorn --preload)
+    precompile+bc   : precompile dari cache bytecode yang sudah hangat
+
+Usage:
+    python benchmarks/bench_templates.py [--rounds 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+PAGES = [
+    '/Home_pages.html', '/Dasboard.html', '/Cart.html', '/checkout', '/orders',
+    '/product/p_produk_1', '/barang/Barang1.html', '/barang/barang2.html',
+    '/barang/barang3.html', '/barang/barang4.html',
+]
+MODES = {
+    'tanpa cache': {'TEMPLATE_BYTECODE_CACHE': False, 'TEMPLATE_PRECOMPILE': False},
+    'bytecode dingin': {'TEMPLATE_BYTECODE_CACHE': True, 'TEMPLATE_PRECOMPILE': False, 'clear': True},
+    'bytecode hangat': {'TEMPLATE_BYTECODE_CACHE': True, 'TEMPLATE_PRECOMPILE': False},
+    'precompile': {'TEMPLATE_BYTECODE_CACHE': False, 'TEMPLATE_PRECOMPILE': True},
+    'precompile+bc': {'TEMPLATE_BYTECODE_CACHE': True, 'TEMPLATE_PRECOMPILE': True},
+}
+
+
+def child(settings, cache_dir):
+    """Satu 'worker baru': create_app, login, lalu ukur setiap halaman dua kali"""
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+
+    import models.products as products_module
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'data', 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'data', 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, 'data', 'stock_ledger.jsonl')
+
+    from config import TestingConfig
+    TestingConfig.TEMPLATE_BYTECODE_CACHE = settings['TEMPLATE_BYTECODE_CACHE']
+    TestingConfig.TEMPLATE_BYTECODE_CACHE_DIR = cache_dir
+    TestingConfig.TEMPLATE_PRECOMPILE = settings['TEMPLATE_PRECOMPILE']
+    TestingConfig.LOG_LEVEL = 'WARNING'
+
+    from main import create_app
+    from routes.auth import user_manager
+    from werkzeug.security import generate_password_hash
+    start = time.perf_counter()
+    app = create_app('testing', start_background=False)
+    startup_ms = (time.perf_counter() - start) * 1000
+    user_manager.users['bench@example.com'] = {
+        'username': 'bench@example.com', 'full_name': 'Bench',
+        'password_hash': generate_password_hash('bench-pass', method='pbkdf2:sha256:1000'),
+    }
+    client = app.test_client()
+    client.post('/login', data={'email': 'bench@example.com', 'password': 'bench-pass'})
+    client.post('/add_to_cart', data={'product_id': 'p_produk_1', 'quantity': '1'})
+
+    result = {'startup_ms': startup_ms,
+              'templates_ms': app.extensions['startup'].phases.get('templates', 0) * 1000,
+              'cold': {}, 'warm': {}}
+    for kind in ('cold', 'warm'):
+        for page in PAGES:
+            start = time.perf_counter()
+            response = client.get(page)
+            result[kind][page] = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, (page, response.status_code)
+    client.post('/remove_from_cart', data={'product_id': 'p_produk_1'})
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5, help='Proses baru per mode (diambil median)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(MODES[args.child], args.cache_dir)
+
+    cache_dir = tempfile.mkdtemp()
+    results = {}
+    for mode, settings in MODES.items():
+        runs = []
+        for _ in range(args.rounds):
+            if settings.get('clear'):
+                shutil.rmtree(cache_dir)
+                os.makedirs(cache_dir)
+            out = subprocess.run([sys.executable, __file__, '--child', mode, '--cache-dir', cache_dir],
+                                 capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        results[mode] = runs
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    print(f"{'mode':<16} {'startup ms':>11} {'compile ms':>11} {'cold total':>11} {'cold maks':>10} "
+          f"{'warm total':>11}")
+    for mode, runs in results.items():
+        cold = [sum(run['cold'].values()) for run in runs]
+        worst = [max(run['cold'].values()) for run in runs]
+        warm = [sum(run['warm'].values()) for run in runs]
+        print(f"{mode:<16} {median([r['startup_ms'] for r in runs]):>11.1f} "
+              f"{median([r['templates_ms'] for r in runs]):>11.1f} {median(cold):>11.1f} "
+              f"{median(worst):>10.1f} {median(warm):>11.1f}")
+
+    print(f"\nrequest pertama per halaman (ms, median {args.rounds} proses)")
+    print(f"{'halaman':<22}" + ''.join(f"{mode:>17}" for mode in results))
+    for page in PAGES:
+        print(f"{page:<22}" + ''.join(f"{median([r['cold'][page] for r in runs]):>17.1f}"
+                                      for runs in results.values()))
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
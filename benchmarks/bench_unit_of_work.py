@@ -0,0 +1,102 @@
+"""
+Benchmark unit of work per request: jumlah pembacaan produk dan latency
+dengan UNIT_OF_WORK_ENABLED aktif vs nonaktif.
+
+Dijalankan di salinan sementara folder data/. Setiap skenario diulang
+--rounds kali; kolom reads menghitung pembacaan produk dari cache/snapshot
+per request.
+
+Skenario:
+    add_to_cart    : get -> get_stock -> change_stock (lalu dikembalikan)
+    product_detail : produk + rekomendasi
+
+Usage:
+    python benchmarks/bench_unit_of_work.py [--rounds 200]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def setup_app():
+    """Siapkan app di direktori kerja sementara berisi salinan data/"""
+    workdir = tempfile.mkdtemp()
+    shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+
+    import models.products as products_module
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'data', 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'data', 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, 'data', 'stock_ledger.jsonl')
+    products_module.ProductsManager._invalidate_cache()
+    product_id = next(iter(products_module.ProductsManager.get_all()))
+
+    from main import create_app
+    from routes.auth import user_manager
+    from werkzeug.security import generate_password_hash
+    app = create_app('testing', start_background=False)
+    user_manager.users['bench@example.com'] = {
+        'username': 'bench@example.com', 'full_name': 'Bench',
+        'password_hash': generate_password_hash('bench-pass', method='pbkdf2:sha256:1000'),
+    }
+    return app, product_id
+
+
+def count_calls(owner, name, counter):
+    """Bungkus classmethod owner.name agar setiap panggilan dihitung"""
+    original = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        counter[name] = counter.get(name, 0) + 1
+        return original(*args, **kwargs)
+
+    setattr(owner, name, staticmethod(wrapper))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    from models.products import ProductsManager
+    from utils.unit_of_work import UnitOfWork
+
+    app, product_id = setup_app()
+    counter = {}
+    count_calls(ProductsManager, '_get', counter)
+
+    client = app.test_client()
+    client.post('/login', data={'email': 'bench@example.com', 'password': 'bench-pass'})
+
+    def add_to_cart():
+        client.post('/add_to_cart', data={'product_id': product_id, 'quantity': '1'})
+        client.post('/remove_from_cart', data={'product_id': product_id})
+
+    cases = [
+        ('add_to_cart', add_to_cart, 2),  # 2 request per putaran (add + remove)
+        ('product_detail', lambda: client.get(f'/product/{product_id}'), 1),
+    ]
+
+    print(f"{'scenario':<15} {'uow':<4} {'reads/req':>10} {'ms/req':>8}")
+    for name, run, requests in cases:
+        for enabled in (True, False):
+            UnitOfWork.ENABLED = enabled
+            run()  # Pemanasan
+            counter.clear()
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                run()
+            elapsed = time.perf_counter() - start
+            total = args.rounds * requests
+            reads = counter.get('_get', 0) / total
+            print(f"{name:<15} {'on' if enabled else 'off':<4} {reads:>10.2f} {elapsed / total * 1000:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+Stress test dan deteksi overselling untuk operasi stok (add/remove/clear cart).
+
+Banyak "pembeli" (thread, opsional tersebar di beberapa proses) menjalankan
+campuran add_to_cart / remove_from_cart / clear_cart secara acak terhadap
+katalog sementara dengan stok terbatas. Setelah selesai, invariant dicek:
+
+  1. Tidak ada stok negatif di products.json (setelah checkpoint ledger)
+  2. Per produk: stok awal == stok akhir + jumlah yang ada di semua keranjang
+  3. Per produk: stok awal + total delta di stock ledger == stok akhir
+
+Mode:
+  direct : memanggil ProductsManager.change_stock / change_stock_many persis
+           seperti routes/cart.py (tanpa overhead HTTP)
+  http   : request sungguhan lewat Flask test client ke /add_to_cart,
+           /remove_from_cart dan /clear_cart (keranjang di session cookie)
+
+Yang dilaporkan: ops/detik, jumlah operasi ditolak karena stok habis, dan
+waktu tunggu lock (stripe lock produk dan lock ledger, termasuk flock
+antar proses). Exit code 1 jika ada invariant yang dilanggar.
+
+Usage:
+    python benchmarks/stress_stock.py [--processes 4] [--threads 8] [--ops 300]
+                                      [--products 8] [--stock 10] [--mode direct|http]
+                                      [--no-fsync] [--seed 1]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import multiprocessing
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+WEIGHTS = (('add', 60), ('remove', 25), ('clear', 15))
+
+
+class TimedLock:
+    """Pengganti threading.Lock yang mencatat lama menunggu acquire()"""
+
+    def __init__(self, samples):
+        self._lock = threading.Lock()
+        self._samples = samples
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self._samples.append(time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def make_catalog(workdir, n_products, stock):
+    """Tulis katalog sementara; return dictionary stok awal"""
+    data_dir = os.path.join(workdir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    data = {f'p_stress_{i}': {'id': f'p_stress_{i}', 'name': f'Produk Stress {i}', 'price': 1000 + i,
+                              'stock': stock, 'image': '', 'phone': '0800'} for i in range(n_products)}
+    with open(os.path.join(data_dir, 'products.json'), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return {pid: p['stock'] for pid, p in data.items()}
+
+
+def use_workdir(workdir):
+    """Arahkan ProductsManager ke katalog sementara"""
+    os.chdir(workdir)
+    import models.products as products_module
+    products_module._PRODUCTS_FILE = os.path.join(workdir, 'data', 'products.json')
+    products_module._SNAPSHOT_FILE = os.path.join(workdir, 'data', 'products.snap')
+    products_module._LEDGER_FILE = os.path.join(workdir, 'data', 'stock_ledger.jsonl')
+    products_module.ProductsManager._invalidate_cache()
+    return products_module
+
+
+def instrument_locks(products_module, waits):
+    """Ganti stripe lock dan lock ledger dengan versi yang mengukur waktu tunggu"""
+    from models.stock_ledger import StockLedger
+    products_module._STRIPE_LOCKS[:] = [TimedLock(waits['stripe']) for _ in products_module._STRIPE_LOCKS]
+
+    original = StockLedger.locked.__func__
+
+    @contextmanager
+    def timed_locked(cls, path, stripes):
+        start = time.perf_counter()
+        with original(cls, path, stripes):
+            waits['ledger'].append(time.perf_counter() - start)
+            yield
+
+    StockLedger.locked = classmethod(timed_locked)
+
+
+class DirectShopper:
+    """Pembeli yang memanggil ProductsManager langsung, keranjang disimpan lokal"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.cart = {}
+
+    def add(self, product_id, quantity):
+        ok = self.manager.change_stock(product_id, -quantity, reason='cart_add')
+        if ok:
+            self.cart[product_id] = self.cart.get(product_id, 0) + quantity
+        return ok
+
+    def remove(self, product_id):
+        qty = self.cart.pop(product_id, 0)
+        if qty > 0:
+            return self.manager.change_stock(product_id, qty, reason='cart_remove')
+        return True
+
+    def clear(self):
+        if not self.cart:
+            return True
+        ok = self.manager.change_stock_many(dict(self.cart), reason='cart_clear')
+        self.cart = {}
+        return ok
+
+    def reserved(self):
+        return dict(self.cart)
+
+
+class HttpShopper:
+    """Pembeli yang memakai endpoint cart sungguhan lewat Flask test client"""
+
+    def __init__(self, app, email):
+        self.client = app.test_client()
+        self.client.post('/login', data={'email': email, 'password': 'stress-pass'})
+
+    def add(self, product_id, quantity):
+        response = self.client.post('/add_to_cart', json={'product_id': product_id, 'quantity': quantity})
+        return response.get_json().get('success', False)
+
+    def remove(self, product_id):
+        self.client.post('/remove_from_cart', data={'product_id': product_id})
+        return True
+
+    def clear(self):
+        self.client.post('/clear_cart')
+        return True
+
+    def reserved(self):
+        with self.client.session_transaction() as sess:
+            cart = sess.get('cart', [])
+        reserved = {}
+        for item in cart:
+            reserved[item['product_id']] = reserved.get(item['product_id'], 0) + item['quantity']
+        return reserved
+
+
+def make_http_app(n_shoppers):
+    """Buat app testing dengan user untuk setiap pembeli"""
+    from main import create_app
+    from routes.auth import user_manager
+    from utils.rate_limit import AuthThrottle
+    from werkzeug.security import generate_password_hash
+    app = create_app('testing', start_background=False)
+    AuthThrottle.ENABLED = False  # Semua pembeli login dari IP yang sama
+    password_hash = generate_password_hash('stress-pass', method='pbkdf2:sha256:1000')
+    for i in range(n_shoppers):
+        email = f'stress{i}@example.com'
+        user_manager.users[email] = {'username': email, 'full_name': f'Stress {i}', 'password_hash': password_hash}
+    return app
+
+
+def run_shoppers(workdir, mode, n_threads, ops, seed, fsync):
+    """
+    Jalankan n_threads pembeli di proses ini
+    Returns: Dictionary hasil (jumlah operasi, keranjang, waktu tunggu lock)
+    """
+    products_module = use_workdir(workdir)
+    from models.stock_ledger import StockLedger
+    waits = {'stripe': [], 'ledger': []}
+    instrument_locks(products_module, waits)
+    manager = products_module.ProductsManager
+    product_ids = list(manager.get_all())
+
+    if mode == 'http':
+        app = make_http_app(n_threads)
+        shoppers = [HttpShopper(app, f'stress{i}@example.com') for i in range(n_threads)]
+    else:
+        shoppers = [DirectShopper(manager) for _ in range(n_threads)]
+    StockLedger.FSYNC = fsync  # Setelah create_app (yang membaca STOCK_LEDGER_FSYNC dari config)
+
+    counts = [{'add': 0, 'remove': 0, 'clear': 0, 'rejected': 0} for _ in range(n_threads)]
+    names = [name for name, _ in WEIGHTS]
+    weights = [weight for _, weight in WEIGHTS]
+    barrier = threading.Barrier(n_threads)
+
+    def worker(t):
+        rng = random.Random(seed * 1000 + t)
+        shopper = shoppers[t]
+        barrier.wait()
+        for _ in range(ops):
+            op = rng.choices(names, weights)[0]
+            if op == 'add':
+                ok = shopper.add(rng.choice(product_ids), rng.randint(1, 3))
+                if not ok:
+                    counts[t]['rejected'] += 1
+            elif op == 'remove':
+                shopper.remove(rng.choice(product_ids))
+            else:
+                shopper.clear()
+            counts[t][op] += 1
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    reserved = {}
+    for shopper in shoppers:
+        for product_id, qty in shopper.reserved().items():
+            reserved[product_id] = reserved.get(product_id, 0) + qty
+    totals = {key: sum(c[key] for c in counts) for key in counts[0]}
+    return {'elapsed': elapsed, 'counts': totals, 'reserved': reserved, 'waits': waits}
+
+
+def run_in_child(args):
+    """Entry point proses anak (harus di level modul untuk spawn)"""
+    return run_shoppers(*args)
+
+
+def check_invariants(workdir, initial, reserved):
+    """
+    Checkpoint ledger lalu cek invariant stok
+    Returns: List pesan pelanggaran (kosong = semua OK)
+    """
+    products_module = use_workdir(workdir)
+    from models.stock_ledger import StockLedger
+    products_module.ProductsManager.checkpoint()
+    with open(products_module._PRODUCTS_FILE, 'r', encoding='utf-8') as f:
+        final = {pid: p['stock'] for pid, p in json.load(f).items()}
+    records, _ = StockLedger.read_from(os.path.abspath(products_module._LEDGER_FILE), 0)
+    ledger_delta = {}
+    for rec in records:
+        ledger_delta[rec['product_id']] = ledger_delta.get(rec['product_id'], 0) + rec['delta']
+
+    violations = []
+    for product_id, start_stock in initial.items():
+        stock = final.get(product_id)
+        in_carts = reserved.get(product_id, 0)
+        if stock is None:
+            violations.append(f"{product_id}: hilang dari products.json")
+            continue
+        if stock < 0:
+            violations.append(f"{product_id}: stok negatif ({stock})")
+        if start_stock != stock + in_carts:
+            violations.append(f"{product_id}: awal {start_stock} != akhir {stock} + keranjang {in_carts}")
+        if start_stock + ledger_delta.get(product_id, 0) != stock:
+            violations.append(f"{product_id}: awal {start_stock} + delta ledger "
+                              f"{ledger_delta.get(product_id, 0)} != akhir {stock}")
+    return violations, final, len(records)
+
+
+def summarize_waits(samples):
+    """Ringkasan waktu tunggu lock dalam milidetik"""
+    if not samples:
+        return 'n=0'
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"n={len(ordered)} total={sum(ordered) * 1000:.0f}ms "
+            f"mean={statistics.mean(ordered) * 1000:.3f}ms p99={p99 * 1000:.3f}ms max={ordered[-1] * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=300)
+    parser.add_argument('--products', type=int, default=8)
+    parser.add_argument('--stock', type=int, default=10)
+    parser.add_argument('--mode', choices=('direct', 'http'), default='direct')
+    parser.add_argument('--no-fsync', action='store_true', help='Matikan fsync ledger (STOCK_LEDGER_FSYNC=False)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--keep', action='store_true', help='Jangan hapus direktori data sementara')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='stress-stock-')
+    if args.mode == 'http':
+        shutil.copytree(os.path.join(ROOT, 'data'), os.path.join(workdir, 'data'))
+        shutil.copy(os.path.join(ROOT, 'user.json'), workdir)
+    initial = make_catalog(workdir, args.products, args.stock)
+
+    jobs = [(workdir, args.mode, args.threads, args.ops, args.seed + p, not args.no_fsync)
+            for p in range(args.processes)]
+    start = time.perf_counter()
+    if args.processes == 1:
+        results = [run_shoppers(*jobs[0])]
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=args.processes, mp_context=context) as pool:
+            results = list(pool.map(run_in_child, jobs))
+    wall = time.perf_counter() - start
+
+    counts = {key: sum(r['counts'][key] for r in results) for key in results[0]['counts']}
+    reserved = {}
+    for r in results:
+        for product_id, qty in r['reserved'].items():
+            reserved[product_id] = reserved.get(product_id, 0) + qty
+    violations, final, ledger_records = check_invariants(workdir, initial, reserved)
+
+    total_ops = counts['add'] + counts['remove'] + counts['clear']
+    print(f"mode={args.mode} processes={args.processes} threads/proses={args.threads} "
+          f"ops/thread={args.ops} produk={args.products} stok awal={args.stock} fsync={not args.no_fsync}")
+    print(f"operasi     : {total_ops} (add {counts['add']}, remove {counts['remove']}, clear {counts['clear']})")
+    print(f"add ditolak : {counts['rejected']} (stok tidak cukup)")
+    print(f"throughput  : {total_ops / wall:.0f} ops/detik (wall {wall:.2f}s)")
+    print(f"ledger      : {ledger_records} record")
+    print(f"stok akhir  : {sum(final.values())} di gudang + {sum(reserved.values())} di keranjang")
+    print(f"tunggu stripe lock : {summarize_waits([w for r in results for w in r['waits']['stripe']])}")
+    print(f"tunggu ledger lock : {summarize_waits([w for r in results for w in r['waits']['ledger']])}")
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if violations:
+        print(f"\nINVARIANT DILANGGAR ({len(violations)}):")
+        for message in violations:
+            print(f"  - {message}")
+        sys.exit(1)
+    print('\nSemua invariant OK')
+
+
+if __name__ == '__main__':
+    main()
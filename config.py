@@ -30,9 +30,77 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True  # Mencegah akses cookie via JavaScript
     SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
     
+    # === STAFF ACCESS ===
+    # Email staff (dipisah koma) yang boleh memakai endpoint meja pickup/admin
+    # (lihat staff_required di utils/decorators.py). Kosong = tidak ada staff.
+    STAFF_EMAILS = frozenset(email.strip().lower() for email in os.environ.get('STAFF_EMAILS', '').split(',')
+                             if email.strip())
+    
+    # === SHARED STORE SETTINGS (lihat utils/redis_store.py) ===
+    # 'local' : stok di products.json + ledger, keranjang/session di cookie (satu host)
+    # 'redis' : stok, keranjang dan session di server Redis bersama (banyak host, pip install redis)
+    STORE_BACKEND = os.environ.get('STORE_BACKEND') or 'local'
+    REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'  # 'fakeredis://' untuk test
+    REDIS_KEY_PREFIX = 'civitas:'  # Prefix semua key (pisahkan beberapa deployment di satu server)
+    REDIS_MAX_CONNECTIONS = 50  # Ukuran connection pool per proses worker
+    REDIS_SOCKET_TIMEOUT = 2  # Detik sebelum operasi Redis dianggap gagal
+    REDIS_STOCK_LEDGER_MAXLEN = 100000  # Record audit stok yang disimpan di stream ledger
+    
     # === SECURITY SETTINGS ===
     WTF_CSRF_ENABLED = True  # Enable CSRF protection (jika menggunakan Flask-WTF)
     
+    # === AUTH RATE LIMIT SETTINGS ===
+    # Token bucket per IP dan per email untuk login/register (429 jika habis)
+    AUTH_RATE_LIMIT_ENABLED = True
+    AUTH_IP_BURST = 20  # Percobaan beruntun maksimal per IP
+    AUTH_IP_PER_MINUTE = 20  # Token yang terisi ulang per menit per IP
+    AUTH_EMAIL_BURST = 5  # Percobaan beruntun maksimal per email
+    AUTH_EMAIL_PER_MINUTE = 5  # Token yang terisi ulang per menit per email
+    AUTH_LIMITER_MAX_KEYS = 10000  # Jumlah bucket maksimal (LRU) per limiter
+    AUTH_MAX_CONCURRENT_HASHES = 0  # Verifikasi PBKDF2 bersamaan (0 = setengah jumlah CPU)
+    AUTH_HASH_WAIT = 0.5  # Detik menunggu slot hash sebelum menolak dengan 429
+    
+    # === RESPONSE COMPRESSION SETTINGS ===
+    # gzip selalu tersedia; brotli dipakai jika terinstall (pip install brotli)
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 500  # Response lebih kecil dari ini (byte) tidak dikompresi
+    COMPRESS_GZIP_LEVEL = 6  # 1 (cepat) - 9 (paling kecil)
+    COMPRESS_BROTLI_QUALITY = 4  # 0 (cepat) - 11 (paling kecil)
+    
+    # === LOGGING SETTINGS (lihat utils/logging_config.py) ===
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+    LOG_FORMAT = 'json'  # 'json' (satu objek per baris) atau 'text'
+    LOG_LEVELS = {'werkzeug': 'WARNING'}  # Override level per modul, mis. {'models.order': 'DEBUG'}
+    LOG_DEBUG_SAMPLE_RATE = 0.01  # Fraksi log DEBUG yang ditulis (event bervolume tinggi)
+    LOG_SAMPLING = {}  # Override sampling per modul, mis. {'models.products': 0.1}
+    LOG_REQUEST_ID = True  # Beri setiap request ID korelasi
+    LOG_REQUEST_ID_HEADER = 'X-Request-ID'  # Diterima dari proxy jika ada, dikembalikan di response
+    
+    # === UNIT OF WORK SETTINGS (lihat utils/unit_of_work.py) ===
+    UNIT_OF_WORK_ENABLED = True  # Produk dimuat sekali per request (identity map)
+    UNIT_OF_WORK_STATS_HEADER = None  # Nama header counter per request, mis. 'X-Store-Stats'
+    
+    # === ADMISSION CONTROL SETTINGS (lihat utils/admission.py) ===
+    # Saat storage macet, request prioritas rendah ditolak cepat (503 + Retry-After)
+    ADMISSION_ENABLED = True
+    ADMISSION_MAX_IN_FLIGHT = 64  # Request bersamaan per proses sebelum shedding (0 = tidak dicek)
+    ADMISSION_MAX_LOCK_WAIT_MS = 200  # Rata-rata tunggu lock storage sebelum shedding (0 = tidak dicek)
+    ADMISSION_RETRY_AFTER = 2  # Retry-After dasar (detik), dikali tingkat tekanan
+    ADMISSION_RETRY_AFTER_MAX = 30
+    # Endpoint yang tidak pernah ditolak: checkout, perubahan keranjang, login dan health check
+    ADMISSION_CRITICAL_ENDPOINTS = (
+        'health.healthz', 'health.readyz', 'static',
+        'auth.login', 'auth.login_page', 'auth.logout',
+        'cart.add_to_cart', 'cart.remove_from_cart', 'cart.clear_cart', 'cart.cart_page',
+        'checkout.checkout', 'checkout.place_order', 'checkout.order_confirmation',
+        'checkout.pickup_locations_api',
+    )
+    
+    # === TEMPLATE SETTINGS (lihat utils/templates.py) ===
+    TEMPLATE_BYTECODE_CACHE = True  # Simpan hasil compile template Jinja di disk, dipakai ulang antar proses
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR')  # None = folder temp per user
+    TEMPLATE_PRECOMPILE = False  # Compile semua template saat startup (request pertama tidak ikut compile)
+    
     # === APPLICATION SETTINGS ===
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # Max upload file 16MB
     
@@ -40,15 +108,68 @@ class Config:
     MAX_CART_ITEMS = 50  # Maksimal 50 jenis item di keranjang
     MAX_QUANTITY_PER_ITEM = 99  # Maksimal quantity per item
     
+    # === DATA FORMAT SETTINGS ===
+    # Format file per store: 'json' (indentasi, mudah dibaca), 'compact' (JSON
+    # tanpa spasi) atau 'msgpack' (biner, butuh pip install msgpack).
+    # File lama tetap terbaca karena format dideteksi otomatis saat load.
+    DATA_FORMATS = {
+        'products': 'json',
+        'orders': 'json',
+        'locations': 'json',
+        'users': 'json',
+    }
+    
+    # === CATALOG SNAPSHOT SETTINGS ===
+    # Publish data/products.snap (biner, dibaca via mmap) setiap katalog disimpan.
+    # Tidak dipakai jika CATALOG_SHARDED aktif
+    CATALOG_SNAPSHOT_ENABLED = True
+    # Katalog dipartisi per penjual di data/catalog/ (index.jsonl + seller_<telepon>.json),
+    # checkpoint stok hanya menulis shard penjual yang berubah. Saat pertama diaktifkan
+    # products.json dipecah otomatis; setelah itu products.json tidak diperbarui lagi
+    CATALOG_SHARDED = os.environ.get('CATALOG_SHARDED', 'false').lower() in ['true', 'on', '1']
+    
+    # === STOCK LEDGER SETTINGS ===
+    # Perubahan stok di-append ke data/stock_ledger.jsonl (audit trail), lalu
+    # ditulis balik ke products.json secara periodik (checkpoint)
+    STOCK_LEDGER_FSYNC = True  # fsync setiap append ledger
+    STOCK_CHECKPOINT_INTERVAL = 30  # Checkpoint tiap N detik (0 = nonaktif)
+    STOCK_CHECKPOINT_MAX_RECORDS = 500  # Checkpoint lebih awal setelah N record
+    
+    # === PICKUP LOCATION SETTINGS ===
+    PICKUP_LOCATIONS_RELOAD_INTERVAL = 2  # Cek perubahan file lokasi tiap N detik (0 = hanya SIGHUP, tidak sampai ke worker gunicorn)
+    PICKUP_LOCATIONS_MAX_AGE = 86400  # Cache-Control max-age untuk /api/pickup_locations (detik)
+    
+    # === RECOMMENDATION SETTINGS ===
+    RECOMMENDATIONS_TOP_K = 4  # Jumlah produk "sering dibeli bersamaan" per produk
+    RECOMMENDATIONS_REBUILD_INTERVAL = 3600  # Hitung ulang penuh dari orders.json tiap N detik
+    
     # === PAGINATION SETTINGS ===
     PRODUCTS_PER_PAGE = 12  # Jumlah produk per halaman (untuk pagination)
     
-    # === EMAIL SETTINGS (untuk future development) ===
+    # === EMAIL SETTINGS ===
+    # Untuk testing lokal: python -m aiosmtpd -n -l localhost:1025
+    # lalu set MAIL_ENABLED=true MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=false
+    MAIL_ENABLED = os.environ.get('MAIL_ENABLED', 'false').lower() in ['true', 'on', '1']
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    MAIL_TIMEOUT = 10  # Timeout koneksi SMTP (detik)
+    
+    # === OUTBOX SETTINGS (antrian email di background) ===
+    OUTBOX_WORKERS = 2  # Jumlah worker thread pengirim email
+    OUTBOX_BATCH_SIZE = 20  # Maksimal email per koneksi SMTP
+    OUTBOX_MAX_ATTEMPTS = 5  # Setelah ini pesan dipindah ke data/outbox/failed
+    OUTBOX_BACKOFF_BASE = 30  # Delay retry pertama (detik), dikali 2 tiap percobaan
+    OUTBOX_BACKOFF_MAX = 3600  # Delay retry maksimal (detik)
+    OUTBOX_POLL_INTERVAL = 5  # Interval cek pesan yang jatuh tempo (detik)
+
+    @staticmethod
+    def init_app(app):
+        """Hook inisialisasi tambahan per environment (dipanggil oleh create_app)"""
+        pass
 
 class DevelopmentConfig(Config):
     """
@@ -57,6 +178,9 @@ class DevelopmentConfig(Config):
     """
     DEBUG = True
     TESTING = False
+    LOG_FORMAT = 'text'  # Lebih mudah dibaca di terminal
+    LOG_LEVELS = {}  # Tampilkan log request werkzeug
+    UNIT_OF_WORK_STATS_HEADER = 'X-Store-Stats'  # Lihat loads/hits per request di devtools
 
 class ProductionConfig(Config):
     """
@@ -68,6 +192,32 @@ class ProductionConfig(Config):
     SECRET_KEY = os.environ.get('SECRET_KEY')  # Harus di-set di environment variable
     SESSION_COOKIE_SECURE = True  # Require HTTPS
     
+    # File data lebih kecil dan cepat di-parse (ganti ke 'msgpack' jika terinstall)
+    DATA_FORMATS = {
+        'products': 'compact',
+        'orders': 'compact',
+        'locations': 'compact',
+        'users': 'compact',
+    }
+    
+    # === WSGI SERVER SETTINGS (dibaca oleh gunicorn.conf.py) ===
+    WSGI_BIND = os.environ.get('WSGI_BIND') or '0.0.0.0:8000'
+    WSGI_WORKERS = int(os.environ.get('WSGI_WORKERS') or 0)  # 0 = otomatis: 2 x CPU + 1
+    WSGI_THREADS = int(os.environ.get('WSGI_THREADS') or 0)  # 0 = otomatis: 2 x CPU (maks 8)
+    WSGI_PRELOAD = True  # Load app + warmup cache sebelum fork (memori dibagi copy-on-write)
+    WSGI_MAX_REQUESTS = 2000  # Recycle worker setelah N request (cegah memory creep)
+    WSGI_MAX_REQUESTS_JITTER = 200  # Acak agar worker tidak restart bersamaan
+    WSGI_TIMEOUT = 30  # Worker yang hang lebih dari N detik di-restart
+    WSGI_GRACEFUL_TIMEOUT = 30  # Waktu menyelesaikan request saat reload/shutdown
+    WSGI_KEEPALIVE = 5  # Detik menahan koneksi keep-alive
+    
+    # Template di-compile di master sebelum fork (WSGI_PRELOAD), worker baru tidak perlu compile
+    TEMPLATE_PRECOMPILE = True
+    
+    # Worker gthread hanya memproses WSGI_THREADS request sekaligus (sisanya antri di socket),
+    # jadi shedding dimulai saat 3/4 thread sibuk
+    ADMISSION_MAX_IN_FLIGHT = max(1, (WSGI_THREADS or min(2 * (os.cpu_count() or 1), 8)) * 3 // 4)
+    
     # Validasi environment variables yang wajib ada di production
     @classmethod
     def init_app(cls, app):
@@ -85,6 +235,9 @@ class TestingConfig(Config):
     DEBUG = True
     JSON_FILE = 'test_user.json'  # Gunakan file terpisah untuk testing
     WTF_CSRF_ENABLED = False  # Disable CSRF untuk testing
+    MAIL_ENABLED = False  # Jangan kirim email saat testing
+    TEMPLATE_BYTECODE_CACHE = False  # Test tidak bergantung pada file cache di luar repo
+    ADMISSION_ENABLED = False  # Shedding acak akan membuat hasil test tidak deterministik
 
 # === CONFIGURATION MAPPING ===
 config = {
@@ -0,0 +1,38 @@
+"""
+Konfigurasi gunicorn untuk production, diambil dari ProductionConfig di config.py.
+
+    FLASK_ENV=production SECRET_KEY=... gunicorn -c gunicorn.conf.py wsgi:application
+
+kill -HUP <pid master> mengganti worker secara graceful (request berjalan
+diselesaikan dulu). Dengan preload_app (WSGI_PRELOAD, default) worker baru
+di-fork dari master yang sudah memuat aplikasi, jadi HUP TIDAK memuat kode
+baru; deploy kode butuh restart penuh gunicorn (stop lalu start). Perubahan
+file data tidak butuh HUP: cache katalog dan registry lokasi pickup memeriksa
+versi file sendiri.
+"""
+
+import multiprocessing
+import os
+
+from config import ProductionConfig as cfg
+
+# wsgi.py membaca ini agar thread background tidak dibuat di master process
+os.environ['WSGI_DEFER_BACKGROUND'] = '1'
+
+cpu = multiprocessing.cpu_count()
+
+bind = cfg.WSGI_BIND
+workers = cfg.WSGI_WORKERS or (2 * cpu + 1)
+threads = cfg.WSGI_THREADS or min(2 * cpu, 8)
+worker_class = 'gthread'
+preload_app = cfg.WSGI_PRELOAD
+max_requests = cfg.WSGI_MAX_REQUESTS
+max_requests_jitter = cfg.WSGI_MAX_REQUESTS_JITTER
+timeout = cfg.WSGI_TIMEOUT
+graceful_timeout = cfg.WSGI_GRACEFUL_TIMEOUT
+keepalive = cfg.WSGI_KEEPALIVE
+
+def post_fork(server, worker):
+    """Jalankan thread background (checkpoint stok, watcher lokasi, outbox) di worker"""
+    import wsgi
+    wsgi.post_fork()
@@ -1,5 +1,20 @@
-from flask import Flask, redirect, url_for
+import time
+_IMPORT_START = time.perf_counter()
+
+from flask import Flask, redirect, url_for, request, jsonify
 from config import Config, get_config
+from models.outbox import OutboxManager
+from models.pickup_location import PickupLocationManager
+from models.products import ProductsManager
+from models.recommendation import RecommendationManager
+from utils import codec
+from utils.admission import AdmissionController
+from utils.compression import Compressor
+from utils.logging_config import configure_logging
+from utils.rate_limit import AuthThrottle
+from utils.redis_store import RedisStore
+from utils.templates import TemplateCache
+from utils.unit_of_work import UnitOfWork
 
 # Import blueprints
 from routes.auth import auth_bp
@@ -7,31 +22,127 @@ from routes.pages import pages_bp
 from routes.products import products_bp
 from routes.cart import cart_bp
 from routes.checkout import checkout_bp
+from routes.reports import reports_bp
+from routes.health import health_bp
+from routes.api import api_bp
+from utils.startup import StartupReport, validate_stores
+
+# Durasi import modul aplikasi (blueprint, model, library) untuk laporan startup
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+def start_background_tasks(app):
+    """
+    Menjalankan thread background (checkpoint stok, pemantau lokasi, outbox email).
+    Dipisah dari create_app agar server yang preload app sebelum fork (gunicorn)
+    bisa menjalankannya di tiap worker setelah fork - thread tidak ikut ter-fork.
+    """
+    ProductsManager.start_checkpointer(app.config.get('STOCK_CHECKPOINT_INTERVAL', 30))
+    PickupLocationManager.start_watcher(app.config.get('PICKUP_LOCATIONS_RELOAD_INTERVAL', 0))
+    OutboxManager.start_workers()
+    RecommendationManager.start_builder(app.config.get('RECOMMENDATIONS_REBUILD_INTERVAL', 3600))
 
-def create_app(config_name=None):
+def create_app(config_name=None, start_background=True):
     """
     Application factory untuk membuat instance Flask app.
+    Args:
+        config_name: Nama konfigurasi ('development', 'production', 'testing')
+        start_background: False jika thread background akan dijalankan belakangan
+                          (lihat start_background_tasks dan gunicorn.conf.py)
     """
+    report = StartupReport()
+    report.phases['imports'] = _IMPORT_SECONDS
     app = Flask(__name__)
+    app.extensions['startup'] = report
+    
+    with report.phase('config'):
+        if config_name:
+            from config import config
+            config_class = config[config_name]
+        else:
+            config_class = get_config()
+        app.config.from_object(config_class)
+        config_class.init_app(app)
+        
+        # Logging terstruktur lewat queue (dipasang paling awal agar log startup ikut tercatat)
+        configure_logging(app)
+        
+        # Pilih format file data per store (json/compact/msgpack)
+        codec.configure(app.config)
+        
+        # Rate limit login/register + batas verifikasi hash bersamaan
+        AuthThrottle.init_app(app)
+        
+        # Load shedding saat storage macet (before_request paling awal: request yang
+        # ditolak tidak menyentuh session/store)
+        AdmissionController.init_app(app)
+        
+        # Backend Redis bersama untuk stok/session (STORE_BACKEND='redis')
+        RedisStore.init_app(app)
+        
+        # Kompresi gzip/brotli untuk response HTML/JSON
+        Compressor.init_app(app)
+        
+        # Unit of work per request (didaftarkan setelah Compressor: after_request
+        # berjalan terbalik, jadi header counter ditambahkan sebelum response dikompresi)
+        UnitOfWork.init_app(app)
+        
+        # Cache bytecode Jinja di disk (harus sebelum app.jinja_env pertama kali dipakai)
+        TemplateCache.init_app(app)
+    
+    # Validasi semua file data sebelum menerima request (gagal parse = belum siap)
+    with report.phase('validate_data'):
+        data_ok = validate_stores(report)
+    
+    with report.phase('data_load'):
+        # Snapshot katalog (mmap) + konfigurasi ledger stok
+        ProductsManager.init_app(app)
+        ProductsManager._load()  # Hangatkan cache katalog + replay ledger stok
+        
+        # Muat lokasi pickup sekali ke registry read-only (reload saat file berubah/SIGHUP)
+        PickupLocationManager.init_app(app)
+        
+        # Konfigurasi outbox email (worker hanya jalan jika MAIL_ENABLED)
+        OutboxManager.init_app(app)
+        
+        # Rekomendasi "sering dibeli bersamaan" terakhir (dibangun ulang di background)
+        RecommendationManager.init_app(app)
+    
+    if start_background:
+        with report.phase('background'):
+            start_background_tasks(app)
+    
+    with report.phase('blueprints'):
+        register_blueprints(app)
     
-    if config_name:
-        from config import config
-        app.config.from_object(config[config_name])
-    else:
-        app.config.from_object(get_config())
+    if app.config.get('TEMPLATE_PRECOMPILE'):
+        with report.phase('templates'):
+            TemplateCache.precompile(app)
     
-    # Register blueprints
+    report.ready = data_ok
+    report.log_summary()
+    return app
+
+def register_blueprints(app):
+    """Mendaftarkan semua blueprint dan error handler ke app"""
+    app.register_blueprint(health_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(pages_bp)
     app.register_blueprint(products_bp)
     app.register_blueprint(cart_bp)
     app.register_blueprint(checkout_bp)
+    app.register_blueprint(reports_bp)
+    app.register_blueprint(api_bp)
     
     @app.route('/')
     def index():
         """Halaman utama - redirect ke halaman login"""
         return redirect(url_for('auth.login_page'))
     
+    def wants_json():
+        """Request API/AJAX mendapat error JSON, bukan halaman HTML"""
+        return (request.path.startswith(('/api/', '/reports/'))
+                or request.accept_mimetypes.best == 'application/json')
+    
     # ✅ PERBAIKAN: Error handlers tanpa flash messages berlebihan
     @app.errorhandler(404)
     def page_not_found(error):
@@ -44,14 +155,14 @@ def create_app(config_name=None):
     
     @app.errorhandler(500)
     def internal_server_error(error):
-        """Handler untuk error 500"""
-        from flask import session
-        if 'user_name' in session:
-            return redirect(url_for('pages.home_page'))
-        else:
-            return redirect(url_for('auth.login_page'))
-    
-    return app
+        """Handler untuk error 500: kembalikan status 500 (bukan redirect ke login),
+        agar kegagalan terlihat oleh user dan monitoring. Traceback sudah dicatat
+        oleh Flask (app.logger) sebelum handler ini dipanggil."""
+        if wants_json():
+            return jsonify({'success': False, 'message': 'Terjadi kesalahan pada server'}), 500
+        home = url_for('pages.home_page')
+        return (f'<h1>Terjadi kesalahan pada server</h1>'
+                f'<p>Silakan coba lagi beberapa saat lagi. <a href="{home}">Kembali ke beranda</a></p>'), 500
 
 # Entry point aplikasi
 if __name__ == '__main__':
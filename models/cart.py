@@ -1,4 +1,5 @@
 from flask import session
+from models.records import CartLine
 
 class CartManager:
     """Class untuk mengelola keranjang belanja"""
@@ -11,6 +12,14 @@ class CartManager:
         """
         return session.get('cart', [])
     
+    @staticmethod
+    def get_lines():
+        """
+        Keranjang sebagai record CartLine (lihat models/records.py)
+        Returns: List CartLine
+        """
+        return [CartLine.from_dict(item) for item in CartManager.get_cart()]
+    
     @staticmethod
     def get_cart_count():
         """
@@ -26,8 +35,7 @@ class CartManager:
         Menghitung total harga semua item di keranjang
         Returns: Integer total harga
         """
-        cart = CartManager.get_cart()
-        return sum(item['price'] * item['quantity'] for item in cart)
+        return sum(line.subtotal for line in CartManager.get_lines())
     
     @staticmethod
     def add_to_cart(product_id, name, price, quantity=1, phone=None):
@@ -50,13 +58,8 @@ class CartManager:
                 break
         else:
             # Jika belum ada, tambahkan produk baru
-            cart.append({
-                'product_id': product_id,
-                'name': name,
-                'price': int(price),
-                'quantity': quantity,
-                'phone': phone  # ← TAMBAHAN: Simpan nomor telepon
-            })
+            # Session hanya bisa menyimpan tipe JSON, jadi baris disimpan sebagai dictionary
+            cart.append(CartLine(product_id, name, int(price), quantity, phone).to_dict())
         
         # Simpan kembali ke session
         session['cart'] = cart
@@ -0,0 +1,98 @@
+from bisect import bisect_left, bisect_right, insort
+
+class CatalogIndex:
+    """
+    Index in-memory untuk query katalog (harga, nama, ketersediaan stok).
+
+    - by price : list harga terurut + list ID paralel, range harga dicari
+                 dengan bisect sehingga query rentang = O(log n + k)
+    - by name  : list (nama lowercase, ID) terurut untuk sort berdasarkan nama
+    - in_stock : set ID produk dengan stok > 0
+
+    Index dibangun dari dictionary cache ProductsManager (atribut source) dan
+    diperbarui saat produk ditambah atau stok berubah. Semua method harus
+    dipanggil di bawah _CACHE_LOCK milik models/products.py.
+    """
+
+    def __init__(self, data):
+        self.source = data
+        entries = sorted((self.price_of(p), pid) for pid, p in data.items())
+        self._prices = [price for price, _ in entries]
+        self._price_ids = [pid for _, pid in entries]
+        self._names = sorted((self.name_of(p), pid) for pid, p in data.items())
+        self.in_stock = {pid for pid, p in data.items() if self.stock_of(p) > 0}
+
+    def __len__(self):
+        return len(self._price_ids)
+
+    @staticmethod
+    def price_of(product):
+        """Harga sebagai angka (nilai tidak valid dianggap 0)"""
+        price = product.get('price', 0)
+        if isinstance(price, (int, float)) and not isinstance(price, bool):
+            return price
+        try:
+            return float(price)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def name_of(product):
+        """Kunci sort nama (case-insensitive)"""
+        return str(product.get('name', '')).casefold()
+
+    @staticmethod
+    def stock_of(product):
+        """Stok sebagai integer (nilai tidak valid dianggap 0)"""
+        try:
+            return int(product.get('stock', 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def add(self, product_id, product):
+        """Menambahkan produk baru ke semua index"""
+        price = self.price_of(product)
+        i = bisect_right(self._prices, price)
+        self._prices.insert(i, price)
+        self._price_ids.insert(i, product_id)
+        insort(self._names, (self.name_of(product), product_id))
+        self.set_stock(product_id, self.stock_of(product))
+
+    def set_stock(self, product_id, stock):
+        """Memperbarui set in_stock setelah stok produk berubah"""
+        if stock > 0:
+            self.in_stock.add(product_id)
+        else:
+            self.in_stock.discard(product_id)
+
+    def query(self, min_price=None, max_price=None, in_stock=False, sort='price', descending=False):
+        """
+        Mencari ID produk yang cocok dengan filter
+        Args:
+            min_price, max_price: Rentang harga inklusif (None = tanpa batas)
+            in_stock: True untuk hanya produk dengan stok > 0
+            sort: 'price' atau 'name'
+            descending: True untuk urutan menurun
+        Returns: List ID produk terurut
+        """
+        lo = 0 if min_price is None else bisect_left(self._prices, min_price)
+        hi = len(self._prices) if max_price is None else bisect_right(self._prices, max_price)
+        if lo >= hi:
+            return []
+
+        if sort == 'name':
+            if lo == 0 and hi == len(self._prices):
+                ids = [pid for _, pid in self._names]
+            else:
+                # Rentang harga dulu (k elemen), lalu urutkan k elemen itu berdasarkan nama
+                source = self.source
+                ids = sorted(self._price_ids[lo:hi], key=lambda pid: (self.name_of(source[pid]), pid))
+        else:
+            ids = self._price_ids[lo:hi]
+
+        if in_stock:
+            stocked = self.in_stock
+            ids = [pid for pid in ids if pid in stocked]
+        if descending:
+            ids.reverse()
+        return ids
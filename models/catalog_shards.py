@@ -0,0 +1,187 @@
+import logging
+import os
+from models.records import Product
+from utils import codec
+
+logger = logging.getLogger(__name__)
+
+def _plain(product):
+    """Product record -> dictionary biasa untuk ditulis ke file shard"""
+    return product.to_dict() if isinstance(product, Product) else product
+
+class CatalogShards:
+    """
+    Katalog produk yang dipartisi per penjual (CATALOG_SHARDED).
+
+    Layout direktori (default data/catalog/):
+        index.jsonl         : append-only, satu baris {"id", "shard"} per produk
+        seller_<digit>.json : {product_id: product_data} milik satu penjual,
+                              dikelompokkan berdasarkan nomor telepon penjual
+
+    Checkpoint stok dan add_product hanya menulis ulang shard milik produk
+    yang berubah, sehingga penulisan untuk penjual berbeda tidak pernah
+    menyentuh file yang sama. Index hanya di-append saat ada produk baru
+    (O(1), tidak ditulis ulang). Shard sebuah produk ditentukan sekali saat
+    produk pertama kali disimpan, jadi produk tidak berpindah file walaupun
+    datanya berubah; jika sebuah ID muncul di dua shard (crash di tengah
+    penulisan), index yang menentukan shard mana yang berlaku.
+
+    Perubahan dari proses lain dideteksi lewat stamp() yang murah: mtime
+    direktori (berubah setiap shard di-replace) + ukuran index (bertambah
+    setiap ada produk baru). Edit manual isi shard di tempat tidak terdeteksi.
+
+    Objek ini dipakai ProductsManager di bawah _SAVE_LOCK/_lock_all; method
+    baca (members, shard_for) aman dipanggil dari thread lain.
+    """
+
+    INDEX_NAME = 'index.jsonl'
+    PREFIX = 'seller_'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, self.INDEX_NAME)
+        self.index = {}  # {product_id: nama shard}
+        self._members = {}  # {nama shard: [product_id, ...]}
+
+    @classmethod
+    def shard_name(cls, phone):
+        """Nama shard untuk nomor telepon penjual (hanya digit, 'unknown' jika kosong)"""
+        digits = ''.join(ch for ch in str(phone or '') if ch.isdigit())
+        return f"{cls.PREFIX}{digits or 'unknown'}"
+
+    def path(self, shard):
+        """Path file untuk sebuah shard"""
+        return os.path.join(self.directory, shard + '.json')
+
+    def exists(self):
+        """True jika katalog sudah pernah dipartisi (index ada)"""
+        return os.path.exists(self.index_path)
+
+    def shard_files(self):
+        """List (nama shard, path) semua file shard di direktori"""
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return []
+        return [(name[:-5], os.path.join(self.directory, name)) for name in names
+                if name.startswith(self.PREFIX) and name.endswith('.json')]
+
+    def stamp(self):
+        """
+        Identitas versi katalog: (mtime_ns direktori, ukuran index). Bentuknya
+        sama dengan stamp products.json sehingga bisa dipakai untuk cache dan
+        source_stamp snapshot.
+        Returns: Tuple 2 integer, atau None jika index belum ada
+        """
+        try:
+            return (os.stat(self.directory).st_mtime_ns, os.stat(self.index_path).st_size)
+        except OSError:
+            return None
+
+    def members(self, shard):
+        """Salinan list product_id di sebuah shard (sesuai load/save terakhir)"""
+        return list(self._members.get(shard, ()))
+
+    def shard_for(self, product_id, product=None):
+        """Shard sebuah produk: dari index, atau dari nomor telepon untuk produk baru"""
+        shard = self.index.get(product_id)
+        if shard is None and product is not None:
+            shard = self.shard_name(product.get('phone'))
+        return shard
+
+    def _assign(self, product_id, shard):
+        self.index[product_id] = shard
+        self._members.setdefault(shard, []).append(product_id)
+
+    def read_index(self):
+        """Isi index: {product_id: nama shard} (baris terakhir per ID yang berlaku)"""
+        stored = {}
+        try:
+            with open(self.index_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Baris terakhir belum lengkap (sedang di-append)
+                    try:
+                        entry = codec.loads(line)
+                    except ValueError:
+                        continue  # Baris rusak dilewati
+                    stored[entry.get('id')] = entry.get('shard')
+        except OSError:
+            pass
+        return stored
+
+    def load(self):
+        """
+        Memuat semua shard menjadi satu katalog dan membangun ulang index
+        Returns: Dictionary {product_id: product_data}
+        Isi file shard adalah sumber kebenaran: produk yang belum tercatat di
+        index (crash di antara tulis shard dan append index) tetap dimuat.
+        """
+        stored = self.read_index()
+        data = {}
+        self.index, self._members = {}, {}
+        for shard, path in self.shard_files():
+            products = codec.load_file(path)
+            if not isinstance(products, dict):
+                raise ValueError(f"{os.path.basename(path)}: isi shard harus berupa dict")
+            for product_id, product in products.items():
+                if product_id in data and stored.get(product_id) != shard:
+                    continue  # Duplikat: shard yang tercatat di index yang berlaku
+                if product_id in data:
+                    self._members[self.index[product_id]].remove(product_id)
+                data[product_id] = product
+                self._assign(product_id, shard)
+        return data
+
+    def save(self, data, product_ids=None):
+        """
+        Menulis shard yang berisi product_ids (None = semua shard)
+        Args:
+            data: Dictionary katalog lengkap {product_id: product_data atau Product}
+            product_ids: Iterable ID produk yang berubah
+        Hanya produk di shard yang ditulis yang dikonversi ke dictionary.
+        """
+        if product_ids is None:
+            product_ids = data.keys()
+        new_ids = [pid for pid in data if pid not in self.index]
+        for product_id in new_ids:
+            self._assign(product_id, self.shard_for(product_id, data[product_id]))
+        shards = {self.index[pid] for pid in product_ids if pid in self.index}
+        shards.update(self.index[pid] for pid in new_ids)
+        fmt = codec.store_format('products')
+        os.makedirs(self.directory, exist_ok=True)
+        for shard in sorted(shards):
+            products = {pid: _plain(data[pid]) for pid in self._members.get(shard, ()) if pid in data}
+            self._write(self.path(shard), codec.dumps(products, fmt))
+        if new_ids or not self.exists():
+            # Di-append setelah shard: produk baru tidak pernah tercatat di index tanpa datanya
+            with open(self.index_path, 'ab') as f:
+                f.write(b''.join(codec.dumps({'id': pid, 'shard': self.index[pid]}, 'compact') + b'\n'
+                                 for pid in new_ids))
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def _write(path, raw):
+        """Tulis file secara atomic (tmp + fsync + replace)"""
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def migrate(self, products_file):
+        """
+        Memecah products.json menjadi shard per penjual (sekali, jika belum ada index)
+        Returns: Jumlah produk yang dipindahkan
+        products.json tidak dihapus, tapi tidak diperbarui lagi setelah migrasi.
+        """
+        if self.exists():
+            return 0
+        data = codec.load_file(products_file) if os.path.exists(products_file) else {}
+        data = {pid: p for pid, p in data.items() if isinstance(p, dict)}
+        self.save(data)
+        logger.info("Katalog dipartisi: %d produk ke %d shard penjual di %s",
+                    len(data), len(self._members), self.directory)
+        return len(data)
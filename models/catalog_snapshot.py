@@ -0,0 +1,169 @@
+import json
+import mmap
+import os
+import struct
+
+class CatalogSnapshot:
+    """
+    Snapshot biner read-only dari katalog produk untuk dibaca lewat mmap.
+
+    Layout file:
+        header   : magic, versi, jumlah record, stamp products.json sumber,
+                   offset section records/index/strings
+        records  : record fixed-width per produk (urutan sama dengan katalog)
+        index    : nomor record diurutkan berdasarkan ID (binary search)
+        strings  : string table (u32 panjang + bytes UTF-8)
+
+    Semua worker yang membuka file yang sama berbagi satu salinan di page
+    cache OS, dan get(product_id) hanya binary search + decode satu record.
+    Field di luar id/name/price/stock/image/phone disimpan sebagai JSON kecil
+    di kolom 'extra'.
+    """
+
+    MAGIC = b'CSNP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHxxIqqQQQ')
+    RECORD = struct.Struct('<5I2qB3x')
+    U32 = struct.Struct('<I')
+    NONE = 0xFFFFFFFF
+
+    STRING_FIELDS = ('id', 'name', 'image', 'phone')
+    INT_FIELDS = ('price', 'stock')
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Snapshot kosong: {path}")
+        (magic, version, self.count, mtime_ns, size,
+         self._records_off, self._index_off, self._strings_off) = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"Bukan snapshot katalog yang valid: {path}")
+        self.source_stamp = (mtime_ns, size)
+
+    def close(self):
+        """Tutup mmap dan file"""
+        self._mm.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, data, path, source_stamp):
+        """
+        Menulis snapshot katalog secara atomic (tmp + replace)
+        Args:
+            data: Dictionary {product_id: product_data}
+            path: Path file snapshot
+            source_stamp: Tuple (mtime_ns, size) dari products.json sumber
+        """
+        strings = bytearray()
+
+        def add_string(value):
+            offset = len(strings)
+            raw = value.encode('utf-8')
+            strings.extend(cls.U32.pack(len(raw)))
+            strings.extend(raw)
+            return offset
+
+        records = bytearray()
+        ids = []
+        for product_id, product in data.items():
+            offsets = []
+            extra = {}
+            for field in cls.STRING_FIELDS:
+                value = product_id if field == 'id' else product.get(field)
+                if isinstance(value, str):
+                    offsets.append(add_string(value))
+                else:
+                    offsets.append(cls.NONE)
+                    if field in product:
+                        extra[field] = value
+            ints, flags = [], 0
+            for bit, field in enumerate(cls.INT_FIELDS):
+                value = product.get(field)
+                if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+                    ints.append(value)
+                    flags |= 1 << bit
+                else:
+                    ints.append(0)
+                    if field in product:
+                        extra[field] = value
+            for key, value in product.items():
+                if key not in cls.STRING_FIELDS and key not in cls.INT_FIELDS:
+                    extra[key] = value
+            extra_off = add_string(json.dumps(extra, ensure_ascii=False)) if extra else cls.NONE
+            records.extend(cls.RECORD.pack(*offsets, extra_off, *ints, flags))
+            ids.append(product_id.encode('utf-8'))
+
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        index = b''.join(cls.U32.pack(i) for i in order)
+
+        records_off = cls.HEADER.size
+        index_off = records_off + len(records)
+        strings_off = index_off + len(index)
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(ids), source_stamp[0], source_stamp[1],
+                                 records_off, index_off, strings_off)
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(records)
+            f.write(index)
+            f.write(strings)
+        os.replace(tmp, path)
+
+    def _string_bytes(self, offset):
+        """Ambil bytes string dari string table"""
+        start = self._strings_off + offset
+        (length,) = self.U32.unpack_from(self._mm, start)
+        return self._mm[start + 4:start + 4 + length]
+
+    def _decode(self, record_no):
+        """Decode satu record menjadi dictionary produk"""
+        fields = self.RECORD.unpack_from(self._mm, self._records_off + record_no * self.RECORD.size)
+        product = {}
+        for field, offset in zip(self.STRING_FIELDS, fields[:4]):
+            if offset != self.NONE:
+                product[field] = self._string_bytes(offset).decode('utf-8')
+        flags = fields[7]
+        for bit, (field, value) in enumerate(zip(self.INT_FIELDS, fields[5:7])):
+            if flags & (1 << bit):
+                product[field] = value
+        if fields[4] != self.NONE:
+            product.update(json.loads(self._string_bytes(fields[4])))
+        return product
+
+    def _record_id(self, record_no):
+        """Ambil ID (bytes) dari record tanpa decode field lain"""
+        (offset,) = self.U32.unpack_from(self._mm, self._records_off + record_no * self.RECORD.size)
+        return self._string_bytes(offset)
+
+    def get(self, product_id):
+        """
+        Mencari produk berdasarkan ID dengan binary search di index
+        Returns: Dictionary produk atau None
+        """
+        target = str(product_id).encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (record_no,) = self.U32.unpack_from(self._mm, self._index_off + mid * 4)
+            key = self._record_id(record_no)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return self._decode(record_no)
+        return None
+
+    def get_all(self):
+        """Decode semua produk dengan urutan katalog asli"""
+        products = {}
+        for record_no in range(self.count):
+            product = self._decode(record_no)
+            products[product.get('id')] = product
+        return products
@@ -1,12 +1,37 @@
-import json
+import logging
 import os
+import threading
+from utils import codec
 from datetime import datetime
+from models.order_search import OrderSearchIndex
+from models.outbox import OutboxManager
+from models.records import Order, to_dicts
+from models.recommendation import RecommendationManager
+from utils.admission import AdmissionController
+from utils.json_stream import JsonArrayReader, JsonArrayWriter
+
+logger = logging.getLogger(__name__)
 
 class OrderManager:
     """Class untuk mengelola pesanan"""
     
     ORDER_FILE = 'data/orders.json'
     
+    # Status pesanan; pesanan 'open' masih perlu diproses di meja pickup
+    ORDER_STATUSES = ('menunggu_pembayaran', 'siap_diambil', 'selesai', 'dibatalkan')
+    OPEN_STATUSES = ('menunggu_pembayaran', 'siap_diambil')
+    PAYMENT_STATUSES = ('pending', 'lunas', 'dibatalkan')
+    
+    # Lock untuk operasi load-ubah-simpan agar perubahan antar thread tidak saling timpa
+    _lock = threading.RLock()
+    
+    # Index pesanan open per lokasi pickup: {'stamp': (mtime, size), 'by_location': {loc: [Order]}}
+    # (record slots, lihat models/records.py: index ini ditahan di memori antar request)
+    _open_index = {'stamp': None, 'by_location': {}}
+    
+    # Index pencarian (OrderSearchIndex), dibangun saat pencarian pertama
+    _search = None
+    
     @staticmethod
     def _ensure_data_dir():
         """Pastikan direktori data ada"""
@@ -22,14 +47,13 @@ class OrderManager:
         
         if not os.path.exists(OrderManager.ORDER_FILE):
             # Jika file tidak ada, buat file kosong
-            with open(OrderManager.ORDER_FILE, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=4)
+            with open(OrderManager.ORDER_FILE, 'wb') as f:
+                f.write(codec.dumps([], codec.store_format('orders')))
             return []
         
         try:
-            with open(OrderManager.ORDER_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            return codec.load_file(OrderManager.ORDER_FILE)
+        except (ValueError, FileNotFoundError):
             return []
     
     @staticmethod
@@ -37,16 +61,48 @@ class OrderManager:
         """
         Menyimpan data pesanan ke file JSON
         Args:
-            orders: List pesanan
+            orders: List pesanan, atau iterable/generator pesanan yang ditulis
+                    satu per satu (memori konstan, lihat delete_order; index
+                    pesanan open lalu diperbarui oleh pemanggil)
         Returns: Boolean sukses/gagal
         """
         try:
             OrderManager._ensure_data_dir()
-            with open(OrderManager.ORDER_FILE, 'w', encoding='utf-8') as f:
-                json.dump(orders, f, ensure_ascii=False, indent=4)
+            before = OrderManager._file_stamp()
+            fmt = codec.store_format('orders')
+            streaming = not isinstance(orders, list)
+            if streaming and fmt == 'msgpack':
+                orders = list(orders)  # Header array msgpack butuh jumlah elemen
+                streaming = False
+            # Tulis ke file temporary lalu replace (atomic: file tidak pernah setengah tertulis)
+            tmp_path = OrderManager.ORDER_FILE + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                if streaming:
+                    with JsonArrayWriter(f, fmt) as writer:
+                        for order in orders:
+                            writer.write(order)
+                else:
+                    f.write(codec.dumps(orders, fmt))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, OrderManager.ORDER_FILE)
+            stamp = OrderManager._file_stamp()
+            if not streaming:
+                OrderManager._rebuild_open_index(orders)
+            elif OrderManager._open_index['stamp'] == before:
+                OrderManager._open_index['stamp'] = stamp  # Pemanggil memperbarui index open sendiri
+            else:
+                OrderManager._open_index = {'stamp': None, 'by_location': {}}
+            search = OrderManager._search
+            if search is not None:
+                if search.stamp == before:
+                    # Pemanggil memperbarui index secara inkremental (masih di dalam _lock)
+                    search.stamp = stamp
+                else:
+                    OrderManager._search = None  # File sempat diubah proses lain: bangun ulang
             return True
-        except Exception as e:
-            print(f"Error saving orders: {e}")
+        except Exception:
+            logger.exception("Error saving orders")
             return False
     
     @staticmethod
@@ -58,18 +114,16 @@ class OrderManager:
         Returns: Boolean sukses/gagal
         """
         try:
-            orders = OrderManager._load_orders()
-            
             # Validasi data wajib
             required_fields = ['order_id', 'user_id', 'fullname', 'phone', 'items', 'total', 'pickup_location']
             for field in required_fields:
                 if field not in order_data:
-                    print(f"Missing required field: {field}")
+                    logger.warning("Missing required field: %s", field)
                     return False
             
             # Pastikan items adalah list
             if not isinstance(order_data['items'], list):
-                print("Items must be a list")
+                logger.warning("Items must be a list")
                 return False
             
             # Tambahkan timestamp jika belum ada
@@ -83,14 +137,30 @@ class OrderManager:
             if 'payment_status' not in order_data:
                 order_data['payment_status'] = 'pending'
             
-            # Tambahkan pesanan ke list
-            orders.append(order_data)
-            
-            # Simpan ke file
-            return OrderManager._save_orders(orders)
+            # Tambahkan pesanan ke list lalu simpan ke file
+            with AdmissionController.storage_lock(OrderManager._lock):
+                orders = OrderManager._load_orders()
+                orders.append(order_data)
+                if not OrderManager._save_orders(orders):
+                    return False
+                if OrderManager._search is not None:
+                    OrderManager._search.add(order_data)
+                
+                # Catat email konfirmasi ke outbox di critical section yang sama (setelah
+                # pesanan tersimpan, jadi tidak ada email untuk pesanan yang gagal disimpan);
+                # pengiriman dilakukan worker di background
+                if OutboxManager.enqueue_order_confirmation(order_data) is False:
+                    # Pesanan tetap sah; hanya email konfirmasinya yang tidak akan terkirim
+                    logger.warning("Email konfirmasi pesanan %s gagal masuk outbox",
+                                   order_data['order_id'], extra={'order_id': order_data['order_id']})
+                
+                # Update rekomendasi "sering dibeli bersamaan" secara inkremental; di dalam
+                # lock agar rebuild yang sedang berjalan tidak kehilangan pesanan ini
+                RecommendationManager.add_order(order_data)
+            return True
             
-        except Exception as e:
-            print(f"Error creating order: {e}")
+        except Exception:
+            logger.exception("Error creating order")
             return False
     
     @staticmethod
@@ -110,8 +180,8 @@ class OrderManager:
             
             return None
             
-        except Exception as e:
-            print(f"Error getting order by ID: {e}")
+        except Exception:
+            logger.exception("Error getting order by ID")
             return None
     
     @staticmethod
@@ -135,10 +205,45 @@ class OrderManager:
             
             return user_orders
             
-        except Exception as e:
-            print(f"Error getting orders by user ID: {e}")
+        except Exception:
+            logger.exception("Error getting orders by user ID")
             return []
     
+    @staticmethod
+    def _iter_file():
+        """Pesanan di orders.json satu per satu, langsung dari file (streaming, best-effort)"""
+        for order in JsonArrayReader(OrderManager.ORDER_FILE, strict=False):
+            if isinstance(order, dict):
+                yield order
+    
+    @staticmethod
+    def iter_orders(filter=None):
+        """
+        Iterasi pesanan satu per satu tanpa memuat seluruh orders.json
+        Memori konstan (sebanding satu pesanan), jadi aman untuk laporan,
+        export dan job maintenance di histori pesanan sebesar apa pun;
+        berhenti iterasi (break) langsung menutup file.
+        Untuk pembacaan saja: jika file rusak/terpotong iterasi berhenti di
+        sana (dengan log warning); penulisan ulang file memakai
+        JsonArrayReader strict (lihat delete_order).
+        Args:
+            filter: None (semua), callable(order) -> bool, atau dictionary
+                    {field: nilai} (nilai berupa list/tuple/set = salah satu dari)
+        Yields: Dictionary pesanan dengan urutan sesuai file
+        """
+        if isinstance(filter, dict):
+            criteria = [(field, value if isinstance(value, (list, tuple, set, frozenset)) else (value,))
+                        for field, value in filter.items()]
+            
+            def predicate(order):
+                return all(order.get(field) in values for field, values in criteria)
+        else:
+            predicate = filter
+        
+        for order in OrderManager._iter_file():
+            if predicate is None or predicate(order):
+                yield order
+    
     @staticmethod
     def get_all_orders():
         """
@@ -146,15 +251,15 @@ class OrderManager:
         Returns: List semua pesanan
         """
         try:
-            orders = OrderManager._load_orders()
+            orders = list(OrderManager.iter_orders())
             
             # Urutkan berdasarkan tanggal terbaru
             orders.sort(key=lambda x: x.get('created_at', ''), reverse=True)
             
             return orders
             
-        except Exception as e:
-            print(f"Error getting all orders: {e}")
+        except Exception:
+            logger.exception("Error getting all orders")
             return []
     
     @staticmethod
@@ -166,20 +271,8 @@ class OrderManager:
             status: Status baru
         Returns: Boolean sukses/gagal
         """
-        try:
-            orders = OrderManager._load_orders()
-            
-            for order in orders:
-                if order.get('order_id') == order_id:
-                    order['status'] = status
-                    order['updated_at'] = datetime.now().isoformat()
-                    return OrderManager._save_orders(orders)
-            
-            return False
-            
-        except Exception as e:
-            print(f"Error updating order status: {e}")
-            return False
+        result = OrderManager.bulk_update(order_ids=[order_id], status=status, check_rules=False)
+        return result['updated'] == 1
     
     @staticmethod
     def update_payment_status(order_id, payment_status):
@@ -190,20 +283,154 @@ class OrderManager:
             payment_status: Status pembayaran baru
         Returns: Boolean sukses/gagal
         """
+        result = OrderManager.bulk_update(order_ids=[order_id], payment_status=payment_status,
+                                          check_rules=False)
+        return result['updated'] == 1
+    
+    @staticmethod
+    def bulk_update(order_ids=None, pickup_location=None, current_status=None,
+                    status=None, payment_status=None, check_rules=True):
+        """
+        Mengubah status dan/atau status pembayaran banyak pesanan dalam satu
+        penulisan file (all-or-nothing di level file)
+        Args:
+            order_ids: List ID pesanan yang diubah, atau
+            pickup_location: Ubah semua pesanan open di lokasi ini
+            current_status: Filter tambahan untuk pickup_location (mis. 'menunggu_pembayaran')
+            status: Status pesanan baru (None = tidak diubah)
+            payment_status: Status pembayaran baru (None = tidak diubah)
+            check_rules: Aturan meja pickup: status harus dikenal dan status pesanan
+                yang sudah ditutup tidak bisa diubah lagi (False untuk update satu
+                pesanan lewat update_order_status/update_payment_status)
+        Returns: Dictionary {'success', 'updated', 'message', 'results': [hasil per pesanan]}
+        """
+        if status is None and payment_status is None:
+            return {'success': False, 'updated': 0, 'message': 'Tidak ada status yang diubah', 'results': []}
+        if check_rules and status is not None and status not in OrderManager.ORDER_STATUSES:
+            return {'success': False, 'updated': 0, 'message': f"Status tidak dikenal: {status}", 'results': []}
+        if check_rules and payment_status is not None and payment_status not in OrderManager.PAYMENT_STATUSES:
+            return {'success': False, 'updated': 0,
+                    'message': f"Status pembayaran tidak dikenal: {payment_status}", 'results': []}
+        if not order_ids and not pickup_location:
+            return {'success': False, 'updated': 0, 'message': 'order_ids atau pickup_location wajib diisi',
+                    'results': []}
+        
         try:
-            orders = OrderManager._load_orders()
+            with AdmissionController.storage_lock(OrderManager._lock):
+                orders = OrderManager._load_orders()
+                by_id = {order.get('order_id'): order for order in orders}
+                
+                if order_ids:
+                    targets = list(dict.fromkeys(order_ids))  # Buang duplikat, urutan tetap
+                else:
+                    targets = [
+                        order.get('order_id') for order in orders
+                        if order.get('pickup_location') == pickup_location
+                        and order.get('status') in OrderManager.OPEN_STATUSES
+                        and (current_status is None or order.get('status') == current_status)
+                    ]
+                
+                now = datetime.now().isoformat()
+                results = []
+                for order_id in targets:
+                    order = by_id.get(order_id)
+                    if order is None:
+                        results.append({'order_id': order_id, 'success': False,
+                                        'message': 'Pesanan tidak ditemukan'})
+                        continue
+                    closed = order.get('status') not in OrderManager.OPEN_STATUSES
+                    if check_rules and status is not None and closed and status != order.get('status'):
+                        # Pembayaran pesanan yang sudah ditutup tetap boleh dicatat
+                        results.append({'order_id': order_id, 'success': False,
+                                        'message': f"Pesanan sudah ditutup ({order.get('status')})"})
+                        continue
+                    if status is not None:
+                        order['status'] = status
+                    if payment_status is not None:
+                        order['payment_status'] = payment_status
+                    order['updated_at'] = now
+                    results.append({'order_id': order_id, 'success': True, 'status': order.get('status'),
+                                    'payment_status': order.get('payment_status')})
+                
+                updated = sum(1 for result in results if result['success'])
+                if updated and not OrderManager._save_orders(orders):
+                    for result in results:
+                        if result['success']:
+                            result.update(success=False, message='Gagal menyimpan perubahan')
+                    return {'success': False, 'updated': 0, 'message': 'Gagal menyimpan perubahan',
+                            'results': results}
+                if updated and OrderManager._search is not None:
+                    for result in results:
+                        if result['success']:
+                            OrderManager._search.update(by_id[result['order_id']])
+                return {'success': True, 'updated': updated, 'message': f"{updated} pesanan diperbarui",
+                        'results': results}
             
-            for order in orders:
-                if order.get('order_id') == order_id:
-                    order['payment_status'] = payment_status
-                    order['updated_at'] = datetime.now().isoformat()
-                    return OrderManager._save_orders(orders)
-            
-            return False
-            
-        except Exception as e:
-            print(f"Error updating payment status: {e}")
-            return False
+        except Exception:
+            logger.exception("Error bulk update orders")
+            return {'success': False, 'updated': 0, 'message': 'Terjadi kesalahan', 'results': []}
+    
+    @staticmethod
+    def _file_stamp():
+        """Identitas versi file pesanan (mtime, size), None jika tidak ada"""
+        try:
+            st = os.stat(OrderManager.ORDER_FILE)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _rebuild_open_index(orders):
+        """Bangun index pesanan open per lokasi dari list pesanan yang baru dimuat/disimpan"""
+        by_location = {}
+        for order in orders:
+            if isinstance(order, dict) and order.get('status') in OrderManager.OPEN_STATUSES:
+                order = Order.from_dict(order)
+                by_location.setdefault(order.pickup_location, []).append(order)
+        for location_orders in by_location.values():
+            location_orders.sort(key=lambda x: x.created_at or '')
+        OrderManager._open_index = {'stamp': OrderManager._file_stamp(), 'by_location': by_location}
+    
+    @staticmethod
+    def get_open_orders_by_location(pickup_location):
+        """
+        Pesanan yang masih open di satu lokasi pickup, dari yang paling lama
+        Index hanya dibangun ulang jika file pesanan diubah proses lain.
+        Args:
+            pickup_location: ID lokasi pickup
+        Returns: List dictionary pesanan
+        """
+        index = OrderManager._open_index
+        if index['stamp'] is None or index['stamp'] != OrderManager._file_stamp():
+            with OrderManager._lock:
+                OrderManager._rebuild_open_index(OrderManager._load_orders())
+            index = OrderManager._open_index
+        return to_dicts(index['by_location'].get(pickup_location, []))
+    
+    @staticmethod
+    def _search_index():
+        """Index pencarian yang sesuai dengan versi orders.json saat ini"""
+        index = OrderManager._search
+        if index is None or index.stamp != OrderManager._file_stamp():
+            with OrderManager._lock:
+                index = OrderManager._search
+                stamp = OrderManager._file_stamp()
+                if index is None or index.stamp != stamp:
+                    index = OrderSearchIndex.build(OrderManager.ORDER_FILE, stamp)
+                    OrderManager._search = index
+        return index
+    
+    @staticmethod
+    def search_orders(query, offset=0, limit=20):
+        """
+        Mencari pesanan berdasarkan nama pembeli, telepon, catatan atau ID
+        (substring, atau prefix ID seperti 'ORD-59A9')
+        Args:
+            query: Teks yang dicari
+            offset, limit: Paging hasil (terbaru lebih dulu)
+        Returns: Tuple (total hasil, list ringkasan pesanan)
+        """
+        return OrderManager._search_index().search(query, offset, limit)
     
     @staticmethod
     def delete_order(order_id):
@@ -214,14 +441,22 @@ class OrderManager:
         Returns: Boolean sukses/gagal
         """
         try:
-            orders = OrderManager._load_orders()
-            
-            orders = [order for order in orders if order.get('order_id') != order_id]
-            
-            return OrderManager._save_orders(orders)
+            with AdmissionController.storage_lock(OrderManager._lock):
+                # Tulis ulang file sambil streaming: memori konstan berapa pun jumlah pesanan.
+                # Reader strict: jika file rusak/terpotong, _save_orders gagal sebelum
+                # file diganti, jadi sisa pesanan tidak ikut terhapus
+                orders = (order for order in JsonArrayReader(OrderManager.ORDER_FILE)
+                          if not (isinstance(order, dict) and order.get('order_id') == order_id))
+                if not OrderManager._save_orders(orders):
+                    return False
+                for location_orders in OrderManager._open_index['by_location'].values():
+                    location_orders[:] = [order for order in location_orders if order.order_id != order_id]
+                if OrderManager._search is not None:
+                    OrderManager._search.remove(order_id)
+                return True
             
-        except Exception as e:
-            print(f"Error deleting order: {e}")
+        except Exception:
+            logger.exception("Error deleting order")
             return False
     
     @staticmethod
@@ -231,13 +466,12 @@ class OrderManager:
         Returns: Dictionary statistik
         """
         try:
-            orders = OrderManager._load_orders()
-            
-            total_orders = len(orders)
-            total_revenue = sum(order.get('total', 0) for order in orders)
-            
+            total_orders = 0
+            total_revenue = 0
             status_count = {}
-            for order in orders:
+            for order in OrderManager.iter_orders():
+                total_orders += 1
+                total_revenue += order.get('total', 0)
                 status = order.get('status', 'unknown')
                 status_count[status] = status_count.get(status, 0) + 1
             
@@ -247,10 +481,11 @@ class OrderManager:
                 'status_breakdown': status_count
             }
             
-        except Exception as e:
-            print(f"Error getting order statistics: {e}")
+        except Exception:
+            logger.exception("Error getting order statistics")
             return {
                 'total_orders': 0,
                 'total_revenue': 0,
                 'status_breakdown': {}
-            }
\ No newline at end of file
+            }
+
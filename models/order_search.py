@@ -0,0 +1,188 @@
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from utils.json_stream import JsonArrayReader
+
+class OrderSearchIndex:
+    """
+    Index pencarian pesanan (nama pembeli, telepon, catatan, ID pesanan).
+
+    - Trigram: setiap potongan 3 karakter dari teks pesanan menunjuk ke list
+      nomor dokumen (array int, terurut karena hanya di-append). Query
+      substring cukup mengambil posting list trigram query yang PALING
+      PENDEK lalu memverifikasi kandidatnya, jadi biaya query sebanding
+      dengan jumlah kandidat, bukan jumlah pesanan
+    - Prefix ID: list ID pesanan (huruf besar) terurut, prefix seperti
+      'ORD-59A9' dicari dengan bisect (juga untuk query < 3 karakter)
+    - Telepon diindeks dua kali: apa adanya dan hanya digit, sehingga
+      '0812-3456' dan '08123456' sama-sama ketemu
+
+    Setiap dokumen juga menyimpan ringkasan pesanan (SUMMARY_FIELDS) agar
+    hasil pencarian bisa ditampilkan tanpa memuat orders.json.
+
+    Diperbarui inkremental oleh OrderManager.create_order/delete_order (dan
+    perubahan status); dibangun ulang (streaming) hanya jika orders.json
+    diubah proses lain. Pesanan yang dihapus ditandai (tombstone) dan
+    dibuang saat rebuild.
+    """
+
+    MIN_QUERY = 3  # Panjang minimal query substring (panjang trigram)
+    SUMMARY_FIELDS = ('order_id', 'fullname', 'phone', 'pickup_location', 'total',
+                      'status', 'payment_status', 'created_at')
+    # Field dengan sedikit nilai berbeda: string di-intern agar 1 juta pesanan berbagi objek yang sama
+    _INTERNED = ('pickup_location', 'status', 'payment_status')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}  # {trigram: array('i', [doc, ...])}
+        self._docs = []  # doc -> (teks ternormalisasi, ringkasan) atau None jika dihapus
+        self._doc_of = {}  # {order_id: doc}
+        self._ids = []  # (ORDER_ID huruf besar, doc) terurut untuk pencarian prefix
+        self.stamp = None  # Versi orders.json yang tercermin di index
+
+    def __len__(self):
+        return len(self._doc_of)
+
+    @staticmethod
+    def normalize(text):
+        """Huruf kecil + spasi berlebih dirapikan"""
+        return ' '.join(str(text or '').casefold().split())
+
+    @classmethod
+    def document_text(cls, order):
+        """Teks yang diindeks untuk satu pesanan (field dipisah karakter \\x00)"""
+        phone = str(order.get('phone') or '')
+        digits = re.sub(r'\D', '', phone)
+        parts = [order.get('order_id'), order.get('fullname'), phone, digits, order.get('notes')]
+        return '\x00'.join(cls.normalize(part) for part in parts)
+
+    @staticmethod
+    def trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, order):
+        """Menambahkan (atau mengganti) satu pesanan di index"""
+        with self._lock:
+            self._add_locked(order, keep_sorted=True)
+
+    def _add_locked(self, order, keep_sorted):
+        order_id = order.get('order_id')
+        if not order_id:
+            return
+        if order_id in self._doc_of:
+            self._remove_locked(order_id)
+        text = self.document_text(order)
+        doc = len(self._docs)
+        self._docs.append((text, self.summary(order)))
+        self._doc_of[order_id] = doc
+        for gram in self.trigrams(text):
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('i')
+            posting.append(doc)
+        if keep_sorted:
+            insort(self._ids, (self._id_key(order_id), doc))
+        else:
+            self._ids.append((self._id_key(order_id), doc))
+
+    @classmethod
+    def summary(cls, order):
+        """Ringkasan pesanan sebagai tuple (urutan SUMMARY_FIELDS)"""
+        values = []
+        for field in cls.SUMMARY_FIELDS:
+            value = order.get(field)
+            if field in cls._INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            values.append(value)
+        return tuple(values)
+
+    @staticmethod
+    def _id_key(order_id):
+        """Kunci prefix (huruf besar); ID yang sudah huruf besar dipakai tanpa salinan"""
+        order_id = str(order_id)
+        return order_id if order_id.isupper() else order_id.upper()
+
+    def update(self, order):
+        """Memperbarui ringkasan pesanan (mis. status) tanpa mengubah posisi di index"""
+        with self._lock:
+            doc = self._doc_of.get(order.get('order_id'))
+            text = self.document_text(order)
+            if doc is not None and self._docs[doc][0] == text:
+                self._docs[doc] = (text, self.summary(order))
+            else:
+                self._add_locked(order, keep_sorted=True)
+
+    def remove(self, order_id):
+        """Menghapus pesanan dari hasil pencarian"""
+        with self._lock:
+            self._remove_locked(order_id)
+
+    def _remove_locked(self, order_id):
+        doc = self._doc_of.pop(order_id, None)
+        if doc is None:
+            return
+        self._docs[doc] = None  # Posting list tetap, kandidat None dilewati saat query
+        key = (self._id_key(order_id), doc)
+        i = bisect_left(self._ids, key)
+        if i < len(self._ids) and self._ids[i] == key:
+            del self._ids[i]
+
+    def _prefix_docs(self, prefix):
+        """Nomor dokumen dengan ID pesanan berawalan prefix"""
+        prefix = prefix.upper()
+        lo = bisect_left(self._ids, (prefix,))
+        hi = bisect_right(self._ids, (prefix + '\uffff',))
+        return {doc for _, doc in self._ids[lo:hi]}
+
+    def search(self, query, offset=0, limit=20):
+        """
+        Mencari pesanan berdasarkan substring nama/telepon/catatan/ID atau prefix ID
+        Args:
+            query: Teks yang dicari (case-insensitive)
+            offset, limit: Paging hasil (terbaru lebih dulu)
+        Returns: Tuple (total hasil, list ringkasan pesanan untuk halaman ini)
+        """
+        needle = self.normalize(query)
+        if not needle:
+            return 0, []
+        digits = re.sub(r'\D', '', needle)
+        if digits and re.fullmatch(r'[\d\s+().-]+', needle):
+            needle = digits  # Query nomor telepon: cocokkan versi digit saja
+
+        with self._lock:
+            docs = self._prefix_docs(needle)
+            if len(needle) >= self.MIN_QUERY:
+                grams = self.trigrams(needle)
+                postings = [self._postings.get(gram) for gram in grams]
+                if all(postings):
+                    shortest = min(postings, key=len)
+                    for doc in shortest:
+                        entry = self._docs[doc]
+                        if entry is not None and needle in entry[0]:
+                            docs.add(doc)
+            # Nomor dokumen mengikuti urutan file (= urutan pesanan dibuat), jadi
+            # cukup sort integer lalu ringkasan hanya dibuat untuk satu halaman
+            docs = sorted((doc for doc in docs if self._docs[doc] is not None), reverse=True)
+            page = docs[offset:offset + limit] if limit is not None else docs[offset:]
+            return len(docs), [dict(zip(self.SUMMARY_FIELDS, self._docs[doc][1])) for doc in page]
+
+    @classmethod
+    def build(cls, path, stamp=None):
+        """
+        Membangun index dari file pesanan secara streaming (memori sebanding index,
+        bukan ukuran file JSON)
+        Args:
+            path: Path orders.json
+            stamp: Versi file yang dibaca
+        """
+        index = cls()
+        with index._lock:
+            for order in JsonArrayReader(path, strict=False):
+                if isinstance(order, dict):
+                    index._add_locked(order, keep_sorted=False)
+            # ID duplikat di file: entry lama sudah di-tombstone, cukup sort sekali di akhir
+            index._ids = sorted(entry for entry in index._ids if index._docs[entry[1]] is not None)
+        index.stamp = stamp
+        return index
@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+class OutboxManager:
+    """
+    Class untuk antrian notifikasi email (outbox) yang tahan crash.
+
+    Setiap pesan disimpan sebagai satu file JSON kecil di data/outbox/pending,
+    ditulis pada langkah yang sama dengan OrderManager.create_order. Worker di
+    background mengambil pesan secara batch, mengirim lewat satu koneksi SMTP,
+    dan menjadwalkan ulang pesan yang gagal dengan exponential backoff.
+
+    Nama file = "<waktu_kirim_ms>-<id>.json", sehingga worker cukup membaca
+    daftar nama file (tanpa membuka isinya) untuk tahu pesan mana yang siap.
+    """
+
+    OUTBOX_DIR = 'data/outbox'
+    LEASE_SECONDS = 300  # Pesan di processing/ lebih lama dari ini dianggap yatim (worker crash)
+
+    # Diisi oleh init_app dari konfigurasi Flask
+    ENABLED = False
+    _settings = {}
+    _wake = threading.Event()
+    _stop = threading.Event()
+    _workers = []
+
+    @staticmethod
+    def _dir(state):
+        """Path sub-direktori outbox: pending, processing, atau failed"""
+        return os.path.join(OutboxManager.OUTBOX_DIR, state)
+
+    @staticmethod
+    def _ensure_dirs():
+        """Pastikan semua direktori outbox ada"""
+        for state in ('pending', 'processing', 'failed'):
+            os.makedirs(OutboxManager._dir(state), exist_ok=True)
+
+    @staticmethod
+    def _write_message(path, message):
+        """Tulis pesan ke file secara atomic (tmp + fsync + replace)"""
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(message, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membaca konfigurasi email. Worker pool dijalankan lewat start_workers()
+        Args:
+            app: Instance Flask app
+        """
+        cls.ENABLED = app.config.get('MAIL_ENABLED', False)
+        cls._settings = {
+            'server': app.config.get('MAIL_SERVER'),
+            'port': app.config.get('MAIL_PORT'),
+            'use_tls': app.config.get('MAIL_USE_TLS', False),
+            'username': app.config.get('MAIL_USERNAME'),
+            'password': app.config.get('MAIL_PASSWORD'),
+            'sender': app.config.get('MAIL_DEFAULT_SENDER') or app.config.get('MAIL_USERNAME'),
+            'timeout': app.config.get('MAIL_TIMEOUT', 10),
+            'workers': app.config.get('OUTBOX_WORKERS', 2),
+            'batch_size': app.config.get('OUTBOX_BATCH_SIZE', 20),
+            'max_attempts': app.config.get('OUTBOX_MAX_ATTEMPTS', 5),
+            'backoff_base': app.config.get('OUTBOX_BACKOFF_BASE', 30),
+            'backoff_max': app.config.get('OUTBOX_BACKOFF_MAX', 3600),
+            'poll_interval': app.config.get('OUTBOX_POLL_INTERVAL', 5),
+        }
+
+    @classmethod
+    def start_workers(cls):
+        """Menjalankan worker thread jika MAIL_ENABLED (idempotent)"""
+        if not cls.ENABLED or any(t.is_alive() for t in cls._workers):
+            return
+        cls._ensure_dirs()
+        cls._recover_orphans()
+        cls._stop.clear()
+        cls._workers = [
+            threading.Thread(target=cls._worker_loop, name=f'outbox-worker-{i}', daemon=True)
+            for i in range(cls._settings.get('workers', 2))
+        ]
+        for t in cls._workers:
+            t.start()
+
+    @classmethod
+    def stop_workers(cls, timeout=5):
+        """Menghentikan worker thread"""
+        cls._stop.set()
+        cls._wake.set()
+        for t in cls._workers:
+            t.join(timeout)
+        cls._workers = []
+
+    @classmethod
+    def enqueue(cls, to, subject, body, kind='generic'):
+        """
+        Menyimpan email ke outbox (durable) lalu membangunkan worker
+        Args:
+            to: Alamat email tujuan
+            subject: Subjek email
+            body: Isi email (plain text)
+            kind: Jenis notifikasi (untuk logging)
+        Returns: Boolean sukses/gagal
+        """
+        if not cls.ENABLED:
+            return False
+        try:
+            cls._ensure_dirs()
+            message = {
+                'id': uuid.uuid4().hex,
+                'kind': kind,
+                'to': to,
+                'subject': subject,
+                'body': body,
+                'attempts': 0,
+                'last_error': None,
+                'created_at': time.time(),
+            }
+            name = f"{int(time.time() * 1000):013d}-{message['id']}.json"
+            cls._write_message(os.path.join(cls._dir('pending'), name), message)
+            cls._wake.set()
+            return True
+        except Exception:
+            logger.exception("Error enqueue outbox")
+            return False
+
+    @classmethod
+    def enqueue_order_confirmation(cls, order):
+        """
+        Menyimpan email konfirmasi pesanan ke outbox
+        Args:
+            order: Dictionary pesanan yang baru dibuat
+        Returns: True/False sukses/gagal menyimpan, None jika tidak ada yang
+                 perlu dikirim (MAIL_ENABLED mati atau pesanan tanpa email)
+        """
+        to = order.get('user_email', '')
+        if not cls.ENABLED or '@' not in to:
+            return None
+
+        from models.pickup_location import PickupLocationManager
+        location_name = PickupLocationManager.get_location_name(order.get('pickup_location'))
+
+        lines = [
+            f"Halo {order.get('fullname', '')},",
+            '',
+            f"Pesanan {order['order_id']} berhasil dibuat dengan metode COD.",
+            '',
+            'Detail pesanan:',
+        ]
+        for item in order.get('items', []):
+            lines.append(f"- {item.get('name')} x{item.get('quantity')} @ Rp {item.get('price', 0):,}")
+        lines += [
+            '',
+            f"Total: Rp {order.get('total', 0):,}",
+            f"Lokasi pickup: {location_name}",
+            '',
+            'Silakan bayar saat mengambil barang di lokasi pickup.',
+        ]
+        return cls.enqueue(to, f"Konfirmasi Pesanan {order['order_id']}", '\n'.join(lines),
+                           kind='order_confirmation')
+
+    @classmethod
+    def _recover_orphans(cls):
+        """Kembalikan pesan di processing/ yang ditinggal worker crash ke pending/"""
+        now = time.time()
+        processing = cls._dir('processing')
+        for name in os.listdir(processing):
+            path = os.path.join(processing, name)
+            try:
+                if name.endswith('.json') and now - os.path.getmtime(path) > cls.LEASE_SECONDS:
+                    os.replace(path, os.path.join(cls._dir('pending'), name))
+            except OSError:
+                pass
+
+    @classmethod
+    def _claim_batch(cls):
+        """
+        Mengklaim pesan yang sudah jatuh tempo dengan rename atomic ke processing/
+        Returns: List tuple (path, message)
+        """
+        now_ms = int(time.time() * 1000)
+        pending = cls._dir('pending')
+        batch = []
+        for name in sorted(os.listdir(pending)):
+            if not name.endswith('.json'):
+                continue
+            if int(name.split('-', 1)[0]) > now_ms:
+                break  # File terurut berdasarkan waktu kirim
+            src = os.path.join(pending, name)
+            dst = os.path.join(cls._dir('processing'), name)
+            try:
+                os.replace(src, dst)  # Gagal jika sudah diklaim worker lain
+                with open(dst, 'r', encoding='utf-8') as f:
+                    batch.append((dst, json.load(f)))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if len(batch) >= cls._settings.get('batch_size', 20):
+                break
+        return batch
+
+    @classmethod
+    def _next_due_in(cls):
+        """Detik sampai pesan pending berikutnya jatuh tempo (maksimal poll_interval)"""
+        poll = cls._settings.get('poll_interval', 5)
+        try:
+            names = sorted(n for n in os.listdir(cls._dir('pending')) if n.endswith('.json'))
+        except OSError:
+            return poll
+        if not names:
+            return poll
+        due = int(names[0].split('-', 1)[0]) / 1000 - time.time()
+        return min(max(due, 0.05), poll)
+
+    @classmethod
+    def _worker_loop(cls):
+        """Loop utama worker: ambil batch, kirim, tunggu sampai ada pesan baru"""
+        while not cls._stop.is_set():
+            try:
+                batch = cls._claim_batch()
+                if batch:
+                    cls._deliver(batch)
+                    continue
+            except Exception:
+                logger.exception("Error outbox worker")
+            cls._wake.wait(cls._next_due_in())
+            cls._wake.clear()
+
+    @classmethod
+    def _deliver(cls, batch):
+        """
+        Mengirim satu batch pesan melalui satu koneksi SMTP
+        Args:
+            batch: List tuple (path, message) hasil _claim_batch
+        """
+        s = cls._settings
+        try:
+            smtp = smtplib.SMTP(s['server'], s['port'], timeout=s['timeout'])
+        except Exception as e:
+            for path, message in batch:
+                cls._reschedule(path, message, e)
+            return
+
+        try:
+            if s['use_tls']:
+                smtp.starttls()
+            if s['username'] and s['password']:
+                smtp.login(s['username'], s['password'])
+
+            for path, message in batch:
+                try:
+                    email = EmailMessage()
+                    email['From'] = s['sender'] or 'noreply@localhost'
+                    email['To'] = message['to']
+                    email['Subject'] = message['subject']
+                    email.set_content(message['body'])
+                    smtp.send_message(email)
+                    os.remove(path)
+                except Exception as e:
+                    cls._reschedule(path, message, e)
+        except Exception as e:
+            # Gagal di level koneksi (TLS/login): jadwalkan ulang yang belum terkirim
+            for path, message in batch:
+                if os.path.exists(path):
+                    cls._reschedule(path, message, e)
+        finally:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+
+    @classmethod
+    def _reschedule(cls, path, message, error):
+        """
+        Menjadwalkan ulang pesan gagal dengan exponential backoff + jitter,
+        atau memindahkannya ke failed/ setelah melebihi OUTBOX_MAX_ATTEMPTS
+        """
+        s = cls._settings
+        message['attempts'] = message.get('attempts', 0) + 1
+        message['last_error'] = str(error)
+        name = os.path.basename(path).split('-', 1)[1]
+
+        try:
+            if message['attempts'] >= s.get('max_attempts', 5):
+                logger.error("Outbox: pesan %s gagal permanen: %s", message['id'], error,
+                             extra={'message_id': message['id'], 'attempts': message['attempts']})
+                cls._write_message(os.path.join(cls._dir('failed'), name), message)
+            else:
+                delay = min(s.get('backoff_base', 30) * 2 ** (message['attempts'] - 1), s.get('backoff_max', 3600))
+                delay *= random.uniform(0.8, 1.2)
+                due_ms = int((time.time() + delay) * 1000)
+                cls._write_message(os.path.join(cls._dir('pending'), f"{due_ms:013d}-{name}"), message)
+            os.remove(path)
+        except OSError:
+            logger.exception("Error reschedule outbox %s", message.get('id'))
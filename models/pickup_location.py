@@ -1,11 +1,30 @@
+import hashlib
 import json
+import logging
 import os
+import signal
+from utils import codec
+import threading
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
 
 class PickupLocationManager:
     """Class untuk mengelola lokasi pengambilan"""
     
     LOCATION_FILE = 'data/pickup_locations.json'
     
+    # Registry read-only di memori: dimuat sekali saat create_app dan hanya
+    # diganti utuh saat reload, sehingga halaman checkout/konfirmasi tidak
+    # pernah menyentuh disk
+    _registry = None
+    _registry_json = b'{}'
+    _registry_etag = None
+    _registry_stamp = None
+    _reload_lock = threading.Lock()
+    _reload_requested = threading.Event()  # Diset handler SIGHUP, diproses thread watcher
+    _watcher = None
+    
     @staticmethod
     def _ensure_data_dir():
         """Pastikan direktori data ada"""
@@ -16,10 +35,11 @@ class PickupLocationManager:
         """
         Memuat data lokasi dari file JSON
         Returns: Dictionary lokasi
+        Raises: ValueError/OSError jika file rusak atau tidak bisa dibaca, agar
+                pemanggil tidak menimpa data lokasi dengan dictionary kosong
         """
-        PickupLocationManager._ensure_data_dir()
-        
         if not os.path.exists(PickupLocationManager.LOCATION_FILE):
+            PickupLocationManager._ensure_data_dir()
             # Jika file tidak ada, buat dengan data default
             default_locations = {
                 "loc_library": {
@@ -48,16 +68,15 @@ class PickupLocationManager:
                 }
             }
             
-            with open(PickupLocationManager.LOCATION_FILE, 'w', encoding='utf-8') as f:
-                json.dump(default_locations, f, ensure_ascii=False, indent=4)
+            with open(PickupLocationManager.LOCATION_FILE, 'wb') as f:
+                f.write(codec.dumps(default_locations, codec.store_format('locations')))
             
             return default_locations
         
-        try:
-            with open(PickupLocationManager.LOCATION_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+        locations = codec.load_file(PickupLocationManager.LOCATION_FILE)
+        if not isinstance(locations, dict) or not all(isinstance(loc, dict) for loc in locations.values()):
+            raise ValueError(f"{PickupLocationManager.LOCATION_FILE}: isi harus berupa dict lokasi")
+        return locations
     
     @staticmethod
     def _save_locations(locations):
@@ -69,13 +88,128 @@ class PickupLocationManager:
         """
         try:
             PickupLocationManager._ensure_data_dir()
-            with open(PickupLocationManager.LOCATION_FILE, 'w', encoding='utf-8') as f:
-                json.dump(locations, f, ensure_ascii=False, indent=4)
+            with open(PickupLocationManager.LOCATION_FILE, 'wb') as f:
+                f.write(codec.dumps(locations, codec.store_format('locations')))
+            # Perubahan langsung terlihat tanpa menunggu watcher
+            PickupLocationManager.reload_registry()
             return True
-        except Exception as e:
-            print(f"Error saving locations: {e}")
+        except Exception:
+            logger.exception("Error saving locations")
             return False
     
+    @staticmethod
+    def _file_stamp():
+        """Identitas versi file lokasi (mtime, size), None jika tidak ada"""
+        try:
+            st = os.stat(PickupLocationManager.LOCATION_FILE)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def reload_registry():
+        """
+        Memuat ulang file lokasi ke registry read-only (MappingProxyType)
+        Returns: Jumlah lokasi yang dimuat, None jika file gagal dibaca
+        Jika file rusak, registry terakhir yang valid tetap dipakai (registry
+        kosong hanya jika belum pernah ada yang valid) dan error dicatat sekali
+        per versi file.
+        """
+        with PickupLocationManager._reload_lock:
+            stamp = PickupLocationManager._file_stamp()
+            try:
+                locations = PickupLocationManager._load_locations()
+            except (ValueError, OSError):
+                logger.exception("File lokasi pickup tidak valid, registry lama tetap dipakai")
+                if PickupLocationManager._registry is None:
+                    PickupLocationManager._registry = MappingProxyType({})
+                PickupLocationManager._registry_stamp = stamp
+                return None
+            body = json.dumps(locations, ensure_ascii=False, sort_keys=True).encode('utf-8')
+            
+            # Ganti semua atribut registry setelah data baru siap
+            PickupLocationManager._registry = MappingProxyType({
+                location_id: MappingProxyType(dict(location))
+                for location_id, location in locations.items()
+            })
+            PickupLocationManager._registry_json = body
+            PickupLocationManager._registry_etag = hashlib.sha1(body).hexdigest()
+            PickupLocationManager._registry_stamp = stamp or PickupLocationManager._file_stamp()
+            return len(locations)
+    
+    @staticmethod
+    def reload_if_changed():
+        """
+        Reload registry jika file lokasi berubah sejak terakhir dimuat
+        Returns: Boolean apakah reload dilakukan
+        """
+        if PickupLocationManager._file_stamp() != PickupLocationManager._registry_stamp:
+            PickupLocationManager.reload_registry()
+            return True
+        return False
+    
+    @staticmethod
+    def _get_registry():
+        """Registry lokasi; dimuat saat pertama kali jika init_app belum dipanggil"""
+        if PickupLocationManager._registry is None:
+            PickupLocationManager.reload_registry()
+        return PickupLocationManager._registry
+    
+    @staticmethod
+    def get_registry_json():
+        """
+        Daftar lokasi dalam bentuk JSON yang sudah di-serialize saat reload
+        Returns: Tuple (body bytes, etag)
+        """
+        PickupLocationManager._get_registry()
+        return PickupLocationManager._registry_json, PickupLocationManager._registry_etag
+    
+    @staticmethod
+    def init_app(app):
+        """
+        Memuat registry lokasi sekali saat startup dan memasang handler SIGHUP.
+        Mekanisme reload yang didukung adalah thread pemantau file
+        (start_watcher, PICKUP_LOCATIONS_RELOAD_INTERVAL). SIGHUP hanya untuk
+        proses tunggal (python main.py): di gunicorn HUP diterima master dan
+        tidak pernah sampai ke worker.
+        Handler hanya menandai permintaan reload; reload sendiri dijalankan
+        thread watcher, karena handler sinyal bisa menyela thread yang sedang
+        memegang _reload_lock.
+        Args:
+            app: Instance Flask app
+        """
+        PickupLocationManager.reload_registry()
+        
+        # SIGHUP hanya bisa dipasang dari main thread (dan tidak ada di Windows)
+        if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGHUP, lambda signum, frame: PickupLocationManager._reload_requested.set())
+    
+    @staticmethod
+    def start_watcher(interval):
+        """
+        Menjalankan thread yang me-reload registry saat file lokasi berubah
+        atau setelah SIGHUP (idempotent)
+        Args:
+            interval: Interval cek file dalam detik (0 = hanya reload setelah SIGHUP)
+        """
+        watcher = PickupLocationManager._watcher
+        if not (watcher and watcher.is_alive()):
+            def watch():
+                requested = PickupLocationManager._reload_requested
+                while True:
+                    requested.wait(interval or None)
+                    try:
+                        if requested.is_set():
+                            requested.clear()
+                            PickupLocationManager.reload_registry()
+                        else:
+                            PickupLocationManager.reload_if_changed()
+                    except Exception:
+                        logger.exception("Error reloading locations")
+            
+            PickupLocationManager._watcher = threading.Thread(target=watch, name='pickup-location-watcher', daemon=True)
+            PickupLocationManager._watcher.start()
+    
     @staticmethod
     def get_all_locations():
         """
@@ -83,9 +217,9 @@ class PickupLocationManager:
         Returns: Dictionary semua lokasi
         """
         try:
-            return PickupLocationManager._load_locations()
-        except Exception as e:
-            print(f"Error getting all locations: {e}")
+            return PickupLocationManager._get_registry()
+        except Exception:
+            logger.exception("Error getting all locations")
             return {}
     
     @staticmethod
@@ -97,10 +231,9 @@ class PickupLocationManager:
         Returns: Dictionary lokasi atau None
         """
         try:
-            locations = PickupLocationManager._load_locations()
-            return locations.get(location_id)
-        except Exception as e:
-            print(f"Error getting location by ID: {e}")
+            return PickupLocationManager._get_registry().get(location_id)
+        except Exception:
+            logger.exception("Error getting location by ID")
             return None
     
     @staticmethod
@@ -110,10 +243,9 @@ class PickupLocationManager:
         Returns: List lokasi
         """
         try:
-            locations = PickupLocationManager._load_locations()
-            return list(locations.values())
-        except Exception as e:
-            print(f"Error getting locations list: {e}")
+            return list(PickupLocationManager._get_registry().values())
+        except Exception:
+            logger.exception("Error getting locations list")
             return []
     
     @staticmethod
@@ -131,7 +263,7 @@ class PickupLocationManager:
             required_fields = ['id', 'name', 'address', 'operating_hours', 'phone']
             for field in required_fields:
                 if field not in location_data:
-                    print(f"Missing required field: {field}")
+                    logger.warning("Missing required field: %s", field)
                     return False
             
             location_id = location_data['id']
@@ -139,8 +271,8 @@ class PickupLocationManager:
             
             return PickupLocationManager._save_locations(locations)
             
-        except Exception as e:
-            print(f"Error adding location: {e}")
+        except Exception:
+            logger.exception("Error adding location")
             return False
     
     @staticmethod
@@ -162,8 +294,8 @@ class PickupLocationManager:
             
             return PickupLocationManager._save_locations(locations)
             
-        except Exception as e:
-            print(f"Error updating location: {e}")
+        except Exception:
+            logger.exception("Error updating location")
             return False
     
     @staticmethod
@@ -183,8 +315,8 @@ class PickupLocationManager:
             
             return False
             
-        except Exception as e:
-            print(f"Error deleting location: {e}")
+        except Exception:
+            logger.exception("Error deleting location")
             return False
     
     @staticmethod
@@ -196,10 +328,9 @@ class PickupLocationManager:
         Returns: Boolean tersedia/tidak
         """
         try:
-            locations = PickupLocationManager._load_locations()
-            return location_id in locations
-        except Exception as e:
-            print(f"Error checking location availability: {e}")
+            return location_id in PickupLocationManager._get_registry()
+        except Exception:
+            logger.exception("Error checking location availability")
             return False
     
     @staticmethod
@@ -213,6 +344,6 @@ class PickupLocationManager:
         try:
             location = PickupLocationManager.get_location_by_id(location_id)
             return location.get('name', 'Unknown Location') if location else 'Unknown Location'
-        except Exception as e:
-            print(f"Error getting location name: {e}")
+        except Exception:
+            logger.exception("Error getting location name")
             return 'Unknown Location'
\ No newline at end of file
@@ -1,62 +1,489 @@
 # Import library untuk file operations, JSON handling, dan thread safety
-import os, json
-from threading import Lock
+import logging, os, threading, time, zlib
+from contextlib import contextmanager
+from threading import Lock, Condition
+from utils import codec
+from models.catalog_index import CatalogIndex
+from models.catalog_shards import CatalogShards
+from models.catalog_snapshot import CatalogSnapshot
+from models.records import Product
+from models.redis_stock import RedisStock
+from models.stock_ledger import StockLedger
+from utils.admission import AdmissionController
+from utils.redis_store import RedisStore
+from utils.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
 
 # Path ke file JSON yang menyimpan data produk
 _PRODUCTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'products.json')
+# Snapshot biner read-only (mmap) yang dipublish setelah setiap save
+_SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'products.snap')
+# Direktori shard katalog per penjual (CATALOG_SHARDED, lihat models/catalog_shards.py)
+_SHARDS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'catalog')
+# Ledger append-only untuk perubahan stok (lihat models/stock_ledger.py)
+_LEDGER_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'stock_ledger.jsonl')
 # Lock untuk mencegah race condition saat concurrent write operations
 _SAVE_LOCK = Lock()
 
+# Lock striping: setiap produk dipetakan ke salah satu lock berdasarkan hash ID-nya,
+# sehingga mutasi stok pada produk berbeda tidak saling menunggu
+_STRIPE_COUNT = 16
+_STRIPE_LOCKS = [Lock() for _ in range(_STRIPE_COUNT)]
+
+# Cache katalog di memori = checkpoint (products.json) + record ledger sesudahnya.
+# 'data' berisi {product_id: Product} (record slots, lihat models/records.py).
+# 'overlay' berisi stok terbaru dari ledger untuk produk yang berubah sejak
+# checkpoint, dipakai juga untuk melengkapi pembacaan dari snapshot mmap.
+# 'index' adalah CatalogIndex (harga/nama/in-stock) untuk query_products.
+# 'dirty' berisi ID produk yang stoknya berubah sejak checkpoint (shard yang
+# perlu ditulis ulang saat checkpoint).
+_CACHE_LOCK = Lock()
+_CACHE = {'data': None, 'stamp': False, 'overlay': {}, 'ledger_pos': 0, 'index': None, 'dirty': set()}
+
+# Checkpoint periodik ledger -> products.json
+_CHECKPOINT_EVENT = threading.Event()
+_CHECKPOINT_STATE = {'thread': None, 'pending': 0, 'max_records': 500}
+
+# Reader snapshot yang sedang dipakai proses ini
+_SNAPSHOT_LOCK = Lock()
+_SNAPSHOT = {'reader': None, 'stamp': None}
+
+# Group commit: satu penulisan file bisa mencakup perubahan dari banyak thread
+_WRITE_COND = Condition()
+_WRITE_STATE = {'version': 0, 'written': 0}
+
 class ProductsManager:
     """Class untuk mengelola data produk dengan operasi CRUD dan stock management"""
+    SNAPSHOT_ENABLED = True  # Baca produk dari snapshot mmap jika tersedia dan segar
+    STOCK_STORE = None  # RedisStock jika STORE_BACKEND = 'redis' (stok dibagi antar host)
+    SHARDS = None  # CatalogShards jika CATALOG_SHARDED (satu file per penjual)
+
+    @classmethod
+    def init_app(cls, app):
+        """Membaca konfigurasi snapshot/ledger dan mempublish snapshot awal jika
+        belum segar. Thread checkpoint dijalankan lewat start_checkpointer()."""
+        cls.SNAPSHOT_ENABLED = app.config.get('CATALOG_SNAPSHOT_ENABLED', True)
+        StockLedger.FSYNC = app.config.get('STOCK_LEDGER_FSYNC', True)
+        _CHECKPOINT_STATE['max_records'] = app.config.get('STOCK_CHECKPOINT_MAX_RECORDS', 500)
+
+        shards = CatalogShards(os.path.abspath(_SHARDS_DIR))
+        if app.config.get('CATALOG_SHARDED', False):
+            # Sekali saja: products.json -> shard per penjual (offset checkpoint ledger tetap berlaku)
+            shards.migrate(os.path.abspath(_PRODUCTS_FILE))
+        elif shards.exists():
+            # products.json tidak diperbarui lagi sejak migrasi; memakainya diam-diam
+            # berarti kembali ke katalog/stok lama
+            raise RuntimeError(
+                f"Katalog sudah dipartisi di {shards.directory} tetapi CATALOG_SHARDED mati: "
+                "products.json sudah usang. Aktifkan CATALOG_SHARDED, atau gabungkan shard "
+                "ke products.json lalu hapus direktori tersebut.")
+        else:
+            shards = None
+        if shards is not None or cls.SHARDS is not None:
+            cls.SHARDS = shards
+            cls._invalidate_cache()
+
+        if cls.SNAPSHOT_ENABLED and cls.SHARDS is None and cls._snapshot() is None:
+            stamp = cls._source_stamp()
+            if stamp is not None:
+                cls._publish_snapshot(cls._load(), stamp)
+
+        cls.STOCK_STORE = None
+        client = RedisStore.client()
+        if client is not None:
+            cls.STOCK_STORE = RedisStock(client, RedisStore.PREFIX,
+                                         app.config.get('REDIS_STOCK_LEDGER_MAXLEN', 100000))
+            # Host pertama mengisi stok awal dari products.json; host berikutnya memakai yang sudah ada
+            cls.STOCK_STORE.seed({pid: CatalogIndex.stock_of(p) for pid, p in cls._load().items()})
+
+    @classmethod
+    def start_checkpointer(cls, interval):
+        """Menjalankan thread checkpoint ledger stok periodik (idempotent)
+        Args: interval - Detik antar checkpoint (0 = nonaktif)
+        """
+        thread = _CHECKPOINT_STATE['thread']
+        if interval and not (thread and thread.is_alive()):
+            def run():
+                while True:
+                    _CHECKPOINT_EVENT.wait(interval)
+                    _CHECKPOINT_EVENT.clear()
+                    try:
+                        cls.checkpoint()
+                    except Exception:
+                        logger.exception("Gagal checkpoint stok")
+
+            _CHECKPOINT_STATE['thread'] = threading.Thread(target=run, name='stock-checkpoint', daemon=True)
+            _CHECKPOINT_STATE['thread'].start()
+
+    @staticmethod
+    def _stamp(path):
+        """Identitas versi file (mtime, size), None jika file tidak ada"""
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _source_stamp():
+        """Stamp sumber katalog: products.json, atau gabungan semua shard jika CATALOG_SHARDED"""
+        if ProductsManager.SHARDS is not None:
+            return ProductsManager.SHARDS.stamp()
+        return ProductsManager._stamp(os.path.abspath(_PRODUCTS_FILE))
+
+    @staticmethod
+    def _invalidate_cache():
+        """Paksa cache dimuat ulang dari disk pada akses berikutnya"""
+        with _CACHE_LOCK:
+            _CACHE.update(data=None, stamp=False, overlay={}, ledger_pos=0, index=None, dirty=set())
+
+    @staticmethod
+    def _refresh():
+        """Sinkronkan cache dengan products.json dan record ledger baru
+        (termasuk yang ditulis proses lain). Hanya membaca bagian ledger yang
+        bertambah sejak sinkronisasi terakhir.
+        """
+        ledger = os.path.abspath(_LEDGER_FILE)
+        with _CACHE_LOCK:
+            # stat di dalam lock: ukuran yang dibaca sebelum thread lain memajukan
+            # ledger_pos akan terlihat seperti ledger terpotong dan memicu replay penuh
+            stamp = ProductsManager._source_stamp()
+            ledger_size = StockLedger.size(ledger)
+            if _CACHE['stamp'] != stamp or ledger_size < _CACHE['ledger_pos']:
+                # products.json berubah: mulai ulang dari offset checkpoint
+                # (replay ledger idempotent, jadi offset lama tetap aman)
+                _CACHE.update(data=None, stamp=stamp, overlay={}, index=None, dirty=set(),
+                              ledger_pos=min(StockLedger.read_checkpoint(ledger), ledger_size))
+            if ledger_size > _CACHE['ledger_pos']:
+                records, _CACHE['ledger_pos'] = StockLedger.read_from(ledger, _CACHE['ledger_pos'])
+                data = _CACHE['data']
+                index = _CACHE['index']
+                for rec in records:
+                    product_id = rec.get('product_id')
+                    _CACHE['overlay'][product_id] = rec.get('stock', 0)
+                    _CACHE['dirty'].add(product_id)
+                    if data is not None and product_id in data:
+                        data[product_id].stock = rec.get('stock', 0)
+                        if index is not None:
+                            # Semua perubahan stok (set/change, juga dari proses lain) lewat sini
+                            index.set_stock(product_id, rec.get('stock', 0))
+
     @staticmethod
     def _load():
-        """Memuat data produk dari file JSON
-        Returns: Dictionary berisi semua data produk atau {} jika file tidak ada/error
+        """Memuat data produk dari cache atau file JSON (jika file berubah)
+        Returns: Dictionary {product_id: Product} atau {} jika file tidak ada/error
+        Catatan: dictionary yang dikembalikan adalah cache bersama, jangan diubah
+        di luar stripe lock produk yang bersangkutan
         """
-        try:
-            path = os.path.abspath(_PRODUCTS_FILE)
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception:
-            # Jika terjadi error, return empty dict sebagai fallback
-            pass
-        return {}
+        ProductsManager._refresh()
+        path = os.path.abspath(_PRODUCTS_FILE)
+        shards = ProductsManager.SHARDS
+        with _CACHE_LOCK:
+            if _CACHE['data'] is not None:
+                return _CACHE['data']
+            data = {}
+            try:
+                if _CACHE['stamp'] is not None:
+                    raw = shards.load() if shards is not None else codec.load_file(path)
+                    data = {pid: Product.from_dict(p) for pid, p in raw.items() if isinstance(p, dict)}
+            except Exception:
+                # Jika terjadi error, return empty dict sebagai fallback
+                data = {}
+            # Terapkan stok terbaru dari ledger di atas checkpoint
+            for product_id, stock in _CACHE['overlay'].items():
+                if product_id in data:
+                    data[product_id].stock = stock
+            _CACHE['data'] = data
+            return data
 
     @staticmethod
-    def _save(data):
+    def _plain(data):
+        """Cache {product_id: Product} -> dictionary biasa untuk ditulis ke file"""
+        return {pid: p.to_dict() if isinstance(p, Product) else p for pid, p in data.items()}
+
+    @staticmethod
+    def _save(data, product_ids=None):
         """Menyimpan data produk ke file JSON dengan atomic operation
-        Args: data - Dictionary berisi semua data produk
+        Args: data - Dictionary berisi semua data produk (cache _load),
+              product_ids - ID produk yang berubah (None = semua); dengan
+              CATALOG_SHARDED hanya shard milik produk tersebut yang ditulis
+        Jika beberapa thread menyimpan bersamaan, satu penulisan (fsync) sudah
+        mencakup perubahan thread lain yang menunggu (group commit).
         """
+        with _WRITE_COND:
+            _WRITE_STATE['version'] += 1
+            my_version = _WRITE_STATE['version']
+
         path = os.path.abspath(_PRODUCTS_FILE)
         dirpath = os.path.dirname(path)
         # Buat direktori jika belum ada
         os.makedirs(dirpath, exist_ok=True)
         tmp = path + '.tmp'  # File temporary untuk atomic write
-        with _SAVE_LOCK:  # Gunakan lock untuk thread safety
-            with open(tmp, 'w', encoding='utf-8') as f:
-                # Simpan dengan format JSON yang readable (indent=2)
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        shards = ProductsManager.SHARDS
+        with AdmissionController.storage_lock(_SAVE_LOCK):  # Lock thread safety (waktu tunggu dipantau)
+            if _WRITE_STATE['written'] >= my_version and shards is None:
+                return  # Perubahan ini sudah ikut ditulis oleh thread lain
+            with _WRITE_COND:
+                target = _WRITE_STATE['version']
+            if shards is not None:
+                # Shard lain bisa saja ditulis thread lain, jadi tidak ada group commit di sini.
+                # Hanya produk di shard yang ditulis yang dikonversi ke dict; snapshot
+                # global tidak dipakai dengan CATALOG_SHARDED (lihat _snapshot)
+                shards.save(data, product_ids)
+                with _CACHE_LOCK:
+                    stamp = shards.stamp()
+                    if _CACHE['data'] is data:
+                        _CACHE['stamp'] = stamp
+                _WRITE_STATE['written'] = target
+                return
+            plain = ProductsManager._plain(data)
+            with open(tmp, 'wb') as f:
+                # Format sesuai DATA_FORMATS['products'] (json/compact/msgpack)
+                f.write(codec.dumps(plain, codec.store_format('products')))
                 f.flush()  # Flush buffer ke OS
                 os.fsync(f.fileno())  # Force write ke disk
-            # Atomic replace: file asli tidak akan corrupt jika gagal
-            os.replace(tmp, path)
+            with _CACHE_LOCK:
+                # Atomic replace: file asli tidak akan corrupt jika gagal
+                os.replace(tmp, path)
+                # Tandai cache tetap valid agar tidak membaca ulang file yang baru ditulis
+                stamp = ProductsManager._stamp(path)
+                if _CACHE['data'] is data:
+                    _CACHE['stamp'] = stamp
+            _WRITE_STATE['written'] = target
+            ProductsManager._publish_snapshot(plain, stamp)
+
+    @staticmethod
+    def _publish_snapshot(data, source_stamp):
+        """Tulis snapshot biner katalog untuk reader mmap (gagal = hanya dicatat)"""
+        if not ProductsManager.SNAPSHOT_ENABLED or ProductsManager.SHARDS is not None:
+            return
+        try:
+            CatalogSnapshot.write(ProductsManager._plain(data), os.path.abspath(_SNAPSHOT_FILE), source_stamp)
+        except Exception:
+            logger.exception("Gagal menulis snapshot katalog")
+
+    @staticmethod
+    def _snapshot():
+        """Reader snapshot jika snapshot sesuai dengan products.json saat ini, selain itu None
+        Dengan CATALOG_SHARDED snapshot tidak dipakai: satu file global harus ditulis
+        ulang utuh setiap shard berubah, sehingga menghapus manfaat partisi.
+        """
+        if not ProductsManager.SNAPSHOT_ENABLED or ProductsManager.SHARDS is not None:
+            return None
+        snap_path = os.path.abspath(_SNAPSHOT_FILE)
+        snap_stamp = ProductsManager._stamp(snap_path)
+        if snap_stamp is None:
+            return None
+        reader = _SNAPSHOT['reader']
+        if reader is None or _SNAPSHOT['stamp'] != snap_stamp:
+            with _SNAPSHOT_LOCK:
+                try:
+                    # Reader lama tidak ditutup manual: thread lain mungkin masih memakainya
+                    reader = CatalogSnapshot(snap_path)
+                except (OSError, ValueError):
+                    return None
+                _SNAPSHOT['reader'] = reader
+                _SNAPSHOT['stamp'] = snap_stamp
+        if reader.source_stamp != ProductsManager._source_stamp():
+            return None  # Snapshot basi, pakai cache JSON
+        return reader
+
+    @staticmethod
+    def _stripe(product_id):
+        """Index stripe lock untuk sebuah product_id (stabil antar proses)"""
+        return zlib.crc32(str(product_id).encode('utf-8')) % _STRIPE_COUNT
+
+    @classmethod
+    def _stripes(cls, product_ids):
+        """Index stripe (ascending, unik) untuk beberapa produk"""
+        return sorted({cls._stripe(pid) for pid in product_ids})
+
+    @classmethod
+    @contextmanager
+    def lock_products(cls, product_ids):
+        """Context manager untuk mengunci satu atau beberapa produk sekaligus
+        Args: product_ids - Iterable ID produk
+        Lock diambil dalam urutan index stripe yang selalu sama (ascending),
+        sehingga batch multi-produk tidak bisa saling deadlock.
+        """
+        stripes = cls._stripes(product_ids)
+        start = time.perf_counter()
+        for i in stripes:
+            _STRIPE_LOCKS[i].acquire()
+        AdmissionController.record_wait(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            for i in reversed(stripes):
+                _STRIPE_LOCKS[i].release()
+
+    @classmethod
+    @contextmanager
+    def _lock_all(cls):
+        """Mengunci semua stripe (untuk perubahan struktur katalog seperti add_product)"""
+        for lock in _STRIPE_LOCKS:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(_STRIPE_LOCKS):
+                lock.release()
 
     @classmethod
     def get_all(cls):
         """Mengambil semua data produk
         Returns: Dictionary dengan structure {product_id: product_data}
         """
-        return cls._load()
+        cls._refresh()
+        snapshot = cls._snapshot()
+        if snapshot:
+            products = snapshot.get_all()
+            for product_id, stock in _CACHE['overlay'].items():
+                if product_id in products:
+                    products[product_id]['stock'] = stock
+        else:
+            products = {pid: p.to_dict() for pid, p in cls._load().items()}
+        if cls.STOCK_STORE is not None:
+            for product_id, stock in cls.STOCK_STORE.all().items():
+                if product_id in products:
+                    products[product_id]['stock'] = stock
+        return products
 
     @classmethod
     def get(cls, product_id):
         """Mengambil data produk berdasarkan ID
         Args: product_id - ID unik produk
         Returns: Dictionary data produk atau None jika tidak ditemukan
+        Di dalam request produk yang sama hanya dimuat sekali (identity map
+        unit of work); stok di dalamnya ikut diperbarui oleh change_stock.
         """
-        return cls._load().get(product_id)
+        uow = UnitOfWork.current()
+        if uow is None:
+            return cls._get(product_id)
+        p = uow.get('products', product_id)
+        if p is None:
+            p = cls._get(product_id)
+            if p is not None:
+                p = uow.add('products', product_id, p)
+        return p
+
+    @classmethod
+    def _get(cls, product_id):
+        """Membaca satu produk dari snapshot/cache (salinan baru setiap panggilan)"""
+        cls._refresh()
+        snapshot = cls._snapshot()
+        if snapshot:
+            p = snapshot.get(product_id)
+            if p and product_id in _CACHE['overlay']:
+                p['stock'] = _CACHE['overlay'][product_id]
+        else:
+            p = cls._load().get(product_id)
+            p = p.to_dict() if p else None
+        if p and cls.STOCK_STORE is not None:
+            stock = cls.STOCK_STORE.get(product_id)
+            if stock is not None:
+                p['stock'] = stock
+        return p
+
+    @classmethod
+    def _index(cls):
+        """CatalogIndex untuk cache saat ini (dibangun ulang jika cache dimuat ulang)"""
+        data = cls._load()
+        with _CACHE_LOCK:
+            index = _CACHE['index']
+            if index is None or index.source is not data:
+                index = CatalogIndex(data)
+                if _CACHE['data'] is data:
+                    _CACHE['index'] = index
+            return index, data
+
+    @classmethod
+    def query_products(cls, min_price=None, max_price=None, in_stock=False, sort='price',
+                       descending=False, offset=0, limit=None, fields=None):
+        """Query katalog dengan index harga (bisect) dan set in-stock
+        Args: min_price/max_price - Rentang harga inklusif, in_stock - Hanya stok > 0,
+              sort - 'price' atau 'name', descending - Urutan menurun,
+              offset/limit - Paging, fields - List field yang dikembalikan (None = semua)
+        Returns: Tuple (total hasil, list dictionary produk untuk halaman ini)
+        """
+        index, data = cls._index()
+        remote = cls.STOCK_STORE is not None
+        with _CACHE_LOCK:
+            # Dengan stok di Redis, set in_stock lokal bisa ketinggalan perubahan host lain
+            ids = index.query(min_price, max_price, in_stock and not remote, sort, descending)
+        stocks = {}
+        if remote:
+            if in_stock:
+                stocks = cls.STOCK_STORE.all()
+                ids = [pid for pid in ids if stocks.get(pid, 0) > 0]
+        page = ids[offset:offset + limit] if limit is not None else ids[offset:]
+        if remote and not in_stock:
+            stocks = cls.STOCK_STORE.get_many(page)
+        products = []
+        for product_id in page:
+            p = data.get(product_id)
+            if p is None:
+                continue
+            p = p.to_dict()
+            if product_id in stocks:
+                p['stock'] = stocks[product_id]
+            if fields:
+                products.append({f: (product_id if f == 'id' else p.get(f)) for f in fields})
+            else:
+                products.append(p)
+        return len(ids), products
+
+    @classmethod
+    def get_by_seller(cls, phone):
+        """Mengambil produk milik satu penjual
+        Args: phone - Nomor telepon penjual (hanya digit yang dibandingkan)
+        Returns: Dictionary {product_id: product_data}
+        Dengan CATALOG_SHARDED hanya file shard penjual itu yang dibaca (tanpa
+        memuat shard lain), lalu stok terbaru dari ledger diterapkan.
+        """
+        shard = CatalogShards.shard_name(phone)
+        products = cls._read_shard(shard) if cls.SHARDS is not None else None
+        if products is None:
+            data = cls._load()
+            products = {pid: p.to_dict() for pid, p in data.items()
+                        if CatalogShards.shard_name(p.get('phone')) == shard}
+        if cls.STOCK_STORE is not None:
+            for product_id, stock in cls.STOCK_STORE.get_many(products).items():
+                products[product_id]['stock'] = stock
+        return products
+
+    @classmethod
+    def _read_shard(cls, shard):
+        """Isi satu file shard + overlay stok ledger
+        Returns: Dictionary {product_id: product_data}, atau None jika katalog
+        terus berubah (checkpoint) selama dibaca
+        """
+        path = cls.SHARDS.path(shard)
+        for _ in range(3):
+            stamp = cls._source_stamp()
+            try:
+                raw = codec.load_file(path) if os.path.exists(path) else {}
+            except ValueError:
+                raw = {}
+            # Refresh setelah membaca shard: overlay ledger mulai dari offset checkpoint
+            # yang sama dengan isi shard (jika stamp tidak berubah di antaranya)
+            cls._refresh()
+            with _CACHE_LOCK:
+                if _CACHE['stamp'] != stamp:
+                    continue  # Checkpoint di tengah pembacaan: baca ulang
+                overlay = _CACHE['overlay']
+                index = cls.SHARDS.index
+                products = {}
+                for product_id, p in raw.items():
+                    if not isinstance(p, dict) or index.get(product_id, shard) != shard:
+                        continue  # Duplikat sisa crash: index menentukan shard yang berlaku
+                    p = Product.from_dict(p).to_dict()
+                    if product_id in overlay:
+                        p['stock'] = overlay[product_id]
+                    products[product_id] = p
+            return products
+        return None
 
     @classmethod
     def get_stock(cls, product_id):
@@ -68,35 +495,135 @@ class ProductsManager:
         return p.get('stock', 0) if p else 0
 
     @classmethod
-    def set_stock(cls, product_id, value):
+    def _append_stock(cls, ledger, records):
+        """Tulis record ke ledger lalu sinkronkan cache (dipanggil di dalam StockLedger.locked)"""
+        StockLedger.append(ledger, records)
+        cls._refresh()
+        cls._stock_changed({record['product_id']: record['stock'] for record in records})
+        if logger.isEnabledFor(logging.DEBUG):
+            # Event bervolume tinggi: di-sampling oleh LOG_DEBUG_SAMPLE_RATE
+            for record in records:
+                logger.debug("Stok %s berubah %+d -> %d (%s)", record['product_id'], record['delta'],
+                             record['stock'], record['reason'], extra={'product_id': record['product_id']})
+        _CHECKPOINT_STATE['pending'] += len(records)
+        if _CHECKPOINT_STATE['pending'] >= _CHECKPOINT_STATE['max_records']:
+            _CHECKPOINT_EVENT.set()  # Bangunkan thread checkpoint lebih awal
+
+    @staticmethod
+    def _stock_changed(stocks):
+        """Terapkan stok baru {product_id: stok} ke produk yang sudah dimuat di request ini"""
+        uow = UnitOfWork.current()
+        if uow is not None:
+            for product_id, stock in stocks.items():
+                uow.update('products', product_id, stock=stock)
+
+    @classmethod
+    def set_stock(cls, product_id, value, reason='set'):
         """Mengatur stok produk ke nilai absolut tertentu
-        Args: product_id - ID produk, value - Jumlah stok baru
+        Args: product_id - ID produk, value - Jumlah stok baru, reason - Alasan (audit)
         Returns: True jika berhasil, False jika produk tidak ditemukan
         """
-        data = cls._load()
-        if product_id in data:
-            data[product_id]['stock'] = int(value)
-            cls._save(data)
+        if cls.STOCK_STORE is not None:
+            if not cls.STOCK_STORE.set(product_id, value, reason):
+                return False
+            cls._stock_changed({product_id: int(value)})
+            return True
+        ledger = os.path.abspath(_LEDGER_FILE)
+        with cls.lock_products([product_id]), StockLedger.locked(ledger, cls._stripes([product_id])):
+            data = cls._load()
+            p = data.get(product_id)
+            if not p:
+                return False
+            old = int(p.get('stock', 0))
+            cls._append_stock(ledger, [StockLedger.record(product_id, int(value) - old, value, reason)])
             return True
-        return False
 
     @classmethod
-    def change_stock(cls, product_id, delta):
+    def change_stock(cls, product_id, delta, reason='change'):
         """Mengubah stok produk secara relatif (tambah/kurang)
-        Args: product_id - ID produk, delta - Perubahan stok (+/-)
+        Args: product_id - ID produk, delta - Perubahan stok (+/-), reason - Alasan (audit)
         Returns: True jika berhasil, False jika gagal/stok akan negatif
         Use cases: delta=-1 (kurang stok saat add to cart), delta=+1 (restore stok saat remove from cart)
+        Perubahan hanya di-append ke ledger (O(1)); products.json ditulis saat checkpoint.
         """
-        data = cls._load()
-        p = data.get(product_id)
-        if not p:
-            return False  # Produk tidak ditemukan
-        new = int(p.get('stock', 0)) + int(delta)
-        if new < 0:
-            return False  # BUSINESS RULE: Cegah stok negatif (overselling)
-        p['stock'] = new
-        cls._save(data)
-        return True
+        if cls.STOCK_STORE is not None:
+            return cls.change_stock_many({product_id: delta}, reason)
+        ledger = os.path.abspath(_LEDGER_FILE)
+        with cls.lock_products([product_id]), StockLedger.locked(ledger, cls._stripes([product_id])):
+            data = cls._load()
+            p = data.get(product_id)
+            if not p:
+                return False  # Produk tidak ditemukan
+            new = int(p.get('stock', 0)) + int(delta)
+            if new < 0:
+                return False  # BUSINESS RULE: Cegah stok negatif (overselling)
+            cls._append_stock(ledger, [StockLedger.record(product_id, delta, new, reason)])
+            return True
+
+    @classmethod
+    def change_stock_many(cls, deltas, reason='change'):
+        """Mengubah stok beberapa produk sekaligus secara all-or-nothing
+        Args: deltas - Dictionary {product_id: delta}, reason - Alasan (audit)
+        Returns: True jika semua berhasil, False jika ada produk yang tidak ada/stok akan negatif
+        """
+        if cls.STOCK_STORE is not None:
+            # Cek dan ubah stok atomic di server Redis (script Lua), tanpa lock lokal
+            stocks = cls.STOCK_STORE.change_many(deltas, reason)
+            if stocks is None:
+                return False
+            cls._stock_changed(stocks)
+            return True
+        ledger = os.path.abspath(_LEDGER_FILE)
+        with cls.lock_products(deltas.keys()), StockLedger.locked(ledger, cls._stripes(deltas.keys())):
+            data = cls._load()
+            records = []
+            for product_id, delta in deltas.items():
+                p = data.get(product_id)
+                if not p:
+                    return False
+                new = int(p.get('stock', 0)) + int(delta)
+                if new < 0:
+                    return False
+                records.append(StockLedger.record(product_id, delta, new, reason))
+            cls._append_stock(ledger, records)
+            return True
+
+    @classmethod
+    def checkpoint(cls):
+        """Menulis stok terkini (checkpoint + ledger) kembali ke products.json
+        Returns: True jika ada record baru yang di-checkpoint
+        Dengan stok di Redis, stok terkini disalin ke products.json lokal sebagai
+        cadangan (dipakai sebagai stok awal jika data Redis hilang).
+        """
+        if cls.STOCK_STORE is not None:
+            stocks = cls.STOCK_STORE.all()
+            with cls._lock_all():
+                data = cls._load()
+                changed = []
+                for product_id, stock in stocks.items():
+                    p = data.get(product_id)
+                    if p is not None and p.stock != stock:
+                        p.stock = stock
+                        changed.append(product_id)
+                if changed:
+                    cls._save(data, changed)
+                return bool(changed)
+        ledger = os.path.abspath(_LEDGER_FILE)
+        with cls._lock_all(), StockLedger.locked(ledger, range(_STRIPE_COUNT)):
+            data = cls._load()
+            offset = _CACHE['ledger_pos']
+            if offset <= StockLedger.read_checkpoint(ledger):
+                return False
+            with _CACHE_LOCK:
+                dirty = set(_CACHE['dirty'])
+            cls._save(data, dirty)
+            with _CACHE_LOCK:
+                _CACHE['dirty'] -= dirty
+            # Offset ditulis SETELAH products.json: jika crash di antaranya,
+            # replay dari offset lama tetap menghasilkan stok yang sama
+            StockLedger.write_checkpoint(ledger, offset)
+            _CHECKPOINT_STATE['pending'] = 0
+            return True
 
     @classmethod
     def add_product(cls, product_data):
@@ -104,13 +631,20 @@ class ProductsManager:
         Args: product_data - Dictionary berisi data produk lengkap dengan 'id'
         Returns: True jika berhasil ditambahkan, False jika ID sudah ada/invalid
         """
-        data = cls._load()
-        product_id = product_data.get('id')
-        if product_id and product_id not in data:  # Validasi ID ada dan unique
-            data[product_id] = product_data
-            cls._save(data)
-            return True
-        return False  # ID tidak ada atau sudah digunakan
+        with cls._lock_all(), StockLedger.locked(os.path.abspath(_LEDGER_FILE), range(_STRIPE_COUNT)):
+            data = cls._load()
+            product_id = product_data.get('id')
+            if product_id and product_id not in data:  # Validasi ID ada dan unique
+                product = data[product_id] = Product.from_dict(product_data)
+                with _CACHE_LOCK:
+                    index = _CACHE['index']
+                    if index is not None and index.source is data:
+                        index.add(product_id, product)
+                cls._save(data, [product_id])
+                if cls.STOCK_STORE is not None:
+                    cls.STOCK_STORE.seed({product_id: CatalogIndex.stock_of(product_data)})
+                return True
+            return False  # ID tidak ada atau sudah digunakan
 
     @classmethod
     def generate_product_id(cls):
@@ -119,9 +653,9 @@ class ProductsManager:
         Logic: Cari counter terkecil yang belum dipakai
         """
         data = cls._load()
-        existing_ids = list(data.keys())
+        existing_ids = set(data.keys())
         counter = 1
         # Loop sampai menemukan ID yang belum dipakai
         while f"p_produk_{counter}" in existing_ids:
             counter += 1
-        return f"p_produk_{counter}"
\ No newline at end of file
+        return f"p_produk_{counter}"
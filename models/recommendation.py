@@ -0,0 +1,222 @@
+import heapq
+import itertools
+import logging
+import os
+import threading
+from utils import codec
+from utils.json_stream import JsonArrayReader
+
+logger = logging.getLogger(__name__)
+
+class RecommendationManager:
+    """
+    Rekomendasi "sering dibeli bersamaan" dari riwayat pesanan.
+
+    Matriks co-occurrence disimpan sparse: {product_id: {product_lain: jumlah
+    pesanan yang memuat keduanya}} - hanya pasangan yang pernah dibeli
+    bersama yang punya entry. Top-k tetangga setiap produk dihitung di muka,
+    sehingga halaman detail produk cukup melakukan satu lookup dictionary.
+
+    - rebuild(): hitung ulang penuh dari data/orders.json (thread background,
+      juga menangani pesanan yang dihapus/ditulis proses lain)
+    - add_order(): update inkremental saat pesanan baru dibuat, hanya
+      baris dan top-k produk di pesanan tersebut yang diganti
+    Hasil disimpan ke data/recommendations.json agar worker yang baru start
+    langsung punya rekomendasi tanpa menunggu rebuild.
+    """
+
+    REC_FILE = 'data/recommendations.json'
+    TOP_K = 4
+
+    _lock = threading.Lock()
+    _counts = {}  # {product_id: {product_lain: jumlah}}
+    _top = {}  # {product_id: (product_lain, ...)} terurut dari yang paling sering
+    _rebuild_lock = threading.Lock()  # Satu rebuild dalam satu waktu
+    _pending = None  # Saat rebuild: [set product_id] pesanan baru yang belum ada di file yang dibaca
+    _thread = None
+    _wake = threading.Event()
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membaca konfigurasi dan memuat hasil rekomendasi terakhir dari file
+        Args:
+            app: Instance Flask app
+        """
+        cls.TOP_K = app.config.get('RECOMMENDATIONS_TOP_K', 4)
+        try:
+            saved = codec.load_file(cls.REC_FILE)
+            counts = {pid: dict(neighbours) for pid, neighbours in saved.get('counts', {}).items()}
+        except (OSError, ValueError, AttributeError):
+            return
+        with cls._lock:
+            cls._counts = counts
+            cls._top = {pid: cls._top_k(neighbours) for pid, neighbours in counts.items()}
+
+    @classmethod
+    def start_builder(cls, interval):
+        """
+        Menjalankan thread yang membangun ulang matriks saat start lalu setiap
+        interval detik (idempotent)
+        Args:
+            interval: Detik antar rebuild penuh (0 = hanya sekali saat start)
+        """
+        if cls._thread and cls._thread.is_alive():
+            return
+
+        def run():
+            while True:
+                try:
+                    cls.rebuild()
+                except Exception:
+                    logger.exception("Gagal membangun rekomendasi")
+                if not interval:
+                    return
+                cls._wake.wait(interval)
+                cls._wake.clear()
+
+        cls._thread = threading.Thread(target=run, name='recommendation-builder', daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def _top_k(cls, neighbours):
+        """Top-k tetangga dari dictionary {product_id: jumlah} (seri diurutkan berdasarkan ID)"""
+        best = heapq.nsmallest(cls.TOP_K, neighbours.items(), key=lambda kv: (-kv[1], kv[0]))
+        return tuple(pid for pid, _ in best)
+
+    @staticmethod
+    def _name_map():
+        """Peta nama produk -> ID, untuk item pesanan lama yang belum menyimpan product_id"""
+        from models.products import ProductsManager
+        names = {}
+        for product_id, product in ProductsManager.get_all().items():
+            names.setdefault(product.get('name'), product_id)
+        return names
+
+    @staticmethod
+    def _order_products(order, names):
+        """Set ID produk dalam satu pesanan"""
+        product_ids = set()
+        for item in order.get('items') or []:
+            if not isinstance(item, dict):
+                continue
+            product_id = item.get('product_id') or names.get(item.get('name'))
+            if product_id:
+                product_ids.add(product_id)
+        return product_ids
+
+    @staticmethod
+    def _count_pairs(counts, product_ids):
+        """Tambahkan semua pasangan produk dalam satu pesanan ke matriks"""
+        if len(product_ids) < 2:
+            return  # Pesanan satu produk tidak membentuk pasangan
+        for a in product_ids:
+            row = counts.setdefault(a, {})
+            for b in product_ids:
+                if a != b:
+                    row[b] = row.get(b, 0) + 1
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Membangun ulang matriks co-occurrence dari seluruh file pesanan
+        (dibaca streaming) lalu mengganti hasil lama sekaligus
+        Returns: Jumlah pesanan yang diproses
+        Pesanan yang dibuat selama rebuild tidak ada di file yang sedang
+        dibaca; add_order mencatatnya di _pending dan pesanan tersebut
+        diputar ulang ke matriks baru di dalam lock yang sama dengan swap,
+        sehingga tidak ada increment yang hilang.
+        """
+        from models.order import OrderManager
+        with cls._rebuild_lock:
+            names = cls._name_map()
+            orders = iter(JsonArrayReader(OrderManager.ORDER_FILE, strict=False))
+            # File dibuka di dalam lock pesanan: create_order menyimpan pesanan dan memanggil
+            # add_order di lock yang sama, jadi setiap pesanan ada di file ini atau di _pending
+            with OrderManager._lock:
+                head = list(itertools.islice(orders, 1))
+                with cls._lock:
+                    cls._pending = []
+            try:
+                counts = {}
+                order_count = 0
+                for order in itertools.chain(head, orders):
+                    if isinstance(order, dict):
+                        cls._count_pairs(counts, cls._order_products(order, names))
+                        order_count += 1
+
+                top = {pid: cls._top_k(neighbours) for pid, neighbours in counts.items()}
+                # Disimpan sebelum dipublish: setelah itu add_order mengubah dictionary ini di
+                # tempat (pesanan di _pending masuk ke file pada rebuild berikutnya)
+                cls._save(counts, order_count)
+                with cls._lock:
+                    changed = set()
+                    for product_ids in cls._pending:
+                        cls._count_pairs(counts, product_ids)
+                        changed.update(product_ids)
+                    for pid in changed:
+                        top[pid] = cls._top_k(counts[pid])
+                    cls._counts = counts
+                    cls._top = top
+            finally:
+                with cls._lock:
+                    cls._pending = None
+            return order_count
+
+    @classmethod
+    def add_order(cls, order):
+        """
+        Update inkremental untuk satu pesanan baru
+        Args:
+            order: Dictionary pesanan yang baru disimpan
+        """
+        try:
+            items = [item for item in order.get('items') or [] if isinstance(item, dict)]
+            names = {} if all(item.get('product_id') for item in items) else cls._name_map()
+            product_ids = cls._order_products(order, names)
+            if len(product_ids) < 2:
+                return
+            with cls._lock:
+                # Copy-on-write per baris: hanya baris produk di pesanan ini yang disalin
+                # (O(ukuran pesanan), bukan O(katalog)); reader tanpa lock melihat
+                # baris/top-k lama atau yang baru secara utuh, tidak pernah setengah diupdate
+                rows = {pid: dict(cls._counts.get(pid, {})) for pid in product_ids}
+                cls._count_pairs(rows, product_ids)
+                for pid in product_ids:
+                    cls._counts[pid] = rows[pid]
+                    cls._top[pid] = cls._top_k(rows[pid])
+                if cls._pending is not None:
+                    cls._pending.append(product_ids)  # Diputar ulang ke hasil rebuild yang sedang berjalan
+        except Exception:
+            logger.exception("Error update rekomendasi")
+
+    @classmethod
+    def _save(cls, counts, order_count):
+        """Simpan matriks ke file secara atomic (gagal = hanya dicatat)"""
+        try:
+            os.makedirs(os.path.dirname(cls.REC_FILE), exist_ok=True)
+            tmp = cls.REC_FILE + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(codec.dumps({'orders': order_count, 'counts': counts}, 'compact'))
+            os.replace(tmp, cls.REC_FILE)
+        except OSError:
+            logger.exception("Gagal menyimpan rekomendasi")
+
+    @classmethod
+    def get_recommendation_ids(cls, product_id):
+        """ID produk yang sering dibeli bersama product_id (lookup O(1))"""
+        return cls._top.get(product_id, ())
+
+    @classmethod
+    def get_recommendations(cls, product_id):
+        """
+        Produk yang sering dibeli bersama product_id
+        Returns: List dictionary produk (produk yang sudah dihapus dilewati)
+        """
+        from models.products import ProductsManager
+        products = []
+        for other_id in cls.get_recommendation_ids(product_id):
+            product = ProductsManager.get(other_id)
+            if product:
+                products.append(product)
+        return products
@@ -0,0 +1,195 @@
+"""
+Record ringkas (dataclass slots=True) untuk produk, pesanan, item pesanan dan
+baris keranjang.
+
+Dictionary Python untuk satu produk/pesanan memakan ratusan byte hanya untuk
+hash table key-nya; record dengan __slots__ hanya menyimpan pointer per field.
+Dipakai untuk data yang ditahan lama di memori (cache katalog, index pesanan
+open) dan untuk menyusun pesanan dari keranjang.
+
+- from_dict()/to_dict() mengonversi dari/ke bentuk JSON (dict) yang ditulis
+  ke file data, session dan response API. Key yang tidak dikenal disimpan di
+  field 'extra' sehingga round-trip tidak kehilangan data
+- Field bernilai None dianggap tidak ada (tidak ikut di to_dict)
+- Akses gaya dict (record['name'], record.get('stock', 0), 'notes' in record,
+  dict(record)) tetap didukung agar kode dan template lama tidak perlu diubah
+- Field dengan sedikit nilai berbeda (status, lokasi pickup) di-intern agar
+  jutaan record berbagi objek string yang sama
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Optional
+
+class Record:
+    """Basis record: konversi JSON dan akses gaya dict"""
+
+    __slots__ = ()
+    FIELDS = ()  # Nama field selain 'extra', diisi oleh @record
+    INTERNED = ()  # Field string yang di-intern saat from_dict
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Membuat record dari dictionary (hasil parse JSON)
+        Args:
+            data: Dictionary record, atau record yang sudah jadi (dikembalikan apa adanya)
+        Returns: Instance record
+        """
+        if isinstance(data, cls):
+            return data
+        values = [data.get(name) for name in cls.FIELDS]
+        for i in cls._interned_pos:
+            if type(values[i]) is str:
+                values[i] = sys.intern(values[i])
+        extra = None
+        if not cls._field_set.issuperset(data):
+            extra = {key: value for key, value in data.items() if key not in cls._field_set}
+        return cls(*values, extra)
+
+    def to_dict(self):
+        """Bentuk dictionary (siap JSON) dengan urutan field tetap, extra di belakang"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # Akses gaya dict, untuk kode dan template yang masih memperlakukan record sebagai dictionary
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return getattr(self, key) is not None
+        return bool(self.extra) and key in self.extra
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def keys(self):
+        keys = [name for name in self.FIELDS if getattr(self, name) is not None]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def update(self, other=(), **kwargs):
+        for key, value in dict(other, **kwargs).items():
+            self[key] = value
+
+def record(cls):
+    """Decorator: dataclass(slots=True) + metadata field untuk Record"""
+    cls = dataclass(slots=True)(cls)
+    cls.FIELDS = tuple(f.name for f in fields(cls) if f.name != 'extra')
+    cls._field_set = frozenset(cls.FIELDS)
+    cls._interned_pos = tuple(cls.FIELDS.index(name) for name in cls.INTERNED)
+    return cls
+
+@record
+class Product(Record):
+    """Produk katalog (products.json)"""
+    id: Optional[str] = None
+    name: Optional[str] = None
+    price: Optional[int] = None
+    stock: Optional[int] = None
+    image: Optional[str] = None
+    phone: Optional[str] = None
+    extra: Optional[dict] = None
+
+@record
+class OrderItem(Record):
+    """Satu baris produk di dalam pesanan"""
+    product_id: Optional[str] = None
+    name: Optional[str] = None
+    price: Optional[int] = None
+    quantity: Optional[int] = None
+    phone: Optional[str] = None
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_cart_line(cls, line):
+        """Item pesanan dari baris keranjang (harga dikunci saat checkout)"""
+        phone = line.phone if line.phone is not None else 'Tidak tersedia'
+        return cls(line.product_id, line.name, line.price, line.quantity, phone)
+
+    @property
+    def subtotal(self):
+        return (self.price or 0) * (self.quantity or 0)
+
+@record
+class Order(Record):
+    """Pesanan (orders.json); items berisi OrderItem"""
+    INTERNED = ('user_id', 'user_email', 'pickup_location', 'status', 'payment_status')
+
+    order_id: Optional[str] = None
+    user_id: Optional[str] = None
+    user_email: Optional[str] = None
+    fullname: Optional[str] = None
+    phone: Optional[str] = None
+    items: Optional[list] = None
+    total: Optional[int] = None
+    pickup_location: Optional[str] = None
+    status: Optional[str] = None
+    payment_status: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    notes: Optional[str] = None
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        # super() tanpa argumen tidak bisa dipakai: dataclass(slots=True) membuat class baru
+        order = Record.from_dict.__func__(cls, data)
+        if isinstance(order.items, list):
+            # Item yang bukan dictionary (data rusak) dibiarkan apa adanya
+            order.items = [OrderItem.from_dict(item) if isinstance(item, dict) else item
+                           for item in order.items]
+        return order
+
+    def to_dict(self):
+        data = Record.to_dict(self)
+        if self.items:
+            data['items'] = [item.to_dict() if isinstance(item, Record) else item for item in self.items]
+        return data
+
+@record
+class CartLine(Record):
+    """Satu baris keranjang belanja (disimpan di session sebagai dictionary)"""
+    product_id: Optional[str] = None
+    name: Optional[str] = None
+    price: Optional[int] = None
+    quantity: Optional[int] = None
+    phone: Optional[str] = None
+    extra: Optional[dict] = None
+
+    @property
+    def subtotal(self):
+        return (self.price or 0) * (self.quantity or 0)
+
+def to_dicts(records):
+    """List record -> list dictionary (untuk disimpan/dikirim sebagai JSON)"""
+    return [item.to_dict() for item in records]
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+# Ubah stok beberapa produk secara atomic (all-or-nothing) di server Redis.
+# KEYS[1] = hash stok {product_id: stok}, KEYS[2] = stream ledger
+# ARGV = reason, ts, maxlen ledger, lalu pasangan product_id, delta
+# Return {1, stok_baru...} | {0} stok tidak cukup | {-1} produk tidak ada
+_CHANGE_SCRIPT = """
+local count = (#ARGV - 3) / 2
+local new = {}
+for i = 1, count do
+    local current = redis.call('HGET', KEYS[1], ARGV[2 + 2 * i])
+    if not current then
+        return {-1}
+    end
+    local value = tonumber(current) + tonumber(ARGV[3 + 2 * i])
+    if value < 0 then
+        return {0}
+    end
+    new[i] = value
+end
+for i = 1, count do
+    local product_id = ARGV[2 + 2 * i]
+    redis.call('HSET', KEYS[1], product_id, new[i])
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'ts', ARGV[2], 'product_id', product_id,
+               'delta', ARGV[3 + 2 * i], 'stock', new[i], 'reason', ARGV[1])
+end
+table.insert(new, 1, 1)
+return new
+"""
+
+# Set stok absolut satu produk. ARGV = reason, ts, maxlen ledger, product_id, stok
+# Return stok lama, atau false jika produk tidak ada
+_SET_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[4])
+if not current then
+    return false
+end
+redis.call('HSET', KEYS[1], ARGV[4], ARGV[5])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'ts', ARGV[2], 'product_id', ARGV[4],
+           'delta', tonumber(ARGV[5]) - tonumber(current), 'stock', ARGV[5], 'reason', ARGV[1])
+return current
+"""
+
+class RedisStock:
+    """
+    Stok produk di server Redis, dibagi semua host aplikasi.
+
+    Pengganti ledger file lokal saat STORE_BACKEND = 'redis':
+    - Hash <prefix>stock menyimpan stok terkini per produk
+    - Perubahan dijalankan sebagai script Lua: cek stok cukup dan kurangi
+      terjadi atomic di server, jadi tidak ada oversell antar host tanpa
+      lock lokal
+    - Setiap perubahan dicatat ke stream <prefix>stock:ledger (audit trail,
+      field sama dengan StockLedger.record)
+    Katalog (nama, harga, gambar) tetap dibaca dari products.json/snapshot.
+    """
+
+    def __init__(self, client, prefix='civitas:', ledger_maxlen=100000):
+        self.client = client
+        self.key = prefix + 'stock'
+        self.ledger_key = prefix + 'stock:ledger'
+        self.ledger_maxlen = ledger_maxlen
+        self._change = client.register_script(_CHANGE_SCRIPT)
+        self._set = client.register_script(_SET_SCRIPT)
+
+    def seed(self, stocks):
+        """
+        Mengisi stok produk yang belum ada di Redis (stok yang sudah ada tidak
+        ditimpa, jadi aman dijalankan setiap host saat start)
+        Args:
+            stocks: Dictionary {product_id: stok}
+        """
+        if not stocks:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for product_id, stock in stocks.items():
+            pipe.hsetnx(self.key, product_id, int(stock))
+        pipe.execute()
+
+    def get(self, product_id):
+        """Stok satu produk (None jika produk belum ada di Redis)"""
+        value = self.client.hget(self.key, product_id)
+        return int(value) if value is not None else None
+
+    def get_many(self, product_ids):
+        """Stok beberapa produk dalam satu round trip: {product_id: stok}"""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        values = self.client.hmget(self.key, product_ids)
+        return {pid: int(value) for pid, value in zip(product_ids, values) if value is not None}
+
+    def all(self):
+        """Stok semua produk: {product_id: stok}"""
+        return {pid: int(value) for pid, value in self.client.hgetall(self.key).items()}
+
+    def _args(self, reason):
+        return [reason, datetime.now().isoformat(), self.ledger_maxlen]
+
+    def change_many(self, deltas, reason='change'):
+        """
+        Mengubah stok beberapa produk secara atomic
+        Args:
+            deltas: Dictionary {product_id: delta}
+            reason: Alasan perubahan (audit)
+        Returns: Dictionary {product_id: stok baru}, None jika ada produk yang
+                 tidak ada atau stok akan negatif (tidak ada yang diubah)
+        """
+        if not deltas:
+            return {}
+        args = self._args(reason)
+        for product_id, delta in deltas.items():
+            args.extend((product_id, int(delta)))
+        result = self._change(keys=[self.key, self.ledger_key], args=args)
+        if int(result[0]) != 1:
+            return None
+        return {pid: int(stock) for pid, stock in zip(deltas, result[1:])}
+
+    def set(self, product_id, value, reason='set'):
+        """
+        Mengatur stok produk ke nilai absolut
+        Returns: True jika berhasil, False jika produk tidak ada
+        """
+        args = self._args(reason) + [product_id, int(value)]
+        return self._set(keys=[self.key, self.ledger_key], args=args) is not None
+
+    def ledger(self, count=100):
+        """Record perubahan stok terbaru (terbaru lebih dulu) dari stream ledger"""
+        return [fields for _, fields in self.client.xrevrange(self.ledger_key, count=count)]
@@ -0,0 +1,226 @@
+import csv
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from models.order import OrderManager
+from utils.json_stream import JsonArrayReader
+
+logger = logging.getLogger(__name__)
+
+
+class ReportManager:
+    """Class untuk membuat laporan pesanan (CSV/JSONL) di background thread"""
+
+    REPORT_DIR = 'data/reports'
+    CHUNK_SIZE = 64 * 1024  # Ukuran potongan saat membaca/mengirim file
+    MAX_JOBS = 50  # Jumlah job terakhir yang disimpan di memori
+    MAX_ACTIVE_JOBS = 4  # Job pending + running maksimal; job baru ditolak jika penuh
+    MAX_RUNNING_JOBS = 1  # Job yang membaca orders.json bersamaan (sisanya menunggu giliran)
+    FORMATS = {
+        'csv': ('text/csv', 'csv'),
+        'jsonl': ('application/x-ndjson', 'jsonl'),
+    }
+    CSV_FIELDS = [
+        'order_id', 'created_at', 'user_email', 'fullname', 'phone',
+        'pickup_location', 'status', 'payment_status', 'total',
+        'item_count', 'items', 'notes'
+    ]
+
+    _jobs = {}
+    _lock = threading.Lock()
+    _slots = threading.BoundedSemaphore(MAX_RUNNING_JOBS)
+
+    @staticmethod
+    def _ensure_report_dir():
+        """Pastikan direktori laporan ada"""
+        os.makedirs(ReportManager.REPORT_DIR, exist_ok=True)
+
+    @staticmethod
+    def _matches(order, filters):
+        """
+        Cek apakah pesanan lolos filter laporan
+        Args:
+            order: Dictionary pesanan
+            filters: Dictionary filter (date_from, date_to, status, pickup_location)
+        Returns: Boolean
+        """
+        created = order.get('created_at', '')
+        if filters.get('date_from') and created[:10] < filters['date_from']:
+            return False
+        if filters.get('date_to') and created[:10] > filters['date_to']:
+            return False
+        if filters.get('status') and order.get('status') != filters['status']:
+            return False
+        if filters.get('pickup_location') and order.get('pickup_location') != filters['pickup_location']:
+            return False
+        return True
+
+    @staticmethod
+    def _csv_row(order):
+        """Ubah satu pesanan menjadi baris CSV"""
+        items = order.get('items', [])
+        return {
+            'order_id': order.get('order_id', ''),
+            'created_at': order.get('created_at', ''),
+            'user_email': order.get('user_email', ''),
+            'fullname': order.get('fullname', ''),
+            'phone': order.get('phone', ''),
+            'pickup_location': order.get('pickup_location', ''),
+            'status': order.get('status', ''),
+            'payment_status': order.get('payment_status', ''),
+            'total': order.get('total', 0),
+            'item_count': sum(item.get('quantity', 0) for item in items),
+            'items': '; '.join(f"{item.get('name', '')} x{item.get('quantity', 0)}" for item in items),
+            'notes': order.get('notes', ''),
+        }
+
+    @classmethod
+    def create_job(cls, fmt='csv', filters=None, owner=None):
+        """
+        Membuat job laporan baru dan menjalankannya di background thread
+        Args:
+            fmt: Format laporan ('csv' atau 'jsonl')
+            filters: Dictionary filter opsional
+            owner: User pembuat job (hanya dia yang bisa melihat/download)
+        Returns: Dictionary status job, atau None jika format tidak dikenal atau
+                 sudah ada MAX_ACTIVE_JOBS job yang belum selesai
+        """
+        if fmt not in cls.FORMATS:
+            return None
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'format': fmt,
+            'filters': {k: v for k, v in (filters or {}).items() if v},
+            'state': 'pending',
+            'rows': 0,
+            'scanned': 0,
+            'progress': 0.0,
+            'error': None,
+            'owner': owner,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'path': os.path.join(cls.REPORT_DIR, f"orders-{job_id}.{cls.FORMATS[fmt][1]}"),
+        }
+
+        with cls._lock:
+            active = sum(1 for j in cls._jobs.values() if j['state'] in ('pending', 'running'))
+            if active >= cls.MAX_ACTIVE_JOBS:
+                return None
+            cls._jobs[job_id] = job
+            cls._prune_jobs()
+
+        thread = threading.Thread(target=cls._run_job, args=(job,), daemon=True)
+        thread.start()
+        return cls.get_job(job_id)
+
+    @classmethod
+    def _prune_jobs(cls):
+        """Hapus job selesai paling lama jika melebihi MAX_JOBS (dipanggil dengan lock)"""
+        finished = [j for j in cls._jobs.values() if j['state'] in ('done', 'failed')]
+        excess = len(cls._jobs) - cls.MAX_JOBS
+        for job in sorted(finished, key=lambda j: j['created_at'])[:max(excess, 0)]:
+            del cls._jobs[job['job_id']]
+            try:
+                os.remove(job['path'])
+            except OSError:
+                pass
+
+    @classmethod
+    def _run_job(cls, job):
+        """
+        Menulis laporan ke file secara streaming: satu pesanan dibaca,
+        difilter dan ditulis dalam satu waktu sehingga memori tetap konstan.
+        Paling banyak MAX_RUNNING_JOBS job berjalan bersamaan.
+        """
+        with cls._slots:
+            cls._write_report(job)
+
+    @classmethod
+    def _write_report(cls, job):
+        """Isi _run_job (dipanggil setelah mendapat slot)"""
+        job['state'] = 'running'
+        tmp = job['path'] + '.tmp'
+        try:
+            cls._ensure_report_dir()
+            # Reader strict: orders.json yang terpotong/rusak membuat job failed,
+            # bukan laporan 'done' yang diam-diam tidak lengkap
+            reader = JsonArrayReader(OrderManager.ORDER_FILE, chunk_size=cls.CHUNK_SIZE)
+            with open(tmp, 'w', encoding='utf-8', newline='') as f:
+                writer = None
+                if job['format'] == 'csv':
+                    writer = csv.DictWriter(f, fieldnames=cls.CSV_FIELDS)
+                    writer.writeheader()
+
+                for order in reader:
+                    job['scanned'] += 1
+                    if cls._matches(order, job['filters']):
+                        if writer:
+                            writer.writerow(cls._csv_row(order))
+                        else:
+                            f.write(json.dumps(order, ensure_ascii=False) + '\n')
+                        job['rows'] += 1
+                    if reader.total_bytes:
+                        job['progress'] = round(reader.bytes_read / reader.total_bytes, 4)
+
+            os.replace(tmp, job['path'])
+            job['progress'] = 1.0
+            job['state'] = 'done'
+        except Exception as e:
+            logger.exception("Error generating report %s", job['job_id'])
+            job['state'] = 'failed'
+            job['error'] = str(e)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+
+    @classmethod
+    def get_job(cls, job_id, owner=None):
+        """
+        Mengambil status job laporan
+        Args:
+            job_id: ID job
+            owner: Jika diisi, hanya job milik user ini
+        Returns: Dictionary status job (tanpa path file) atau None
+        """
+        job = cls._jobs.get(job_id)
+        if not job or (owner is not None and job['owner'] != owner):
+            return None
+        return {k: v for k, v in job.items() if k != 'path'}
+
+    @classmethod
+    def get_download(cls, job_id, owner=None):
+        """
+        Mengambil info file laporan yang sudah selesai
+        Args:
+            job_id: ID job
+            owner: Jika diisi, hanya job milik user ini
+        Returns: Tuple (path, mimetype, filename) atau None jika belum siap
+        """
+        job = cls._jobs.get(job_id)
+        if not job or (owner is not None and job['owner'] != owner):
+            return None
+        if job['state'] != 'done' or not os.path.exists(job['path']):
+            return None
+        mimetype, ext = cls.FORMATS[job['format']]
+        return job['path'], mimetype, f"orders-{job_id}.{ext}"
+
+    @classmethod
+    def iter_file(cls, path):
+        """
+        Generator yang membaca file laporan per chunk untuk response streaming
+        Args:
+            path: Path file laporan
+        """
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(cls.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
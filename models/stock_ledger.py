@@ -0,0 +1,201 @@
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Event, Lock
+from utils import codec
+from utils.admission import AdmissionController
+
+try:
+    import fcntl  # Lock antar proses (tidak tersedia di Windows)
+except ImportError:  # pragma: no cover - tergantung platform
+    fcntl = None
+
+class StockLedger:
+    """
+    Ledger append-only untuk perubahan stok (audit trail).
+
+    Setiap baris adalah satu record JSON:
+        {"ts", "product_id", "delta", "stock", "reason"}
+    'stock' adalah nilai stok SETELAH perubahan, sehingga replay record
+    bersifat idempotent: memutar ulang record yang sudah masuk checkpoint
+    tetap menghasilkan stok yang benar.
+
+    File <ledger>.checkpoint menyimpan offset byte terakhir yang sudah
+    ditulis balik ke products.json; replay dimulai dari offset tersebut.
+    """
+
+    FSYNC = True  # fsync setiap append (bisa dimatikan via STOCK_LEDGER_FSYNC)
+    _lock = Lock()  # Untuk membuka file lock stripe
+    _lock_fds = {}  # {path file lock stripe: fd}, dibuka sekali per proses
+    # Group commit per file ledger: {path: {'queue': [waiter], 'busy': ada leader}}
+    _sync_lock = Lock()
+    _sync_state = {}
+
+    @staticmethod
+    def record(product_id, delta, stock, reason):
+        """Membuat satu record ledger"""
+        return {
+            'ts': datetime.now().isoformat(),
+            'product_id': product_id,
+            'delta': int(delta),
+            'stock': int(stock),
+            'reason': reason,
+        }
+
+    @classmethod
+    def _lock_fd(cls, path, stripe):
+        """fd file lock untuk satu stripe (<ledger>.locks/<stripe>), dibuka sekali per proses"""
+        lock_path = os.path.join(path + '.locks', str(stripe))
+        fd = cls._lock_fds.get(lock_path)
+        if fd is None:
+            with cls._lock:
+                fd = cls._lock_fds.get(lock_path)
+                if fd is None:
+                    os.makedirs(path + '.locks', exist_ok=True)
+                    fd = cls._lock_fds[lock_path] = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        return fd
+
+    @classmethod
+    @contextmanager
+    def locked(cls, path, stripes):
+        """
+        Context manager yang mengunci stripe ledger antar proses
+        Args:
+            path: Path file ledger
+            stripes: Index stripe produk yang dikunci (semua stripe untuk checkpoint/add_product)
+        Setiap stripe punya file lock sendiri (flock), jadi proses lain yang
+        mengubah produk di stripe berbeda tidak ikut menunggu. Lock diambil
+        ascending sehingga tidak bisa deadlock antar proses. Antar thread di
+        proses yang sama penguncinya adalah stripe lock ProductsManager (fd
+        lock dipakai bersama oleh thread), jadi pemanggil harus sudah memegang
+        stripe lock yang sama.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not fcntl:
+            yield
+            return
+        fds = [cls._lock_fd(path, stripe) for stripe in sorted(stripes)]
+        start = time.perf_counter()
+        locked = []
+        try:
+            for fd in fds:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                locked.append(fd)
+            # Waktu tunggu lock proses lain (sinyal load shedding)
+            AdmissionController.record_wait(time.perf_counter() - start)
+            yield
+        finally:
+            for fd in reversed(locked):
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    @classmethod
+    def append(cls, path, records):
+        """
+        Menambahkan record ke ledger (dipanggil di dalam locked())
+        Args:
+            path: Path file ledger
+            records: List record dari StockLedger.record()
+        Dengan FSYNC, append memakai group commit: thread pertama menulis semua
+        record yang sedang antri (dari stripe lain) dalam satu write() lalu satu
+        fsync; thread lain hanya menunggu batch-nya selesai. Tanpa batch, fsync
+        yang berjalan bersamaan dengan append lain di file yang sama jauh lebih
+        lambat daripada fsync berurutan.
+        """
+        raw = b''.join(codec.dumps(rec, 'compact') + b'\n' for rec in records)
+        if not cls.FSYNC:
+            cls._write(path, raw, False)
+            return
+        waiter = {'raw': raw, 'event': Event(), 'done': False, 'error': None}
+        with cls._sync_lock:
+            state = cls._sync_state.setdefault(path, {'queue': [], 'busy': False})
+            state['queue'].append(waiter)
+            leader = not state['busy']
+            state['busy'] = True
+        if not leader:
+            # Dibangunkan sekali: batch kita selesai, atau kita menjadi leader berikutnya
+            waiter['event'].wait()
+            if waiter['done']:
+                if waiter['error'] is not None:
+                    raise waiter['error']
+                return
+        with cls._sync_lock:
+            batch, state['queue'] = state['queue'], []
+        error = None
+        try:
+            cls._write(path, b''.join(w['raw'] for w in batch), True)
+        except BaseException as e:
+            error = e  # Semua thread di batch ini ikut gagal (record tidak dijamin tersimpan)
+        with cls._sync_lock:
+            successor = state['queue'][0] if state['queue'] else None
+            state['busy'] = successor is not None
+        for w in batch:
+            w['done'], w['error'] = True, error
+            if w is not waiter:
+                w['event'].set()
+        if successor is not None:
+            successor['event'].set()
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _write(path, raw, sync):
+        """Satu write() O_APPEND (record tidak bisa tersisip append proses lain), opsional fsync"""
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(raw)
+            while view:
+                view = view[os.write(fd, view):]
+            if sync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def size(path):
+        """Ukuran file ledger dalam byte (0 jika belum ada)"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def read_from(path, pos):
+        """
+        Membaca record lengkap mulai dari offset pos
+        Returns: Tuple (list record, offset baru)
+        Baris terakhir yang belum lengkap (sedang ditulis proses lain) diabaikan.
+        """
+        try:
+            with open(path, 'rb') as f:
+                f.seek(pos)
+                chunk = f.read()
+        except OSError:
+            return [], pos
+        end = chunk.rfind(b'\n') + 1
+        records = []
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                try:
+                    records.append(codec.loads(line))
+                except ValueError:
+                    continue  # Baris rusak dilewati
+        return records, pos + end
+
+    @staticmethod
+    def read_checkpoint(path):
+        """Offset ledger yang sudah masuk ke products.json (0 jika belum ada)"""
+        try:
+            return int(codec.load_file(path + '.checkpoint').get('offset', 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    @staticmethod
+    def write_checkpoint(path, offset):
+        """Menyimpan offset checkpoint secara atomic"""
+        tmp = path + '.checkpoint.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(codec.dumps({'offset': offset, 'at': time.time()}, 'compact'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path + '.checkpoint')
@@ -1,7 +1,10 @@
+import logging
 import os
-import json
+from utils import codec
 from werkzeug.security import generate_password_hash, check_password_hash
 
+logger = logging.getLogger(__name__)
+
 class UserManager:
     """Class untuk mengelola data user"""
     
@@ -16,12 +19,11 @@ class UserManager:
         """
         try:
             if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        return data
-        except Exception as e:
-            print(f"Gagal memuat data user dari {self.json_file}: {e}")
+                data = codec.load_file(self.json_file)
+                if isinstance(data, dict):
+                    return data
+        except Exception:
+            logger.exception("Gagal memuat data user dari %s", self.json_file)
         return {}
     
     def save_users(self):
@@ -36,16 +38,16 @@ class UserManager:
             
             # Simpan ke file temporary dulu untuk keamanan
             tmp_path = self.json_file + '.tmp'
-            with open(tmp_path, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, ensure_ascii=False, indent=2)
+            with open(tmp_path, 'wb') as f:
+                f.write(codec.dumps(self.users, codec.store_format('users')))
                 f.flush()
                 os.fsync(f.fileno())
             
             # Pindahkan file temporary ke file asli (atomic operation)
             os.replace(tmp_path, self.json_file)
             
-        except Exception as e:
-            print(f"Gagal menyimpan data user ke {self.json_file}: {e}")
+        except Exception:
+            logger.exception("Gagal menyimpan data user ke %s", self.json_file)
     
     def create_user(self, email, password, full_name):
         """
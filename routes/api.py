@@ -0,0 +1,152 @@
+import math
+from flask import Blueprint, current_app, request, jsonify
+from utils.decorators import login_required, staff_required
+from models.order import OrderManager
+from models.pickup_location import PickupLocationManager
+from models.products import ProductsManager
+
+# Blueprint untuk endpoint JSON (API)
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+
+PRODUCT_FIELDS = ('id', 'name', 'price', 'stock', 'image', 'phone')
+MAX_LIMIT = 100  # Jumlah produk/pesanan maksimal per halaman
+
+def _number_arg(name):
+    """Ambil query parameter angka; None jika kosong, ValueError jika tidak valid"""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(name)
+    return int(number) if number.is_integer() else number
+
+@api_bp.route('/products')
+@login_required
+def list_products():
+    """
+    Query katalog produk.
+    Parameter (semua opsional):
+        sort      : price | name (awali dengan '-' untuk urutan menurun, mis. -price)
+        min_price : Harga minimal (inklusif)
+        max_price : Harga maksimal (inklusif)
+        in_stock  : 1/true untuk hanya produk yang stoknya tersedia
+        fields    : Daftar field dipisah koma (id,name,price,stock,image,phone)
+        offset    : Mulai dari hasil ke-N (default 0)
+        limit     : Jumlah hasil per halaman (default PRODUCTS_PER_PAGE, maksimal 100)
+    """
+    sort = request.args.get('sort', 'price').strip()
+    descending = sort.startswith('-')
+    sort = sort.lstrip('-')
+    if sort not in ('price', 'name'):
+        return jsonify({'success': False, 'message': 'sort harus price atau name'}), 400
+
+    try:
+        min_price = _number_arg('min_price')
+        max_price = _number_arg('max_price')
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = int(request.args.get('limit') or current_app.config.get('PRODUCTS_PER_PAGE', 12))
+        limit = min(max(limit, 1), MAX_LIMIT)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Parameter angka tidak valid'}), 400
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in PRODUCT_FIELDS]
+        if unknown:
+            return jsonify({'success': False, 'message': f"Field tidak dikenal: {', '.join(unknown)}"}), 400
+
+    in_stock = request.args.get('in_stock', '').lower() in ('1', 'true', 'yes', 'on')
+    total, products = ProductsManager.query_products(
+        min_price=min_price, max_price=max_price, in_stock=in_stock, sort=sort,
+        descending=descending, offset=offset, limit=limit, fields=fields,
+    )
+    return jsonify({
+        'success': True,
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'products': products,
+    })
+
+@api_bp.route('/orders/bulk_status', methods=['POST'])
+@login_required
+@staff_required
+def bulk_order_status():
+    """
+    Mengubah status banyak pesanan sekaligus (meja pickup, khusus staff).
+    Body JSON / form:
+        order_ids       : List ID pesanan, atau
+        pickup_location : Semua pesanan open di lokasi ini
+        current_status  : Filter opsional untuk pickup_location (mis. menunggu_pembayaran)
+        status          : Status pesanan baru (opsional)
+        payment_status  : Status pembayaran baru (opsional)
+    Response berisi hasil per pesanan; semua perubahan disimpan dalam satu penulisan.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form.to_dict()
+        data['order_ids'] = request.form.getlist('order_ids')
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Body JSON harus berupa object'}), 400
+    fields = ('pickup_location', 'current_status', 'status', 'payment_status')
+    if any(not isinstance(data.get(field) or '', str) for field in fields):
+        return jsonify({'success': False, 'message': 'Field status dan pickup_location harus berupa teks'}), 400
+
+    order_ids = data.get('order_ids') or []
+    if isinstance(order_ids, str):
+        order_ids = [order_ids]
+    if not isinstance(order_ids, list) or not all(isinstance(i, str) for i in order_ids):
+        return jsonify({'success': False, 'message': 'order_ids harus berupa list ID pesanan'}), 400
+
+    result = OrderManager.bulk_update(
+        order_ids=[i.strip() for i in order_ids if i.strip()],
+        pickup_location=(data.get('pickup_location') or '').strip() or None,
+        current_status=(data.get('current_status') or '').strip() or None,
+        status=(data.get('status') or '').strip() or None,
+        payment_status=(data.get('payment_status') or '').strip() or None,
+    )
+    if not result['success'] and not result['results']:
+        return jsonify(result), 400
+    return jsonify(result), 200 if result['success'] else 500
+
+@api_bp.route('/orders/search')
+@login_required
+@staff_required
+def search_orders():
+    """
+    Mencari pesanan (meja admin/pickup, khusus staff: hasil berisi data pembeli).
+    Parameter:
+        q      : Nama pembeli, nomor telepon, catatan atau bagian ID pesanan
+                 (minimal 3 karakter; prefix ID seperti ORD-5 boleh lebih pendek)
+        offset : Mulai dari hasil ke-N (default 0)
+        limit  : Jumlah hasil per halaman (default 20, maksimal 100)
+    Hasil berisi ringkasan pesanan, terbaru lebih dulu.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'message': 'q wajib diisi'}), 400
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit') or 20), 1), MAX_LIMIT)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Parameter angka tidak valid'}), 400
+
+    total, orders = OrderManager.search_orders(query, offset=offset, limit=limit)
+    return jsonify({'success': True, 'q': query, 'total': total, 'offset': offset, 'limit': limit,
+                    'orders': orders})
+
+@api_bp.route('/orders/open')
+@login_required
+@staff_required
+def open_orders():
+    """Pesanan yang masih open di satu lokasi pickup (?pickup_location=loc_x), khusus staff"""
+    pickup_location = request.args.get('pickup_location', '').strip()
+    if not pickup_location:
+        return jsonify({'success': False, 'message': 'pickup_location wajib diisi'}), 400
+    if not PickupLocationManager.get_location_by_id(pickup_location):
+        return jsonify({'success': False, 'message': 'Lokasi pickup tidak ditemukan'}), 404
+
+    orders = OrderManager.get_open_orders_by_location(pickup_location)
+    return jsonify({'success': True, 'pickup_location': pickup_location, 'total': len(orders), 'orders': orders})
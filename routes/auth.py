@@ -1,5 +1,6 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, make_response
 from models.user import UserManager
+from utils.rate_limit import AuthThrottle
 
 # Buat blueprint untuk authentication routes
 auth_bp = Blueprint('auth', __name__)
@@ -7,6 +8,19 @@ auth_bp = Blueprint('auth', __name__)
 # Initialize user manager
 user_manager = UserManager()
 
+def _too_many_requests(template, form_data, retry_after):
+    """
+    Response 429 yang cepat: render ulang form tanpa menjalankan hash password
+    Args:
+        template: Template form (Login.html / Register.html)
+        form_data: Data form yang dipertahankan
+        retry_after: Detik sebelum boleh mencoba lagi
+    """
+    flash(f'Terlalu banyak percobaan. Silakan coba lagi dalam {retry_after} detik.')
+    response = make_response(render_template(template, form_data=form_data), 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """
@@ -22,8 +36,16 @@ def login():
         flash('Email dan password harus diisi')
         return redirect(url_for('auth.login_page'))
     
-    # Autentikasi user
-    success, user = user_manager.authenticate_user(email, password)
+    # Batasi percobaan per IP dan per email sebelum menjalankan PBKDF2
+    allowed, retry_after = AuthThrottle.check('login', request.remote_addr, email)
+    if not allowed:
+        return _too_many_requests('Login.html', {'email': email}, retry_after)
+    
+    # Autentikasi user (jumlah verifikasi hash bersamaan dibatasi)
+    with AuthThrottle.hash_slot() as acquired:
+        if not acquired:
+            return _too_many_requests('Login.html', {'email': email}, 1)
+        success, user = user_manager.authenticate_user(email, password)
     if not success:
         session['login_form'] = {'email': email}
         flash('Email atau password salah')
@@ -66,8 +88,15 @@ def register():
             flash(error)
         return redirect(url_for('auth.register_page'))
     
-    # Buat user baru
-    success, message = user_manager.create_user(email, password, name)
+    allowed, retry_after = AuthThrottle.check('register', request.remote_addr, email)
+    if not allowed:
+        return _too_many_requests('Register.html', {'name': name, 'email': email}, retry_after)
+    
+    # Buat user baru (hash password memakai slot yang sama dengan login)
+    with AuthThrottle.hash_slot() as acquired:
+        if not acquired:
+            return _too_many_requests('Register.html', {'name': name, 'email': email}, 1)
+        success, message = user_manager.create_user(email, password, name)
     if not success:
         session['register_form'] = {'name': name, 'email': email}
         flash(message)
@@ -13,8 +13,9 @@ def add_to_cart():
     Menambahkan produk ke keranjang belanja.
     """
     # Ambil data produk dari form atau JSON
-    product_id = request.form.get('product_id') or request.json.get('product_id')
-    quantity = int(request.form.get('quantity', 1) or request.json.get('quantity', 1))
+    data = request.get_json(silent=True) or {}
+    product_id = request.form.get('product_id') or data.get('product_id')
+    quantity = int(request.form.get('quantity') or data.get('quantity') or 1)
     
     # Ambil data produk dari database
     product = ProductsManager.get(product_id)
@@ -34,7 +35,7 @@ def add_to_cart():
         return redirect(request.referrer)
 
     # Kurangi stok lalu tambahkan ke cart
-    ok = ProductsManager.change_stock(product_id, -quantity)
+    ok = ProductsManager.change_stock(product_id, -quantity, reason='cart_add')
     if not ok:
         message = 'Gagal mengupdate stok. Silakan coba lagi.'
         if request.is_json:
@@ -76,7 +77,7 @@ def remove_from_cart():
             break
     
     if qty > 0:
-        ProductsManager.change_stock(product_id, qty)
+        ProductsManager.change_stock(product_id, qty, reason='cart_remove')
     
     # Hapus dari keranjang
     CartManager.remove_from_cart(product_id)
@@ -95,9 +96,17 @@ def clear_cart():
         flash('Keranjang sudah kosong!', 'info')
         return redirect(url_for('cart.cart_page'))
     
-    # Restore semua stok
+    # Restore semua stok dalam satu batch (lock per produk diambil berurutan).
+    # Produk yang sudah dihapus dari katalog dilewati: batch all-or-nothing,
+    # satu produk hilang tidak boleh membatalkan restore produk lainnya
+    deltas = {}
     for item in cart:
-        ProductsManager.change_stock(item['product_id'], item.get('quantity', 0))
+        deltas[item['product_id']] = deltas.get(item['product_id'], 0) + item.get('quantity', 0)
+    deltas = {pid: qty for pid, qty in deltas.items() if qty > 0 and ProductsManager.get(pid)}
+    if deltas and not ProductsManager.change_stock_many(deltas, reason='cart_clear'):
+        # Keranjang tidak dikosongkan supaya stok yang dipesan tidak hilang; user bisa coba lagi
+        flash('Gagal mengembalikan stok produk, keranjang belum dikosongkan. Silakan coba lagi.', 'error')
+        return redirect(url_for('cart.cart_page'))
     
     item_count = len(cart)
     CartManager.clear_cart()
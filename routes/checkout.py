@@ -1,11 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+import logging
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
 from utils.decorators import login_required
 from models.cart import CartManager
 from models.order import OrderManager
 from models.pickup_location import PickupLocationManager
+from models.records import CartLine, Order, OrderItem
 import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 checkout_bp = Blueprint('checkout', __name__)
 
 @checkout_bp.route('/checkout')  # ✅ ENDPOINT INI HARUS ADA
@@ -19,9 +23,7 @@ def checkout():
         return redirect(url_for('cart.cart_page'))
     
     total = CartManager.get_cart_total()
-    pickup_locations = PickupLocationManager.get_all_locations()  # ← Pastikan ini mengirim data
-    
-    print(f"DEBUG: pickup_locations = {pickup_locations}")  # ← Debug
+    pickup_locations = PickupLocationManager.get_all_locations()  # Dari registry di memori, tanpa baca file
     
     return render_template('Checkout.html', 
                          cart=cart, 
@@ -58,35 +60,24 @@ def place_order():
         # Generate order ID unik
         order_id = f"ORD-{uuid.uuid4().hex[:8].upper()}"
         
-        # Persiapkan data items DENGAN NOMOR TELEPON
-        items = []
-        total = 0
-        
-        for item in cart:
-            item_data = {
-                'name': item['name'],
-                'price': item['price'],
-                'quantity': item['quantity'],
-                'phone': item.get('phone', 'Tidak tersedia')
-            }
-            items.append(item_data)
-            total += item['price'] * item['quantity']
+        # Persiapkan data items DENGAN NOMOR TELEPON (harga dikunci dari keranjang)
+        items = [OrderItem.from_cart_line(CartLine.from_dict(item)) for item in cart]
         
         # Buat data pesanan
-        order_data = {
-            'order_id': order_id,
-            'user_id': session.get('user_id', 'unknown'),
-            'user_email': session.get('user_email', 'unknown'),
-            'fullname': fullname,
-            'phone': phone,
-            'items': items,
-            'total': total,
-            'pickup_location': pickup_location_id,
-            'status': 'menunggu_pembayaran',
-            'payment_status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'notes': notes
-        }
+        order_data = Order(
+            order_id=order_id,
+            user_id=session.get('user_id', 'unknown'),
+            user_email=session.get('user_email', 'unknown'),
+            fullname=fullname,
+            phone=phone,
+            items=items,
+            total=sum(item.subtotal for item in items),
+            pickup_location=pickup_location_id,
+            status='menunggu_pembayaran',
+            payment_status='pending',
+            created_at=datetime.now().isoformat(),
+            notes=notes,
+        ).to_dict()
         
         # Simpan pesanan
         success = OrderManager.create_order(order_data)
@@ -100,8 +91,8 @@ def place_order():
         flash('✅ Pesanan berhasil dibuat!', 'success')
         return redirect(url_for('checkout.order_confirmation', order_id=order_id))
         
-    except Exception as e:
-        print(f"Error saat place_order: {e}")
+    except Exception:
+        logger.exception("Error saat place_order")
         flash('Terjadi kesalahan saat memproses pesanan. Silakan coba lagi.', 'error')
         return redirect(url_for('checkout.checkout'))
 
@@ -130,4 +121,14 @@ def order_history():
     user_id = session.get('user_id')
     orders = OrderManager.get_orders_by_user_id(user_id)
     
-    return render_template('OrderHistory.html', orders=orders)
\ No newline at end of file
+    return render_template('OrderHistory.html', orders=orders)
+
+@checkout_bp.route('/api/pickup_locations')
+def pickup_locations_api():
+    """Daftar lokasi pickup dalam JSON, dengan cache header panjang + ETag"""
+    body, etag = PickupLocationManager.get_registry_json()
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('PICKUP_LOCATIONS_MAX_AGE', 86400)
+    return response.make_conditional(request)
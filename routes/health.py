@@ -0,0 +1,33 @@
+from flask import Blueprint, current_app, jsonify
+from utils.admission import AdmissionController
+from utils.redis_store import RedisStore
+
+# Blueprint untuk health check load balancer / orchestrator (tanpa login)
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/healthz')
+def healthz():
+    """Liveness: proses hidup dan bisa melayani request"""
+    return jsonify({'status': 'ok'})
+
+@health_bp.route('/readyz')
+def readyz():
+    """
+    Readiness: 200 hanya setelah semua store data valid dan cache sudah dimuat,
+    503 jika startup belum selesai, ada file data yang rusak, atau server
+    Redis (STORE_BACKEND='redis') tidak bisa dihubungi. Status load shedding
+    hanya informasi: proses yang sedang shedding tetap 'ready' (checkout jalan)
+    """
+    report = current_app.extensions.get('startup')
+    redis_ok = not RedisStore.ENABLED or RedisStore.ping()
+    if report is None or not report.ready or not redis_ok:
+        body = report.as_dict() if report else {}
+        errors = dict(report.errors) if report else {}
+        if not redis_ok:
+            errors['redis'] = 'Server Redis tidak bisa dihubungi'
+        body.update({'status': 'not_ready', 'errors': errors})
+        return jsonify(body), 503
+    body = report.as_dict()
+    body['status'] = 'ready'
+    body['admission'] = AdmissionController.stats()
+    return jsonify(body)
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from utils.decorators import login_required
 from models.cart import CartManager
 from models.products import ProductsManager
+from models.recommendation import RecommendationManager
 
 # Buat blueprint untuk page routes
 pages_bp = Blueprint('pages', __name__)
@@ -23,29 +24,32 @@ def dashboard_page():
     """
     Halaman dashboard user (untuk melihat profil, riwayat, dll).
     Menghitung jumlah item di keranjang untuk navbar.
+    ?seller=<no. telepon> hanya menampilkan produk penjual tersebut.
     """
     cart_count = CartManager.get_cart_count()
-    products = ProductsManager.get_all()
-    return render_template('Dasboard.html', cart_count=cart_count, products=products)
+    seller = request.args.get('seller', '').strip()
+    products = ProductsManager.get_by_seller(seller) if seller else ProductsManager.get_all()
+    return render_template('Dasboard.html', cart_count=cart_count, products=products, seller=seller)
 
 @pages_bp.route('/update_stock', methods=['POST'])
 @login_required
 def update_stock():
     product_id = request.form.get('product_id')
+    seller = request.form.get('seller') or None  # Kembali ke tampilan penjual yang sama
     try:
         new_stock = int(request.form.get('stock', 0))
         
         # Validasi stok tidak boleh negatif
         if new_stock < 0:
             flash('Stok tidak boleh negatif')
-            return redirect(url_for('pages.dashboard_page'))
+            return redirect(url_for('pages.dashboard_page', seller=seller))
             
     except ValueError:
         flash('Nilai stock tidak valid')
-        return redirect(url_for('pages.dashboard_page'))
-    ok = ProductsManager.set_stock(product_id, new_stock)
+        return redirect(url_for('pages.dashboard_page', seller=seller))
+    ok = ProductsManager.set_stock(product_id, new_stock, reason='seller_update')
     flash('Stok berhasil diperbarui' if ok else 'Gagal memperbarui stok')
-    return redirect(url_for('pages.dashboard_page'))
+    return redirect(url_for('pages.dashboard_page', seller=seller))
 
 @pages_bp.route('/add_product', methods=['POST'])
 @login_required
@@ -113,5 +117,9 @@ def product_detail(product_id):
         flash('Produk tidak ditemukan')
         return redirect(url_for('pages.home_page'))
     
+    # Rekomendasi dari matriks co-occurrence yang sudah dihitung di background
+    recommendations = RecommendationManager.get_recommendations(product_id)
+    
     # Menggunakan template product detail yang dinamis
-    return render_template('barang/product_detail.html', product=product, cart_count=cart_count)
\ No newline at end of file
+    return render_template('barang/product_detail.html', product=product, cart_count=cart_count,
+                           recommendations=recommendations)
\ No newline at end of file
@@ -0,0 +1,69 @@
+from datetime import date
+from flask import Blueprint, request, jsonify, Response, session
+from utils.decorators import login_required, staff_required
+from models.report import ReportManager
+
+# Buat blueprint untuk laporan pesanan
+reports_bp = Blueprint('reports', __name__, url_prefix='/reports')
+
+@reports_bp.route('/orders', methods=['POST'])
+@login_required
+@staff_required
+def create_order_report():
+    """
+    Membuat job laporan pesanan di background (khusus staff: laporan berisi
+    data semua pembeli).
+    Filter opsional: date_from, date_to (YYYY-MM-DD), status, pickup_location.
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': 'Body JSON harus berupa object'}), 400
+
+    fields = ('format', 'date_from', 'date_to', 'status', 'pickup_location')
+    if any(not isinstance(data.get(field) or '', str) for field in fields):
+        return jsonify({'success': False, 'message': 'Field laporan harus berupa teks'}), 400
+    fmt = (data.get('format') or 'csv').lower()
+    if fmt not in ReportManager.FORMATS:
+        return jsonify({'success': False, 'message': 'Format laporan tidak dikenal (csv/jsonl)'}), 400
+
+    filters = {field: (data.get(field) or '').strip() for field in fields[1:]}
+    for field in ('date_from', 'date_to'):
+        if filters[field]:
+            try:
+                # Dinormalisasi ke YYYY-MM-DD: filter dibandingkan dengan prefix created_at
+                filters[field] = date.fromisoformat(filters[field]).isoformat()
+            except ValueError:
+                return jsonify({'success': False,
+                                'message': f'{field} harus berupa tanggal YYYY-MM-DD'}), 400
+
+    job = ReportManager.create_job(fmt, filters, owner=session['user_id'])
+    if not job:
+        return jsonify({'success': False,
+                        'message': 'Terlalu banyak laporan yang sedang dibuat, coba lagi nanti'}), 429
+    return jsonify({'success': True, 'job': job}), 202
+
+@reports_bp.route('/<job_id>')
+@login_required
+@staff_required
+def report_status(job_id):
+    """Polling status/progress job laporan (hanya pembuat job)"""
+    job = ReportManager.get_job(job_id, owner=session['user_id'])
+    if not job:
+        return jsonify({'success': False, 'message': 'Laporan tidak ditemukan'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@reports_bp.route('/<job_id>/download')
+@login_required
+@staff_required
+def download_report(job_id):
+    """Download laporan sebagai response streaming (chunked, hanya pembuat job)"""
+    download = ReportManager.get_download(job_id, owner=session['user_id'])
+    if not download:
+        return jsonify({'success': False, 'message': 'Laporan belum siap atau tidak ditemukan'}), 404
+
+    path, mimetype, filename = download
+    return Response(ReportManager.iter_file(path),
+                    mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
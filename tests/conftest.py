@@ -0,0 +1,30 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+import main
+from routes.auth import user_manager
+
+STAFF = 'staff@example.com'
+BUYER = 'buyer@example.com'
+PASSWORD = 'rahasia123'
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = main.create_app('testing', start_background=False)
+    app.config['STAFF_EMAILS'] = frozenset({STAFF})
+    password_hash = generate_password_hash(PASSWORD, method='pbkdf2:sha256:1000')
+    for email in (STAFF, BUYER):
+        monkeypatch.setitem(user_manager.users, email,
+                            {'username': email, 'full_name': email, 'password_hash': password_hash})
+    return app
+
+
+@pytest.fixture
+def login(app):
+    def login(email):
+        client = app.test_client()
+        response = client.post('/login', data={'email': email, 'password': PASSWORD})
+        assert response.status_code == 302
+        return client
+    return login
@@ -0,0 +1,25 @@
+import pytest
+
+from conftest import BUYER, STAFF
+
+
+def test_open_orders_forbidden_for_non_staff(login):
+    client = login(BUYER)
+    response = client.get('/api/orders/open?pickup_location=loc_library')
+    assert response.status_code == 403
+    assert response.get_json()['success'] is False
+
+
+def test_open_orders_allowed_for_staff(login):
+    client = login(STAFF)
+    response = client.get('/api/orders/open?pickup_location=loc_library')
+    assert response.status_code == 200
+    assert response.get_json()['pickup_location'] == 'loc_library'
+
+
+@pytest.mark.parametrize('body', [['ORD-1'], 'ORD-1', 42, {'order_ids': ['ORD-1'], 'status': 5}])
+def test_bulk_status_rejects_malformed_body(login, body):
+    client = login(STAFF)
+    response = client.post('/api/orders/bulk_status', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
@@ -0,0 +1,39 @@
+import json
+import threading
+import time
+
+from models.order import OrderManager
+from models.recommendation import RecommendationManager
+
+
+def order(order_id, *product_ids):
+    return {'order_id': order_id, 'items': [{'product_id': pid, 'name': pid} for pid in product_ids]}
+
+
+def test_add_order_during_rebuild_is_not_lost(tmp_path, monkeypatch):
+    orders_file = tmp_path / 'orders.json'
+    orders_file.write_text(json.dumps([order('ORD-1', 'a', 'b')]))
+    monkeypatch.setattr(OrderManager, 'ORDER_FILE', str(orders_file))
+    monkeypatch.setattr(RecommendationManager, 'REC_FILE', str(tmp_path / 'recommendations.json'))
+    monkeypatch.setattr(RecommendationManager, '_name_map', staticmethod(dict))
+    monkeypatch.setattr(RecommendationManager, '_counts', {})
+    monkeypatch.setattr(RecommendationManager, '_top', {})
+
+    scanning = threading.Event()
+    count_pairs = RecommendationManager._count_pairs
+
+    def slow_count_pairs(counts, product_ids):
+        scanning.set()
+        time.sleep(0.05)
+        count_pairs(counts, product_ids)
+
+    monkeypatch.setattr(RecommendationManager, '_count_pairs', staticmethod(slow_count_pairs))
+    rebuild = threading.Thread(target=RecommendationManager.rebuild)
+    rebuild.start()
+    assert scanning.wait(5)
+    RecommendationManager.add_order(order('ORD-2', 'a', 'b'))
+    rebuild.join()
+
+    assert RecommendationManager._counts['a'] == {'b': 2}
+    assert RecommendationManager.get_recommendation_ids('b') == ('a',)
+    assert RecommendationManager._pending is None
@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import STAFF
+from models.report import ReportManager
+
+
+@pytest.mark.parametrize('body', [
+    ['csv'],
+    {'date_from': 20240101},
+    {'status': None, 'pickup_location': ['loc_library']},
+    {'format': 1},
+    {'date_from': '2024-13-01'},
+    {'date_to': 'kemarin'},
+])
+def test_create_report_rejects_invalid_body(login, monkeypatch, body):
+    created = []
+    monkeypatch.setattr(ReportManager, 'create_job', lambda *args, **kwargs: created.append(args))
+    client = login(STAFF)
+    response = client.post('/reports/orders', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert not created
+
+
+def test_create_report_normalizes_dates(login, monkeypatch):
+    created = []
+    monkeypatch.setattr(ReportManager, 'create_job',
+                        lambda fmt, filters, owner=None: created.append(filters) or {'job_id': 'x'})
+    client = login(STAFF)
+    response = client.post('/reports/orders', json={'date_from': '20240105', 'date_to': ' 2024-02-01 '})
+    assert response.status_code == 202
+    assert created[0]['date_from'] == '2024-01-05'
+    assert created[0]['date_to'] == '2024-02-01'
@@ -0,0 +1,188 @@
+"""
+Admission control adaptif: menolak traffic prioritas rendah dengan 503 cepat
+saat storage mulai macet, agar checkout dan perubahan keranjang tetap jalan.
+
+Jalur tulis file (ProductsManager._save, ledger stok, OrderManager._save_orders)
+melakukan fsync di bawah lock. Saat disk lambat, antrian lock memanjang dan
+semua request ikut lambat sampai timeout berantai. Modul ini mengukur dua
+sinyal per proses:
+- Jumlah request yang sedang diproses (in-flight)
+- Waktu tunggu lock storage (EWMA dari storage_lock/record_wait, meluruh ke 0
+  jika tidak ada sampel baru selama beberapa detik)
+
+Tekanan = max(in_flight / ADMISSION_MAX_IN_FLIGHT, wait / ADMISSION_MAX_LOCK_WAIT_MS).
+Di atas 1.0 request prioritas rendah (halaman browsing, API katalog, laporan)
+ditolak dengan peluang (tekanan - 1): 50% pada tekanan 1.5, semua pada 2.0,
+sehingga beban turun bertahap tanpa berosilasi. Endpoint di
+ADMISSION_CRITICAL_ENDPOINTS (checkout, keranjang, login, health) tidak
+pernah ditolak. Response 503 dibuat tanpa template dan membawa Retry-After.
+
+Catatan: state disimpan per proses (sama seperti utils/rate_limit.py).
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """Penghitung in-flight + waktu tunggu lock storage, dan keputusan admit/shed"""
+
+    ENABLED = False
+    MAX_IN_FLIGHT = 64  # Request bersamaan per proses sebelum mulai shedding (0 = tidak dicek)
+    MAX_LOCK_WAIT = 0.2  # Detik rata-rata tunggu lock storage sebelum mulai shedding (0 = tidak dicek)
+    RETRY_AFTER = 2  # Detik Retry-After dasar (dikali tekanan, maks RETRY_AFTER_MAX)
+    RETRY_AFTER_MAX = 30
+    WAIT_ALPHA = 0.2  # Bobot sampel baru di EWMA waktu tunggu
+    WAIT_DECAY = 2.0  # Konstanta waktu (detik) peluruhan EWMA saat tidak ada sampel baru
+    CRITICAL = frozenset()  # Endpoint yang tidak pernah ditolak
+
+    _lock = threading.Lock()
+    _in_flight = 0
+    _wait_ewma = 0.0
+    _wait_at = 0.0  # time.monotonic() sampel waktu tunggu terakhir
+    _shedding = False  # Untuk log transisi mulai/berhenti shedding
+    _stats = {'admitted': 0, 'shed': 0}
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membaca konfigurasi ADMISSION_* dan memasang hook before/teardown_request
+        Args:
+            app: Instance Flask app
+        """
+        cfg = app.config
+        cls.ENABLED = cfg.get('ADMISSION_ENABLED', True)
+        cls.MAX_IN_FLIGHT = cfg.get('ADMISSION_MAX_IN_FLIGHT', 64)
+        cls.MAX_LOCK_WAIT = cfg.get('ADMISSION_MAX_LOCK_WAIT_MS', 200) / 1000
+        cls.RETRY_AFTER = cfg.get('ADMISSION_RETRY_AFTER', 2)
+        cls.RETRY_AFTER_MAX = cfg.get('ADMISSION_RETRY_AFTER_MAX', 30)
+        cls.CRITICAL = frozenset(cfg.get('ADMISSION_CRITICAL_ENDPOINTS', ()))
+        if not cls.ENABLED:
+            return
+
+        from flask import g, request
+
+        @app.before_request
+        def admit_request():
+            if request.endpoint in cls.CRITICAL:
+                cls._enter()
+                g._admitted = True
+                return None
+            retry_after = cls.should_shed()
+            if retry_after:
+                return cls.shed_response(request, retry_after)
+            cls._enter()
+            g._admitted = True
+            return None
+
+        @app.teardown_request
+        def release_request(exc):
+            if g.pop('_admitted', False):
+                with cls._lock:
+                    cls._in_flight -= 1
+
+    @classmethod
+    def _enter(cls):
+        with cls._lock:
+            cls._in_flight += 1
+            cls._stats['admitted'] += 1
+
+    # === SINYAL ===
+
+    @classmethod
+    def record_wait(cls, seconds):
+        """Mencatat satu sampel waktu tunggu lock storage (detik)"""
+        now = time.monotonic()
+        with cls._lock:
+            current = cls._decayed(now)
+            cls._wait_ewma = current + cls.WAIT_ALPHA * (seconds - current)
+            cls._wait_at = now
+
+    @classmethod
+    def _decayed(cls, now):
+        """EWMA waktu tunggu setelah peluruhan sejak sampel terakhir"""
+        idle = now - cls._wait_at
+        if idle <= 0 or not cls._wait_ewma:
+            return cls._wait_ewma
+        return cls._wait_ewma * math.exp(-idle / cls.WAIT_DECAY)
+
+    @classmethod
+    @contextmanager
+    def storage_lock(cls, lock):
+        """
+        Mengambil lock storage sambil mencatat waktu tunggunya
+        Usage:
+            with AdmissionController.storage_lock(_SAVE_LOCK):
+                ...
+        """
+        start = time.perf_counter()
+        with lock:
+            cls.record_wait(time.perf_counter() - start)
+            yield
+
+    @classmethod
+    def pressure(cls):
+        """Tekanan saat ini (1.0 = tepat di threshold)"""
+        now = time.monotonic()
+        with cls._lock:
+            in_flight = cls._in_flight
+            wait = cls._decayed(now)
+        levels = [0.0]
+        if cls.MAX_IN_FLIGHT:
+            levels.append(in_flight / cls.MAX_IN_FLIGHT)
+        if cls.MAX_LOCK_WAIT:
+            levels.append(wait / cls.MAX_LOCK_WAIT)
+        return max(levels)
+
+    # === KEPUTUSAN ===
+
+    @classmethod
+    def should_shed(cls):
+        """
+        Memutuskan apakah request prioritas rendah ditolak
+        Returns: Detik Retry-After jika ditolak, 0 jika diterima
+        """
+        pressure = cls.pressure()
+        shed = pressure > 1 and random.random() < pressure - 1
+        if pressure > 1 and not cls._shedding:
+            logger.warning("Mulai load shedding (tekanan %.2f)", pressure, extra=cls.stats())
+            cls._shedding = True
+        elif pressure <= 1 and cls._shedding:
+            logger.info("Load shedding berhenti (%d request ditolak sejauh ini)", cls._stats['shed'])
+            cls._shedding = False
+        if not shed:
+            return 0
+        with cls._lock:
+            cls._stats['shed'] += 1
+        return min(cls.RETRY_AFTER_MAX, math.ceil(cls.RETRY_AFTER * pressure))
+
+    @staticmethod
+    def shed_response(request, retry_after):
+        """Response 503 murah (tanpa template/session) dengan header Retry-After"""
+        from flask import current_app, jsonify
+
+        message = 'Server sedang sibuk, silakan coba lagi sebentar lagi'
+        if (request.path.startswith(('/api/', '/reports/'))
+                or request.accept_mimetypes.best == 'application/json'):
+            response = jsonify({'success': False, 'message': message, 'retry_after': retry_after})
+        else:
+            response = current_app.response_class(f'<h1>{message}</h1>', mimetype='text/html')
+        response.status_code = 503
+        response.headers['Retry-After'] = str(retry_after)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    @classmethod
+    def stats(cls):
+        """Snapshot counter untuk /readyz dan monitoring"""
+        now = time.monotonic()
+        with cls._lock:
+            wait = cls._decayed(now)
+            return {'enabled': cls.ENABLED, 'in_flight': cls._in_flight,
+                    'lock_wait_ms': round(wait * 1000, 1), 'admitted': cls._stats['admitted'],
+                    'shed': cls._stats['shed']}
@@ -0,0 +1,98 @@
+"""
+Lapisan codec untuk semua file data (produk, pesanan, lokasi, user).
+
+- Memakai orjson jika terinstall (jauh lebih cepat), fallback ke json stdlib.
+- Format penyimpanan bisa dipilih per store lewat config DATA_FORMATS:
+    'json'    : JSON dengan indentasi (mudah dibaca, format lama)
+    'compact' : JSON tanpa spasi (lebih kecil dan cepat di-parse)
+    'msgpack' : biner MessagePack (butuh: pip install msgpack)
+- loads() mendeteksi format dari isi file, jadi file lama tetap terbaca
+  walaupun format di config sudah diganti.
+"""
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - tergantung environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - tergantung environment
+    msgpack = None
+
+FORMATS = ('json', 'compact', 'msgpack')
+
+# Format per store, diisi oleh configure() dari app.config['DATA_FORMATS']
+_store_formats = {}
+
+def configure(config):
+    """
+    Membaca DATA_FORMATS dari konfigurasi Flask
+    Args:
+        config: app.config (atau dict serupa)
+    """
+    formats = dict(config.get('DATA_FORMATS') or {})
+    for store, fmt in formats.items():
+        if fmt not in FORMATS:
+            raise ValueError(f"Format data tidak dikenal untuk {store}: {fmt}")
+        if fmt == 'msgpack' and msgpack is None:
+            logger.warning("msgpack tidak terinstall, store %s memakai 'compact'", store)
+            formats[store] = 'compact'
+    _store_formats.clear()
+    _store_formats.update(formats)
+
+def store_format(store):
+    """Format penyimpanan untuk store tertentu (default 'json')"""
+    return _store_formats.get(store, 'json')
+
+def is_msgpack(raw):
+    """Cek apakah bytes berisi MessagePack (JSON selalu diawali whitespace, BOM, { atau [)"""
+    if not raw:
+        return False
+    first = raw[0]
+    return 0x80 <= first <= 0x9f or first in (0xdc, 0xdd, 0xde, 0xdf)
+
+def dumps(obj, fmt='json'):
+    """
+    Serialize object ke bytes sesuai format
+    Args:
+        obj: Data (dict/list)
+        fmt: 'json', 'compact', atau 'msgpack'
+    Returns: bytes
+    """
+    if fmt == 'msgpack' and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if fmt == 'json' else 0
+        return orjson.dumps(obj, option=option)
+    if fmt == 'json':
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def loads(raw):
+    """
+    Deserialize bytes/str dengan deteksi format otomatis
+    Args:
+        raw: Isi file (bytes atau str)
+    Returns: Data hasil decode
+    Raises: ValueError jika isi tidak valid
+    """
+    if isinstance(raw, bytes) and is_msgpack(raw):
+        if msgpack is None:
+            raise ValueError('File berformat msgpack tetapi msgpack tidak terinstall')
+        return msgpack.unpackb(raw, raw=False)
+    if isinstance(raw, bytes) and raw.startswith(b'\xef\xbb\xbf'):
+        raw = raw[3:]  # Buang UTF-8 BOM
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def load_file(path):
+    """Membaca dan decode seluruh file data"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,138 @@
+"""
+Kompresi response HTTP (gzip / brotli) berdasarkan header Accept-Encoding.
+
+Dipasang sebagai after_request di create_app:
+- Hanya untuk tipe konten teks (HTML, JSON, CSV, ...), file statis dan
+  response yang sudah terkompresi dilewati
+- Payload di bawah COMPRESS_MIN_SIZE byte dikirim apa adanya (overhead
+  header + CPU tidak sebanding dengan penghematannya)
+- Response streaming (mis. download laporan) dikompresi per chunk dan
+  di-flush setiap chunk, sehingga client tetap menerima data bertahap
+- Brotli dipakai jika terinstall (pip install brotli) dan didukung client
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - tergantung environment
+    brotli = None
+
+class Compressor:
+    """Middleware kompresi response"""
+
+    ENABLED = True
+    MIN_SIZE = 500  # Byte minimal sebelum dikompresi
+    GZIP_LEVEL = 6  # 1 (cepat) - 9 (paling kecil)
+    BROTLI_QUALITY = 4  # 0 (cepat) - 11 (paling kecil); 4-5 seimbang untuk konten dinamis
+    MIMETYPES = {
+        'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+        'application/javascript', 'application/json', 'application/x-ndjson',
+        'image/svg+xml',
+    }
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membaca konfigurasi COMPRESS_* dan memasang hook after_request
+        Args:
+            app: Instance Flask app
+        """
+        cls.ENABLED = app.config.get('COMPRESS_ENABLED', True)
+        cls.MIN_SIZE = app.config.get('COMPRESS_MIN_SIZE', 500)
+        cls.GZIP_LEVEL = app.config.get('COMPRESS_GZIP_LEVEL', 6)
+        cls.BROTLI_QUALITY = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        if cls.ENABLED:
+            from flask import request
+
+            @app.after_request
+            def compress_response(response):
+                return cls.compress_response(response, request)
+
+    @staticmethod
+    def choose_encoding(accept_encodings):
+        """
+        Memilih encoding terbaik yang didukung client
+        Args:
+            accept_encodings: request.accept_encodings (werkzeug Accept)
+        Returns: 'br', 'gzip', atau None
+        """
+        br = accept_encodings['br'] if brotli is not None else 0
+        gzip = accept_encodings['gzip']
+        if br and br >= gzip:
+            return 'br'
+        if gzip:
+            return 'gzip'
+        return None
+
+    @classmethod
+    def compress(cls, data, encoding):
+        """Kompresi seluruh payload sekaligus"""
+        if encoding == 'br':
+            return brotli.compress(data, quality=cls.BROTLI_QUALITY)
+        compressor = zlib.compressobj(cls.GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = format gzip
+        return compressor.compress(data) + compressor.flush()
+
+    @classmethod
+    def stream(cls, chunks, encoding):
+        """
+        Generator kompresi untuk response streaming; setiap chunk di-flush
+        agar client tidak menunggu sampai seluruh response selesai
+        """
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=cls.BROTLI_QUALITY)
+            process, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(cls.GZIP_LEVEL, zlib.DEFLATED, 31)
+            process, finish = compressor.compress, compressor.flush
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if chunk:
+                    out = process(chunk) + flush()
+                    if out:
+                        yield out
+            yield finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+
+    @classmethod
+    def compress_response(cls, response, request):
+        """
+        Kompresi response jika memenuhi syarat
+        Args:
+            response: Flask Response
+            request: Request yang sedang diproses
+        Returns: Response (dikompresi atau apa adanya)
+        """
+        if (request.method == 'HEAD'
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough  # send_file / file statis
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in cls.MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = cls.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = cls.stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < cls.MIN_SIZE:
+                return response
+            response.set_data(cls.compress(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # Body berbeda per encoding, jadi ETag kuat diturunkan menjadi ETag lemah
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -1,4 +1,4 @@
-from flask import session, flash, redirect, url_for  # Flask utilities untuk session management dan routing
+from flask import current_app, jsonify, session, flash, redirect, url_for  # Flask utilities untuk session management dan routing
 from functools import wraps  # Untuk preserve metadata fungsi asli saat menggunakan decorator
 
 def login_required(f):
@@ -60,6 +60,31 @@ def login_required(f):
     # Return decorated function untuk digunakan sebagai route handler
     return decorated_function
 
+def is_staff():
+    """True jika user yang login terdaftar di config STAFF_EMAILS"""
+    email = (session.get('user_id') or '').strip().lower()
+    return bool(email) and email in current_app.config.get('STAFF_EMAILS', ())
+
+def staff_required(f):
+    """
+    Decorator untuk endpoint JSON khusus staff (meja pickup/admin).
+    Dipasang setelah @login_required; user yang login tapi bukan staff
+    mendapat 403 JSON.
+    
+    Usage:
+        @api_bp.route('/orders/bulk_status', methods=['POST'])
+        @login_required
+        @staff_required
+        def bulk_order_status():
+            ...
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not is_staff():
+            return jsonify({'success': False, 'message': 'Hanya staff yang boleh mengakses endpoint ini'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
 # === PENGGUNAAN DECORATOR INI ===
 """
 Decorator ini digunakan di routes yang memerlukan login, contoh:
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import codecs
+from utils import codec
+
+logger = logging.getLogger(__name__)
+
+
+class JsonArrayReader:
+    """
+    Membaca file JSON berbentuk array secara bertahap (streaming).
+    File array berformat msgpack (lihat utils/codec.py) juga didukung.
+
+    File dibaca per potongan (chunk) dan setiap elemen array di-decode satu
+    per satu, sehingga memori yang dipakai tidak bergantung pada jumlah
+    elemen di file - hanya pada ukuran chunk dan ukuran satu elemen.
+
+    Secara default (strict) iterasi raise ValueError jika file bukan array
+    atau tidak diakhiri ']' yang lengkap (terpotong/rusak), sehingga
+    pemanggil yang menulis ulang file dari hasil bacaan tidak diam-diam
+    membuang sisa data. strict=False untuk pembaca best-effort (index,
+    rekomendasi, halaman): iterasi berhenti di bagian yang rusak dengan
+    log warning. File yang tidak ada dianggap array kosong.
+
+    Usage:
+        reader = JsonArrayReader('data/orders.json')
+        for order in reader:
+            ...
+        print(reader.bytes_read, reader.total_bytes, reader.complete)
+    """
+
+    def __init__(self, path, chunk_size=64 * 1024, strict=True):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.strict = strict
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.complete = False  # True setelah akhir array terbaca utuh
+
+    def _damaged(self, reason):
+        """File bukan array yang utuh: raise ValueError (strict) atau log warning"""
+        message = f"{self.path}: {reason}"
+        if self.strict:
+            raise ValueError(message)
+        logger.warning("%s, pembacaan berhenti setelah %d byte", message, self.bytes_read)
+
+    def __iter__(self):
+        self.complete = False
+        if not os.path.exists(self.path):
+            self.complete = True
+            return
+        self.total_bytes = os.path.getsize(self.path)
+        self.bytes_read = 0
+
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        buf = ''
+        pos = 0
+        started = False
+        eof = False
+
+        with open(self.path, 'rb') as f:
+            if codec.is_msgpack(f.read(1)):
+                f.seek(0)
+                yield from self._iter_msgpack(f)
+                return
+            f.seek(0)
+
+            while True:
+                # Lewati whitespace dan pemisah antar elemen
+                while pos < len(buf) and buf[pos] in ' \t\r\n,\ufeff':
+                    pos += 1
+
+                if pos < len(buf):
+                    if not started:
+                        if buf[pos] != '[':
+                            self._damaged('bukan array JSON')
+                            return
+                        started = True
+                        pos += 1
+                        continue
+                    if buf[pos] == ']':
+                        self.complete = True  # Akhir array
+                        return
+                    try:
+                        item, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            self._damaged('elemen array rusak atau terpotong')
+                            return
+                    else:
+                        pos = end
+                        yield item
+                        continue
+                elif eof:
+                    self._damaged('array tidak ditutup (file terpotong)' if started else 'file kosong')
+                    return
+
+                # Butuh data tambahan: buang bagian yang sudah diproses lalu baca chunk baru
+                chunk = f.read(self.chunk_size)
+                self.bytes_read += len(chunk)
+                buf = buf[pos:] + utf8.decode(chunk, final=not chunk)
+                pos = 0
+                eof = not chunk
+
+    def _iter_msgpack(self, f):
+        """Streaming elemen dari array msgpack tanpa memuat seluruh file"""
+        if codec.msgpack is None:
+            raise ValueError('File berformat msgpack tetapi msgpack tidak terinstall')
+        unpacker = codec.msgpack.Unpacker(f, raw=False, read_size=self.chunk_size)
+        try:
+            length = unpacker.read_array_header()
+        except (ValueError, codec.msgpack.UnpackException):
+            self._damaged('bukan array msgpack')
+            return
+        for _ in range(length):
+            try:
+                item = unpacker.unpack()
+            except (ValueError, codec.msgpack.UnpackException):
+                self._damaged('elemen array msgpack rusak atau terpotong')
+                return
+            self.bytes_read = f.tell()
+            yield item
+        self.complete = True
+
+
+class JsonArrayWriter:
+    """
+    Menulis array JSON elemen per elemen (pasangan JsonArrayReader), sehingga
+    file besar bisa ditulis ulang tanpa menahan seluruh array di memori.
+    Hasilnya sama persis dengan codec.dumps(list, fmt) untuk 'json' dan
+    'compact'. Format msgpack tidak didukung karena header array msgpack
+    harus memuat jumlah elemen.
+
+    Usage:
+        with open(tmp, 'wb') as f, JsonArrayWriter(f, 'json') as writer:
+            for order in orders:
+                writer.write(order)
+    """
+
+    def __init__(self, f, fmt='json'):
+        if fmt not in ('json', 'compact'):
+            raise ValueError(f"JsonArrayWriter tidak mendukung format {fmt}")
+        self.f = f
+        self.fmt = fmt
+        self.count = 0
+        if fmt == 'json':
+            self._open, self._sep, self._close = b'[\n  ', b',\n  ', b'\n]'
+        else:
+            self._open, self._sep, self._close = b'[', b',', b']'
+
+    def write(self, item):
+        """Menulis satu elemen array"""
+        raw = codec.dumps(item, self.fmt)
+        if self.fmt == 'json':
+            raw = raw.replace(b'\n', b'\n  ')  # Indentasi level array (string JSON tidak memuat newline mentah)
+        self.f.write(self._sep if self.count else self._open)
+        self.f.write(raw)
+        self.count += 1
+
+    def close(self):
+        """Menutup array (tidak menutup file)"""
+        self.f.write(self._close if self.count else b'[]')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,195 @@
+"""
+Logging terstruktur (JSON per baris) yang tidak memblokir thread request.
+
+- Semua logger (logging.getLogger(__name__) di models/routes/utils) menulis
+  ke QueueHandler; satu thread QueueListener yang menulis ke stdout/stderr,
+  jadi thread request tidak pernah menunggu I/O terminal/pipe
+- Setiap record diberi request_id (dari header X-Request-ID atau dibuat baru)
+  sehingga semua log satu request bisa dikorelasikan
+- Level per modul lewat LOG_LEVELS, sampling untuk event DEBUG bervolume
+  tinggi lewat LOG_DEBUG_SAMPLE_RATE / LOG_SAMPLING
+- Field tambahan dikirim lewat extra: logger.info('pesan', extra={'order_id': ...})
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+
+# Atribut bawaan LogRecord; atribut lain dianggap field tambahan (extra)
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+_state = {'handler': None, 'listener': None, 'queue': None, 'output': None, 'formatter': None, 'fork_hook': False}
+
+# request_id dari client hanya diterima jika berupa karakter aman (cegah injeksi header/log)
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+class JsonFormatter(logging.Formatter):
+    """Format record menjadi satu baris JSON"""
+
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Format teks satu baris untuk development"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = None
+        return super().format(record)
+
+class RequestContextFilter(logging.Filter):
+    """Menambahkan request_id dari flask.g (dijalankan di thread request)"""
+
+    def filter(self, record):
+        if getattr(record, 'request_id', None) is None:
+            record.request_id = current_request_id()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Hanya meneruskan sebagian record DEBUG (level lain selalu diteruskan)
+    Args:
+        default_rate: Fraksi record DEBUG yang diteruskan (1.0 = semua)
+        rates: Dictionary {prefix nama logger: fraksi} untuk override per modul
+    """
+
+    def __init__(self, default_rate=1.0, rates=None):
+        super().__init__()
+        self.default_rate = default_rate
+        # Prefix terpanjang dicek lebih dulu
+        self.rates = sorted((rates or {}).items(), key=lambda kv: -len(kv[0]))
+
+    def rate_for(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return self.default_rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler yang mempertahankan exception sebagai field terpisah"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def current_request_id():
+    """request_id untuk request yang sedang diproses (None di luar request)"""
+    from flask import g, has_request_context
+    if has_request_context():
+        return g.get('request_id')
+    return None
+
+def _start_listener():
+    """(Re)start thread QueueListener; dipanggil juga di proses anak setelah fork"""
+    if _state['queue'] is None:
+        return
+    handler = logging.StreamHandler(_state['output'] or sys.stderr)
+    handler.setFormatter(_state['formatter'])
+    _state['listener'] = QueueListener(_state['queue'], handler, respect_handler_level=False)
+    _state['listener'].start()
+
+def _stop_listener():
+    """Hentikan listener dan tulis sisa record di queue"""
+    listener = _state['listener']
+    _state['listener'] = None
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+def configure_logging(app, stream=None):
+    """
+    Memasang pipeline logging berdasarkan konfigurasi LOG_*
+    Aman dipanggil berulang kali (create_app di test/benchmark).
+    Args:
+        app: Instance Flask app
+        stream: Tujuan output (default stderr)
+    """
+    cfg = app.config
+    root = logging.getLogger()
+
+    _stop_listener()
+    if _state['handler'] is not None:
+        root.removeHandler(_state['handler'])
+
+    _state['queue'] = queue.SimpleQueue()
+    _state['output'] = stream
+    _state['formatter'] = TextFormatter() if cfg.get('LOG_FORMAT') == 'text' else JsonFormatter()
+
+    handler = _NonBlockingQueueHandler(_state['queue'])
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(cfg.get('LOG_DEBUG_SAMPLE_RATE', 1.0), cfg.get('LOG_SAMPLING')))
+    _state['handler'] = handler
+
+    # Flask/werkzeug punya handler sendiri; semua diarahkan ke pipeline yang sama
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(cfg.get('LOG_LEVEL', 'INFO'))
+    app.logger.handlers.clear()
+    app.logger.propagate = True
+    for name, level in (cfg.get('LOG_LEVELS') or {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    _start_listener()
+    if not _state['fork_hook']:
+        # Thread listener tidak ikut ter-fork (gunicorn --preload): start ulang di worker
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_start_listener)
+        atexit.register(_stop_listener)
+        _state['fork_hook'] = True
+
+    if cfg.get('LOG_REQUEST_ID', True) and 'request_id' not in app.extensions:
+        app.extensions['request_id'] = True
+        _install_request_id(app, cfg.get('LOG_REQUEST_ID_HEADER', 'X-Request-ID'))
+
+def _install_request_id(app, header):
+    """Memberi setiap request sebuah request_id dan mengembalikannya di header response"""
+    from flask import g, request
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(header, '')
+        g.request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex[:16]
+
+    @app.after_request
+    def echo_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[header] = request_id
+        return response
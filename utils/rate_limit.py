@@ -0,0 +1,148 @@
+"""
+Rate limiting in-process untuk endpoint autentikasi (login/register).
+
+Setiap percobaan login/register menjalankan PBKDF2 (ratusan ribu iterasi),
+jadi puluhan request palsu bersamaan bisa menghabiskan semua core CPU.
+Modul ini menyediakan:
+- TokenBucketLimiter: token bucket per key (IP atau email) dengan jumlah
+  bucket terbatas (LRU), aman dipakai banyak thread
+- AuthThrottle: limiter per IP + per email untuk login/register dan
+  semaphore global yang membatasi jumlah verifikasi hash bersamaan
+
+Catatan: state disimpan per proses, jadi dengan N worker gunicorn batas
+efektifnya N kali lipat.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key dengan eviction LRU.
+
+    Setiap key punya maksimal `burst` token yang terisi ulang `rate` token per
+    detik. Satu request memakai satu token; jika token habis request ditolak.
+    Bucket yang paling lama tidak dipakai dibuang saat jumlah key melebihi
+    `max_keys`, sehingga memori tetap terbatas walaupun IP/email berganti-ganti.
+    """
+
+    def __init__(self, rate, burst, max_keys=10000):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [token, waktu update terakhir]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def acquire(self, key, now=None):
+        """
+        Mengambil satu token untuk key
+        Returns: Tuple (diizinkan: bool, retry_after: detik sampai token tersedia)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            retry_after = (1 - bucket[0]) / self.rate if self.rate > 0 else 60
+            return False, retry_after
+
+    def refund(self, key):
+        """Mengembalikan satu token yang sudah diambil acquire() (maksimal burst)"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + 1)
+
+class AuthThrottle:
+    """Batas percobaan login/register per IP dan per email, plus batas hash bersamaan"""
+
+    ENABLED = True
+    HASH_WAIT = 0.5  # Detik menunggu slot verifikasi hash sebelum menolak (429)
+
+    # Diisi oleh init_app dari konfigurasi Flask
+    _limiters = {}
+    _hash_slots = threading.BoundedSemaphore(max(1, (os.cpu_count() or 2) // 2))
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membuat limiter dan semaphore dari konfigurasi AUTH_*
+        Args:
+            app: Instance Flask app
+        """
+        cfg = app.config
+        cls.ENABLED = cfg.get('AUTH_RATE_LIMIT_ENABLED', True)
+        cls.HASH_WAIT = cfg.get('AUTH_HASH_WAIT', 0.5)
+        max_keys = cfg.get('AUTH_LIMITER_MAX_KEYS', 10000)
+
+        ip_rate = cfg.get('AUTH_IP_PER_MINUTE', 20) / 60
+        email_rate = cfg.get('AUTH_EMAIL_PER_MINUTE', 5) / 60
+        cls._limiters = {
+            (scope, kind): TokenBucketLimiter(rate, burst, max_keys)
+            for scope in ('login', 'register')
+            for kind, rate, burst in (
+                ('ip', ip_rate, cfg.get('AUTH_IP_BURST', 20)),
+                ('email', email_rate, cfg.get('AUTH_EMAIL_BURST', 5)),
+            )
+        }
+
+        slots = cfg.get('AUTH_MAX_CONCURRENT_HASHES') or max(1, (os.cpu_count() or 2) // 2)
+        cls._hash_slots = threading.BoundedSemaphore(slots)
+
+    @classmethod
+    def check(cls, scope, ip, email):
+        """
+        Memakai satu token dari bucket IP dan bucket email (keduanya atau tidak sama sekali)
+        Args:
+            scope: 'login' atau 'register'
+            ip: Alamat IP client
+            email: Email yang dicoba (boleh kosong)
+        Returns: Tuple (diizinkan: bool, retry_after: detik dibulatkan ke atas)
+        Jika bucket email menolak, token IP dikembalikan: percobaan ke satu akun
+        yang sedang dibatasi tidak ikut menghabiskan jatah IP (mis. NAT kantor)
+        untuk akun lain.
+        """
+        if not cls.ENABLED or not cls._limiters:
+            return True, 0
+        ip_limiter = cls._limiters[(scope, 'ip')]
+        allowed, wait = ip_limiter.acquire(ip or '-')
+        if allowed and email:
+            allowed, wait = cls._limiters[(scope, 'email')].acquire(email.lower())
+            if not allowed:
+                ip_limiter.refund(ip or '-')
+        return allowed, int(wait) + 1 if not allowed else 0
+
+    @classmethod
+    @contextmanager
+    def hash_slot(cls):
+        """
+        Context manager untuk satu verifikasi/pembuatan hash password.
+        Yield False jika semua slot terpakai lebih lama dari HASH_WAIT detik.
+        """
+        if not cls.ENABLED:
+            yield True
+            return
+        slots = cls._hash_slots
+        acquired = slots.acquire(timeout=cls.HASH_WAIT)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                slots.release()
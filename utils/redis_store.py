@@ -0,0 +1,174 @@
+"""
+Backend bersama berbasis protokol Redis untuk menjalankan aplikasi di lebih
+dari satu host (STORE_BACKEND = 'redis').
+
+- Satu connection pool per proses (redis-py membuat ulang koneksi setelah
+  fork, jadi aman untuk gunicorn --preload)
+- Session disimpan di server (key <prefix>session:<id>), cookie hanya berisi
+  ID session yang ditandatangani; keranjang ikut pindah karena disimpan di
+  session
+- Stok produk dikelola models/redis_stock.py memakai client yang sama
+- REDIS_URL = 'fakeredis://' memakai fakeredis in-process (pip install
+  fakeredis lupa) untuk development/test tanpa redis-server
+
+Butuh: pip install redis
+"""
+
+import logging
+import secrets
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SessionInterface
+from itsdangerous import BadSignature, Signer
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - tergantung environment
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class RedisStore:
+    """Connection pool dan helper key untuk server Redis bersama"""
+
+    ENABLED = False
+    PREFIX = 'civitas:'
+    _client = None
+    _server = None  # FakeServer untuk REDIS_URL 'fakeredis://'
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membuat connection pool dan memasang session server-side jika
+        STORE_BACKEND = 'redis' (koneksi baru dibuka saat pertama dipakai)
+        Args:
+            app: Instance Flask app
+        """
+        cls.ENABLED = app.config.get('STORE_BACKEND', 'local') == 'redis'
+        if not cls.ENABLED:
+            return
+        if redis is None:
+            raise RuntimeError('STORE_BACKEND=redis membutuhkan package redis: pip install redis')
+
+        cls.PREFIX = app.config.get('REDIS_KEY_PREFIX', 'civitas:')
+        url = app.config.get('REDIS_URL', 'redis://localhost:6379/0')
+        if url.startswith('fakeredis://'):
+            import fakeredis
+            # Satu server fake per proses agar semua app/test berbagi data yang sama
+            cls._client = fakeredis.FakeRedis(server=cls._fake_server(), decode_responses=True)
+        else:
+            pool = redis.ConnectionPool.from_url(
+                url,
+                max_connections=app.config.get('REDIS_MAX_CONNECTIONS', 50),
+                socket_timeout=app.config.get('REDIS_SOCKET_TIMEOUT', 2),
+                socket_connect_timeout=app.config.get('REDIS_SOCKET_TIMEOUT', 2),
+                health_check_interval=30,
+                decode_responses=True,
+            )
+            cls._client = redis.Redis(connection_pool=pool)
+
+        app.session_interface = RedisSessionInterface(cls._client, cls.key('session:'))
+
+    @classmethod
+    def _fake_server(cls):
+        import fakeredis
+        if cls._server is None:
+            cls._server = fakeredis.FakeServer()
+        return cls._server
+
+    @classmethod
+    def client(cls):
+        """Client Redis bersama (None jika backend bukan redis)"""
+        return cls._client if cls.ENABLED else None
+
+    @classmethod
+    def key(cls, name):
+        """Nama key lengkap dengan prefix aplikasi"""
+        return cls.PREFIX + name
+
+    @classmethod
+    def ping(cls):
+        """True jika server Redis bisa dihubungi (dipakai /readyz)"""
+        try:
+            return bool(cls._client.ping())
+        except redis.RedisError:
+            logger.exception("Redis tidak bisa dihubungi")
+            return False
+
+class RedisSession(SecureCookieSession):
+    """Session Flask yang isinya disimpan di Redis"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = new
+
+class RedisSessionInterface(SessionInterface):
+    """
+    Session server-side: isi session di Redis dengan TTL
+    PERMANENT_SESSION_LIFETIME, cookie hanya berisi ID yang ditandatangani
+    SECRET_KEY (ID tidak bisa ditebak atau dipalsukan)
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, client, key_prefix):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='redis-session')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            if sid:
+                raw = self.client.get(self.key_prefix + sid)
+                if raw is not None:
+                    try:
+                        return RedisSession(self.serializer.loads(raw), sid=sid)
+                    except ValueError:
+                        logger.warning("Isi session %s rusak, dibuat session baru", sid)
+        return RedisSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified and not session.new:
+                self.client.delete(self.key_prefix + session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        ttl = int(app.permanent_session_lifetime.total_seconds())
+        if session.modified:
+            self.client.set(self.key_prefix + session.sid, self.serializer.dumps(dict(session)), ex=ttl)
+        else:
+            # Isi tidak berubah: cukup perpanjang TTL (SESSION_REFRESH_EACH_REQUEST)
+            self.client.expire(self.key_prefix + session.sid, ttl)
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid.encode()).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=httponly,
+            domain=domain,
+            path=path,
+            secure=secure,
+            samesite=samesite,
+        )
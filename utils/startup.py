@@ -0,0 +1,118 @@
+"""
+Validasi data dan laporan waktu startup aplikasi.
+
+create_app memuat dan memvalidasi semua file data (produk, pesanan, lokasi
+pickup, user) sebelum menerima request, mencatat durasi tiap fase startup,
+dan menyimpan hasilnya di app.extensions['startup'] untuk /readyz.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from utils import codec
+
+logger = logging.getLogger(__name__)
+
+class StartupReport:
+    """Durasi tiap fase startup dan hasil validasi store data"""
+
+    def __init__(self):
+        self.phases = {}
+        self.stores = {}
+        self.ready = False
+        self.started_at = time.time()
+
+    @contextmanager
+    def phase(self, name):
+        """Mengukur durasi satu fase startup (detik)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    @property
+    def errors(self):
+        """Dictionary {store: pesan error} untuk store yang gagal divalidasi"""
+        return {name: info['error'] for name, info in self.stores.items() if not info['ok']}
+
+    def as_dict(self):
+        """Ringkasan laporan untuk response JSON"""
+        return {
+            'ready': self.ready,
+            'started_at': self.started_at,
+            'phases_ms': {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            'stores': self.stores,
+        }
+
+    def log_summary(self):
+        """Mencatat ringkasan startup ke log (durasi fase dan status store sebagai field)"""
+        summary = self.as_dict()
+        phases = ', '.join(f"{name} {ms}ms" for name, ms in summary['phases_ms'].items())
+        logger.info("Startup: %s", phases, extra={'phases_ms': summary['phases_ms']})
+        for name, info in self.stores.items():
+            if info['ok']:
+                state = 'file belum ada' if info['missing'] else f"{info['records']} record"
+                logger.info("Store %s: OK (%s, %sms)", name, state, info['ms'], extra={'store': name})
+            else:
+                logger.error("Store %s: GAGAL - %s", name, info['error'], extra={'store': name})
+        if not self.ready:
+            logger.error('Startup: aplikasi BELUM siap, /readyz mengembalikan 503')
+
+def data_stores():
+    """
+    Daftar store data yang divalidasi saat startup
+    Returns: List tuple (nama, path, tipe data yang diharapkan)
+    """
+    from models import products
+    from models.catalog_shards import CatalogShards
+    from models.order import OrderManager
+    from models.pickup_location import PickupLocationManager
+    from routes.auth import user_manager
+
+    stores = [('products', os.path.abspath(products._PRODUCTS_FILE), dict)]
+    shards = CatalogShards(os.path.abspath(products._SHARDS_DIR))
+    if shards.exists():
+        # Katalog sudah dipartisi (CATALOG_SHARDED): validasi setiap shard penjual
+        stores.extend((f'products/{name}', path, dict) for name, path in shards.shard_files())
+    return stores + [
+        ('orders', OrderManager.ORDER_FILE, list),
+        ('pickup_locations', PickupLocationManager.LOCATION_FILE, dict),
+        ('users', user_manager.json_file, dict),
+    ]
+
+def validate_store(path, expected_type):
+    """
+    Memuat satu file data dan memastikan isinya bisa di-parse
+    Args:
+        path: Path file data
+        expected_type: dict atau list
+    Returns: Dictionary hasil validasi (ok, missing, records, ms, error)
+    """
+    start = time.perf_counter()
+    result = {'ok': True, 'missing': False, 'records': 0, 'error': None}
+    if not os.path.exists(path):
+        # Manager membuat file default saat pertama kali dipakai
+        result['missing'] = True
+    else:
+        try:
+            data = codec.load_file(path)
+            if not isinstance(data, expected_type):
+                raise ValueError(f"isi file harus berupa {expected_type.__name__}, "
+                                 f"bukan {type(data).__name__}")
+            result['records'] = len(data)
+        except Exception as e:
+            result['ok'] = False
+            result['error'] = f"{os.path.basename(path)}: {e}"
+    result['ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+def validate_stores(report):
+    """
+    Memvalidasi semua store data dan mengisi report.stores
+    Returns: Boolean apakah semua store valid
+    """
+    for name, path, expected_type in data_stores():
+        report.stores[name] = validate_store(path, expected_type)
+    return not report.errors
@@ -0,0 +1,65 @@
+"""
+Cache bytecode dan precompile template Jinja.
+
+Tanpa ini setiap worker mem-parse dan meng-compile template (Home_pages.html,
+Cart.html, barang/*.html, ...) saat template itu pertama kali dirender, jadi
+request pertama per halaman di worker baru jauh lebih lambat.
+
+- Bytecode cache: hasil compile disimpan di disk (FileSystemBytecodeCache)
+  dan dipakai ulang oleh worker/proses berikutnya selama isi template tidak
+  berubah (checksum source dicek Jinja, jadi edit template tetap terbaca)
+- Precompile: semua template (termasuk barang/* yang dipilih dinamis oleh
+  products.product_page) di-load saat startup. Dengan gunicorn --preload
+  template ter-compile sekali di master dan dibagi ke worker lewat fork
+"""
+
+import logging
+
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+logger = logging.getLogger(__name__)
+
+class TemplateCache:
+    """Bytecode cache + precompile untuk environment Jinja milik app"""
+
+    @staticmethod
+    def init_app(app):
+        """
+        Memasang FileSystemBytecodeCache jika TEMPLATE_BYTECODE_CACHE aktif
+        (dipanggil sebelum app.jinja_env dibuat)
+        Args:
+            app: Instance Flask app
+        """
+        if not app.config.get('TEMPLATE_BYTECODE_CACHE', True):
+            return
+        # directory None = folder temp per user bawaan Jinja (dibuat dengan izin 0700)
+        cache = FileSystemBytecodeCache(app.config.get('TEMPLATE_BYTECODE_CACHE_DIR'))
+        if 'jinja_env' in app.__dict__:
+            app.jinja_env.bytecode_cache = cache  # Environment sudah terlanjur dibuat
+        else:
+            app.jinja_options = dict(app.jinja_options, bytecode_cache=cache)
+
+    @staticmethod
+    def precompile(app):
+        """
+        Meng-compile semua template yang bisa dilihat loader app dan blueprint
+        Template yang gagal di-compile hanya dicatat; error yang sama akan
+        muncul lagi saat halaman itu dirender.
+        Args:
+            app: Instance Flask app (setelah blueprint didaftarkan)
+        Returns: Jumlah template yang berhasil di-compile
+        """
+        env = app.jinja_env
+        names = env.list_templates(extensions=('html', 'htm', 'xml', 'txt', 'jinja', 'j2'))
+        capacity = getattr(env.cache, 'capacity', None)  # LRUCache Jinja (cache_size)
+        if capacity is not None and len(names) > capacity:
+            logger.warning("Jumlah template (%d) melebihi cache Jinja (%d), sebagian akan di-compile ulang",
+                           len(names), capacity)
+        compiled = 0
+        for name in names:
+            try:
+                env.get_template(name)
+                compiled += 1
+            except TemplateError:
+                logger.exception("Gagal precompile template %s", name)
+        return compiled
@@ -0,0 +1,92 @@
+"""
+Unit of work per request (identity map produk) di flask.g.
+
+Dalam satu request, ProductsManager memakai objek UnitOfWork yang sama:
+- Identity map: produk yang sudah dimuat disimpan per store, sehingga
+  ProductsManager.get -> get_stock -> change_stock memuat produk sekali per
+  request dan semua pembacaan melihat record (dan stok) yang sama
+- Counter per request (loads/hits) dicatat ke log DEBUG dan opsional dikirim
+  di header response (UNIT_OF_WORK_STATS_HEADER)
+
+Tidak ada perubahan tertunda: stok ditulis langsung ke ledger di bawah stripe
+lock (menunda akan merusak jaminan anti-oversell), pesanan ditulis langsung
+oleh OrderManager, dan keranjang sudah ditulis Flask sekali per request lewat
+session. Pesanan juga tidak dimuat lewat unit of work karena tidak ada request
+yang membaca orders.json lebih dari sekali.
+Di luar request (thread background, script) current() mengembalikan None dan
+manager bekerja langsung ke store.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class UnitOfWork:
+    """Identity map untuk satu request"""
+
+    ENABLED = True
+    STATS_HEADER = None  # Nama header counter (None = tidak dikirim)
+
+    def __init__(self):
+        self._maps = {}  # {store: {key: record}}
+        self.stats = {'loads': 0, 'hits': 0}
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Membaca konfigurasi UNIT_OF_WORK_* dan memasang hook pencatat counter
+        Args:
+            app: Instance Flask app
+        """
+        cls.ENABLED = app.config.get('UNIT_OF_WORK_ENABLED', True)
+        cls.STATS_HEADER = app.config.get('UNIT_OF_WORK_STATS_HEADER') or None
+        if not cls.ENABLED:
+            return
+        from flask import g
+
+        @app.after_request
+        def report_unit_of_work(response):
+            uow = g.pop('uow', None)
+            if uow is None:
+                return response
+            if cls.STATS_HEADER:
+                response.headers[cls.STATS_HEADER] = uow.stats_header()
+            logger.debug("Unit of work: %s", uow.stats_header(), extra=dict(uow.stats))
+            return response
+
+    @classmethod
+    def current(cls):
+        """UnitOfWork request saat ini (dibuat saat pertama dipakai), None di luar request"""
+        if not cls.ENABLED:
+            return None
+        from flask import g, has_request_context
+        if not has_request_context():
+            return None
+        uow = g.get('uow')
+        if uow is None:
+            uow = g.uow = cls()
+        return uow
+
+    # === IDENTITY MAP ===
+
+    def get(self, store, key):
+        """Record dari identity map (None jika belum dimuat di request ini)"""
+        record = self._maps.get(store, {}).get(key)
+        if record is not None:
+            self.stats['hits'] += 1
+        return record
+
+    def add(self, store, key, record):
+        """Menyimpan record yang baru dimuat ke identity map; mengembalikan objek yang dipakai"""
+        self.stats['loads'] += 1
+        return self._maps.setdefault(store, {}).setdefault(key, record)
+
+    def update(self, store, key, **fields):
+        """Menerapkan perubahan yang sudah tersimpan ke record di identity map (jika ada)"""
+        record = self._maps.get(store, {}).get(key)
+        if record is not None:
+            record.update(fields)
+
+    def stats_header(self):
+        """Counter dalam format header, mis. 'loads=1, hits=2'"""
+        return ', '.join(f"{name}={value}" for name, value in self.stats.items())
@@ -0,0 +1,41 @@
+"""
+Entry point WSGI production untuk Web Marketplace.
+
+Jalankan dengan gunicorn (konfigurasi dari ProductionConfig):
+    FLASK_ENV=production SECRET_KEY=... gunicorn -c gunicorn.conf.py wsgi:application
+
+Dengan preload, modul ini di-import sekali di master process: app dibuat
+dan cache data dihangatkan sebelum fork, sehingga semua worker berbagi
+memori yang sama secara copy-on-write. Thread background baru dijalankan
+di tiap worker (hook post_fork di gunicorn.conf.py).
+"""
+
+import gc
+import os
+
+from main import create_app, start_background_tasks
+from models.pickup_location import PickupLocationManager
+from models.products import ProductsManager
+
+os.environ.setdefault('FLASK_ENV', 'production')
+
+def warmup():
+    """Memuat semua cache data ke memori sebelum worker di-fork"""
+    ProductsManager._load()  # Cache katalog JSON + replay ledger stok
+    ProductsManager.get_all()  # Map snapshot katalog (mmap)
+    PickupLocationManager.get_all_locations()  # Registry lokasi pickup
+    from routes.auth import user_manager  # noqa: F401  (data user dimuat saat import)
+    
+    # Pindahkan objek yang sudah ada ke generasi permanen GC, agar siklus GC di
+    # worker tidak menyentuh (dan menyalin) halaman memori yang dibagi
+    gc.collect()
+    gc.freeze()
+
+# Di bawah gunicorn (lihat gunicorn.conf.py) thread background dijalankan per worker
+_defer = os.environ.get('WSGI_DEFER_BACKGROUND') == '1'
+application = create_app(start_background=not _defer)
+warmup()
+
+def post_fork():
+    """Dipanggil di tiap worker setelah fork"""
+    start_background_tasks(application)